@@ -8,5 +8,6 @@ npm run build --omit=dev
 cd $OLDPWD
 cp -r pydantic_web_editor_webpack/statics/* pydantic_web_editor/src/pydantic_web_editor/static/
 cd pydantic_web_editor
+PYTHONPATH=src python -m pydantic_web_editor assets src/pydantic_web_editor/static
 poetry build
 cd $OLDPWD
\ No newline at end of file
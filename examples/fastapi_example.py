@@ -7,21 +7,26 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from schorg.AboutPage import AboutPage
 
-from pydantic_web_editor import WebEditorConfig, copy_static_folder
+from pydantic_web_editor import Button, WebEditorConfig, copy_static_folder, fastapi_submission_router
 
 app = FastAPI()
 app.mount("/static", StaticFiles(directory="static"), name="static")
 copy_static_folder(copy_path="static")
 
+# Built once at startup, each request only fills in its own start value.
+EDITOR = WebEditorConfig(
+    title="Example Pydantic Editor demoing Schema Org's About Page",
+    model=AboutPage,
+    start_val={},
+    buttons=[Button(id="save", path="save", text="Save")],
+).compile()
+# The Save button's htmx POST, validated against AboutPage; invalid documents get a 422 with the editor's errors.
+app.include_router(fastapi_submission_router(EDITOR.config.submission_handler(), "/save"))
+
 
 @app.get("/")
-def hello():
-    web_editor_config = WebEditorConfig(
-        title="Example Pydantic Editor demoing Schema Org's About Page",
-        model=AboutPage,
-        start_val={},
-    )
-    return HTMLResponse(web_editor_config.html)
+async def hello():
+    return HTMLResponse(EDITOR.render())
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field, PositiveInt, TypeAdapter
 
-from pydantic_web_editor import WebEditorConfig2, copy_static_folder, WebEditorConfig
+from pydantic_web_editor import WebEditorConfig2, copy_static_folder, WebEditorConfig, Button, SubmissionHandler, fastapi_submission_router
 
 app = FastAPI()
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -368,11 +368,15 @@ def hello():
     web_editor_config = WebEditorConfig(
         title="Example Pydantic Editor demoing Schema Org's About Page",
         model=Template,
+        buttons=[Button(id="save", path="save", text="Save")],
         #gen_ui_schema=True
     )
     return HTMLResponse(web_editor_config.html)
 
 
+app.include_router(fastapi_submission_router(SubmissionHandler(Template), "/save"))
+
+
 if __name__ == "__main__":
     import uvicorn
 
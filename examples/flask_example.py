@@ -4,10 +4,9 @@ from typing import List
 from flask import Flask, send_from_directory
 from pydantic import BaseModel, Field
 
-from pydantic_web_editor import WebEditorConfig, copy_static_folder
+from pydantic_web_editor import Button, WebEditorConfig, flask_submission_view, package_static_path
 
 app = Flask(__name__)
-copy_static_folder(copy_path="static")
 
 
 class Hobby(Enum):
@@ -21,17 +20,28 @@ class Student(BaseModel):
     hobby: Hobby
 
 
+# Built once at startup, each request only fills in its own start value.
+EDITOR = WebEditorConfig(
+    title="Example Pydantic Editor",
+    model=Student,
+    load_static="remote",
+    buttons=[Button(id="save", path="save", text="Save")],
+).compile()
+
+
 @app.route("/")
 def hello():
-    web_editor_config = WebEditorConfig(
-        title="Example Pydantic Editor", model=Student, load_static="remote"
-    )
-    return web_editor_config.html
+    return EDITOR.render()
+
+
+# The Save button's htmx POST, validated against Student; invalid documents get a 422 with the editor's errors.
+app.add_url_rule("/save", view_func=flask_submission_view(EDITOR.config.submission_handler()), methods=["POST"])
 
 
 @app.route("/static/<path:filename>")
 def serve_static(filename):
-    return send_from_directory("static", filename)
+    # Served straight from the installed package, no copy_static_folder needed.
+    return send_from_directory(package_static_path(), filename)
 
 
 if __name__ == "__main__":
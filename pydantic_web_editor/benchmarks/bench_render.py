@@ -0,0 +1,120 @@
+"""
+Time schema generation, page rendering and static copying across synthetic models of growing size.
+
+Each case is timed untraced and its peak memory taken in one more run under tracemalloc, see timing.measure.
+
+Run from the pydantic_web_editor project folder::
+
+    python -m benchmarks.bench_render --repeat 20 --json bench_render.json
+"""
+import argparse
+import shutil
+import tempfile
+
+from pydantic_web_editor import (
+    RENDER_CACHE,
+    SCHEMA_REGISTRY,
+    WebEditorConfig,
+    WebEditorConfig2,
+    copy_static_folder,
+    orjson_dumps,
+    set_json_encoder,
+    stdlib_dumps,
+)
+from pydantic_web_editor import encoding
+
+from benchmarks.models import benchmark_models, wide_model
+from benchmarks.timing import measure, print_table, write_json
+
+COLUMNS = ["case", "model", "schema_kib", "mean_ms", "p50_ms", "p99_ms", "peak_kib"]
+
+
+def _cold():
+    SCHEMA_REGISTRY.invalidate()
+    RENDER_CACHE.cache_clear()
+
+
+def render_cases(model):
+    yield "model_json_schema", model.model_json_schema, None
+    yield "WebEditorConfig.html cold", lambda: WebEditorConfig(title="bench", model=model, cache_render=False).html, _cold
+    yield "WebEditorConfig.html warm schema", lambda: WebEditorConfig(title="bench", model=model, cache_render=False).html, None
+    yield "WebEditorConfig.html cached", lambda: WebEditorConfig(title="bench", model=model).html, None
+    yield "WebEditorConfig.html optimize_schema cold", lambda: WebEditorConfig(
+        title="bench", model=model, cache_render=False, optimize_schema=True
+    ).html, _cold
+    yield "WebEditorConfig.html server_render warm", lambda: WebEditorConfig(
+        title="bench", model=model, cache_render=False, server_render=True
+    ).html, None
+    yield "WebEditorConfig2.html", lambda: WebEditorConfig2(title="bench", model=model).html, _cold
+    yield "WebEditorConfig2.html gen_ui_schema", lambda: WebEditorConfig2(title="bench", model=model, gen_ui_schema=True).html, _cold
+
+
+def bench_models(repeat: int, scale: int):
+    rows = []
+    for name, model in benchmark_models(scale).items():
+        schema_kib = len(SCHEMA_REGISTRY.schema_json(model)) / 1024
+        for case, fn, setup in render_cases(model):
+            _cold()
+            fn()  # warm up imports, pydantic's core schema and the template
+            rows.append({"case": case, "model": name, "schema_kib": schema_kib, **measure(fn, repeat, setup)})
+    return rows
+
+
+def bench_start_val(repeat: int, scale: int):
+    """Render a page prefilled with a large document, per JSON encoder and passed as a dict or a model instance."""
+    model = wide_model(300 * scale)
+    instance = model.model_validate({f"field_{i}": ["x" * 20] * 50 for i in range(2, 300 * scale, 3)})
+    document = instance.model_dump(mode="json")
+    schema_kib = len(SCHEMA_REGISTRY.schema_json(model)) / 1024
+    encoders = {"stdlib": stdlib_dumps}
+    if encoding.orjson is not None:
+        encoders["orjson"] = orjson_dumps
+    rows = []
+    try:
+        for encoder_name, encoder in encoders.items():
+            set_json_encoder(encoder)
+            for kind, start_val in (("dict", document), ("model", instance)):
+                fn = lambda: WebEditorConfig(title="bench", model=model, start_val=start_val, cache_render=False).html
+                fn()
+                case = f"start_val {kind} {encoder_name}"
+                rows.append({"case": case, "model": model.__name__, "schema_kib": schema_kib, **measure(fn, repeat)})
+    finally:
+        set_json_encoder(None)
+    return rows
+
+
+def bench_copy_static(repeat: int):
+    workdir = tempfile.mkdtemp(prefix="pwe-bench-")
+    targets = iter(range(repeat * 2))
+
+    def fresh_target():
+        fresh_target.path = f"{workdir}/cold-{next(targets)}"
+
+    try:
+        cold = measure(lambda: copy_static_folder(fresh_target.path, create=True), repeat, fresh_target)
+        copy_static_folder(f"{workdir}/warm", create=True)
+        warm = measure(lambda: copy_static_folder(f"{workdir}/warm"), repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return [
+        {"case": "copy_static_folder cold", "model": "-", **cold},
+        {"case": "copy_static_folder warm", "model": "-", **warm},
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1, help="multiplies the size of the largest synthetic models")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    rows = bench_models(args.repeat, args.scale) + bench_start_val(args.repeat, args.scale) + bench_copy_static(args.repeat)
+    print_table(rows, COLUMNS)
+    if args.json:
+        write_json(rows, args.json)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+A load harness for ASGI (FastAPI) and WSGI (Flask) apps, run in process with no server or sockets involved, or
+against a server already listening on localhost.
+
+Run from the pydantic_web_editor project folder, e.g. against the example apps::
+
+    python -m benchmarks.harness examples.fastapi_example:app --chdir .. --requests 500 --concurrency 20
+    python -m benchmarks.harness examples.flask_example:app --chdir .. --request "GET /" --request "GET /static/bundle.js"
+
+``--mix example`` sends the example apps' traffic: page renders, the static bundle fetches each page triggers and
+htmx form POSTs to ``/save``. ``--profile DIR`` then profiles each of those requests and writes cProfile ``.prof``
+dumps and flamegraph-ready collapsed stacks there, and ``--json`` writes a summary to diff against a later run with
+``--baseline``::
+
+    python -m benchmarks.harness examples.flask_example:app --chdir .. --mix example \
+        --payload '{"name": "Ada", "classes": ["math"], "hobby": "sports"}' --profile profiles --json v0.1.0.json
+    python -m benchmarks.harness examples.flask_example:app --chdir .. --mix example --baseline v0.1.0.json
+    flamegraph.pl profiles/load.collapsed > load.svg
+
+To include the server's own overhead, start it separately and pass its URL instead of an app, e.g.
+``python -m benchmarks.harness http://127.0.0.1:8000 --mix example``. Profiles need the app in process.
+"""
+import argparse
+import asyncio
+import http.client
+import importlib
+import inspect
+import io
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from wsgiref.util import setup_testing_defaults
+
+import pydantic
+
+import pydantic_web_editor
+from benchmarks.profiling import StackSampler, profile_request
+from benchmarks.timing import print_table, summarize, traced_peak, write_json
+
+FORM_PREFIX = "payload="
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    headers: Tuple[Tuple[str, str], ...] = ()
+    body: bytes = b""
+
+    @classmethod
+    def parse(cls, spec: str) -> "Request":
+        """
+        Parse ``"GET /path"``, ``"POST /path <json body>"`` or ``"POST /path payload=<json>"``, the last sent form
+        encoded like an htmx button's request.
+        """
+        method, path, *body = spec.split(" ", 2)
+        if not body:
+            return cls(method.upper(), path)
+        if body[0].startswith(FORM_PREFIX):
+            headers = (("content-type", "application/x-www-form-urlencoded"), ("hx-request", "true"))
+            return cls(method.upper(), path, headers, urlencode({"payload": body[0][len(FORM_PREFIX) :]}).encode())
+        return cls(method.upper(), path, (("content-type", "application/json"),), body[0].encode())
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+class Result(NamedTuple):
+    request: Request
+    status: int
+    seconds: float
+    size: int
+
+
+def example_mix(payload: str = "{}") -> List[Request]:
+    """
+    The example apps' traffic: each page render followed by the fetches of its static bundle, and one htmx save to
+    ``/save`` for every three pages.
+    """
+    page = [Request.parse("GET /"), Request.parse("GET /static/bundle.js"), Request.parse("GET /static/bundle.css")]
+    return page * 3 + [Request.parse(f"POST /save {FORM_PREFIX}{payload}")]
+
+
+MIXES: Dict[str, Callable[[str], List[Request]]] = {"example": example_mix}
+
+
+def load_app(spec: str):
+    """Import an app from ``"package.module:attribute"``."""
+    module_name, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+def is_asgi(app) -> bool:
+    return inspect.iscoroutinefunction(app) or inspect.iscoroutinefunction(getattr(app, "__call__", None))
+
+
+async def call_asgi(app, request: Request) -> Result:
+    url = urlsplit(request.path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": request.method,
+        "scheme": "http",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "root_path": "",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in request.headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+        "extensions": {},
+    }
+    messages = [{"type": "http.request", "body": request.body, "more_body": False}]
+    response = {"status": 0, "size": 0}
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["size"] += len(message.get("body", b""))
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    return Result(request, response["status"], time.perf_counter() - start, response["size"])
+
+
+def call_wsgi(app, request: Request) -> Result:
+    url = urlsplit(request.path)
+    environ = {
+        "REQUEST_METHOD": request.method,
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "CONTENT_LENGTH": str(len(request.body)),
+        "wsgi.input": io.BytesIO(request.body),
+    }
+    for key, value in request.headers:
+        name = key.upper().replace("-", "_")
+        environ[name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{name}"] = value
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = int(status.split(" ", 1)[0])
+
+    start = time.perf_counter()
+    body = app(environ, start_response)
+    try:
+        size = sum(len(chunk) for chunk in body)
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    return Result(request, response.get("status", 0), time.perf_counter() - start, size)
+
+
+_connections = threading.local()
+
+
+def call_http(base_url: str, request: Request) -> Result:
+    """Send a request to a server, over one keep-alive connection per thread."""
+    url = urlsplit(base_url)
+    connection = getattr(_connections, "connection", None)
+    if connection is None:
+        connection = _connections.connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+    start = time.perf_counter()
+    try:
+        connection.request(request.method, url.path.rstrip("/") + request.path, request.body, dict(request.headers))
+        response = connection.getresponse()
+        size = len(response.read())
+    except (http.client.HTTPException, OSError):
+        connection.close()
+        _connections.connection = None
+        raise
+    return Result(request, response.status, time.perf_counter() - start, size)
+
+
+def is_url(app) -> bool:
+    return isinstance(app, str) and app.startswith(("http://", "https://"))
+
+
+async def _run_asgi(app, requests: List[Request], concurrency: int) -> List[Result]:
+    queue = iter(requests)
+    results = []
+
+    async def worker():
+        for request in queue:
+            results.append(await call_asgi(app, request))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+def _run_threads(call: Callable[[Request], Result], requests: List[Request], concurrency: int) -> List[Result]:
+    lock = threading.Lock()
+    queue = iter(requests)
+    results = []
+
+    def worker():
+        while True:
+            with lock:
+                request = next(queue, None)
+            if request is None:
+                return
+            result = call(request)
+            with lock:
+                results.append(result)
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return results
+
+
+def _send(app, requests: List[Request], concurrency: int) -> List[Result]:
+    if is_url(app):
+        return _run_threads(lambda request: call_http(app, request), requests, concurrency)
+    if is_asgi(app):
+        return asyncio.run(_run_asgi(app, requests, concurrency))
+    return _run_threads(lambda request: call_wsgi(app, request), requests, concurrency)
+
+
+def run_load(app, requests: List[Request], concurrency: int = 10, trace_memory: bool = True) -> Tuple[List[Result], float, int]:
+    """
+    Send ``requests`` to ``app``, or to the server at a URL, from ``concurrency`` concurrent clients.
+
+    With ``trace_memory`` the requests are sent a second time under tracemalloc for the peak memory, so the timed
+    run is not slowed down by tracing.
+
+    Returns:
+        Tuple[List[Result], float, int]: The results, the wall time in seconds and the peak traced memory in bytes.
+    """
+    start = time.perf_counter()
+    results = _send(app, requests, concurrency)
+    elapsed = time.perf_counter() - start
+    # A server's memory is its own, not this process's.
+    peak = traced_peak(lambda: _send(app, requests, concurrency)) if trace_memory and not is_url(app) else 0
+    return results, elapsed, peak
+
+
+
+def report(results: List[Result], elapsed: float, peak: int) -> List[Dict[str, object]]:
+    """One row per distinct request plus an overall row, with throughput, latency percentiles and status codes."""
+    groups: Dict[str, List[Result]] = {}
+    for result in results:
+        groups.setdefault(result.request.name, []).append(result)
+    groups["all"] = results
+    rows = []
+    for name, group in groups.items():
+        statuses = Counter(result.status for result in group)
+        rows.append(
+            {
+                "request": name,
+                "rps": len(group) / elapsed if elapsed else 0.0,
+                **summarize([result.seconds for result in group]),
+                "avg_bytes": sum(result.size for result in group) / len(group) if group else 0,
+                "statuses": " ".join(f"{status}x{count}" for status, count in sorted(statuses.items())),
+                "peak_kib": peak / 1024,
+            }
+        )
+    return rows
+
+
+COLUMNS = ["request", "runs", "rps", "p50_ms", "p90_ms", "p99_ms", "max_ms", "avg_bytes", "statuses", "peak_kib"]
+PROFILE_COLUMNS = ["request", "runs", "cpu_ms", "peak_kib", "retained_kib", "hottest"]
+COMPARE_COLUMNS = ["request", "metric", "baseline", "current", "change_pct"]
+# Metrics compared against a baseline, from the load rows and the profiles.
+LOAD_METRICS = ("rps", "p50_ms", "p99_ms")
+PROFILE_METRICS = ("cpu_ms", "peak_kib")
+
+
+def profile_requests(app, mix: List[Request], runs: int = 20, out_dir: Optional[str] = None) -> Dict[str, dict]:
+    """Profile each distinct request of ``mix`` in turn, see profile_request."""
+    if is_url(app):
+        raise ValueError("profiles need the app in process, not a URL")
+    loop = asyncio.new_event_loop() if is_asgi(app) else None
+    profiles = {}
+    try:
+        for request in dict.fromkeys(mix):
+            if loop is not None:
+                call = lambda: loop.run_until_complete(call_asgi(app, request))  # noqa: E731
+            else:
+                call = lambda: call_wsgi(app, request)  # noqa: E731
+            profiles[request.name] = profile_request(call, runs, out_dir, request.name)
+    finally:
+        if loop is not None:
+            loop.close()
+    return profiles
+
+
+def profile_rows(profiles: Dict[str, dict]) -> List[Dict[str, object]]:
+    rows = []
+    for name, profile in profiles.items():
+        hottest = profile["top_functions"][0]["function"] if profile["top_functions"] else ""
+        rows.append({"request": name, **{key: profile[key] for key in PROFILE_COLUMNS[1:-1]}, "hottest": hottest})
+    return rows
+
+
+def summary(rows: List[Dict[str, object]], profiles: Dict[str, dict], **meta) -> Dict[str, object]:
+    """A JSON summary of one run, with the versions it ran on, to keep and compare with later releases."""
+    return {
+        "meta": {
+            "pydantic_web_editor": pydantic_web_editor.__version__,
+            "pydantic": pydantic.VERSION,
+            "python": platform.python_version(),
+            **meta,
+        },
+        "load": rows,
+        "profiles": profiles,
+    }
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object]) -> List[Dict[str, object]]:
+    """The change of each compared metric for every request in both summaries."""
+    rows = []
+    sections = (("load", LOAD_METRICS), ("profiles", PROFILE_METRICS))
+    for section, metrics in sections:
+        before, after = baseline.get(section) or {}, current.get(section) or {}
+        if section == "load":
+            before = {row["request"]: row for row in before}
+            after = {row["request"]: row for row in after}
+        for name in after:
+            if name not in before:
+                continue
+            for metric in metrics:
+                old, new = before[name].get(metric), after[name].get(metric)
+                if old is None or new is None:
+                    continue
+                change = (new - old) / old * 100 if old else 0.0
+                rows.append({"request": name, "metric": metric, "baseline": old, "current": new, "change_pct": change})
+    return rows
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("app", help="the app to load, as package.module:attribute, or the URL of a running server")
+    parser.add_argument("--chdir", help="change to this folder (and add it to sys.path) before importing the app")
+    parser.add_argument("--request", action="append", help='a request to send, e.g. "GET /", may be repeated')
+    parser.add_argument("--mix", choices=sorted(MIXES), help="send a predefined mix of requests instead")
+    parser.add_argument("--payload", default="{}", help="the JSON document the mix's POSTs submit")
+    parser.add_argument("--requests", type=int, default=200, help="total number of requests")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests sent first")
+    parser.add_argument("--profile", metavar="DIR", help="profile each request and write the profiles to this folder")
+    parser.add_argument("--profile-runs", type=int, default=20, help="sequential requests profiled per request")
+    parser.add_argument("--json", help="also write a summary of the results to this file")
+    parser.add_argument("--baseline", help="a summary written by --json to compare the results with")
+    return parser
+
+
+def prepare_app(args):
+    if is_url(args.app):
+        return args.app
+    if args.chdir:
+        os.chdir(args.chdir)
+        sys.path.insert(0, os.getcwd())
+    return load_app(args.app)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    # Output paths are relative to where the harness was started, not to --chdir.
+    args.profile, args.json, args.baseline = (
+        os.path.abspath(path) if path else None for path in (args.profile, args.json, args.baseline)
+    )
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    app = prepare_app(args)
+    if args.mix:
+        mix = MIXES[args.mix](args.payload)
+    else:
+        mix = [Request.parse(spec) for spec in (args.request or ["GET /"])]
+    requests = [mix[i % len(mix)] for i in range(args.requests)]
+    run_load(app, mix * args.warmup, args.concurrency, trace_memory=False)
+    # Timed, memory traced and sampled in separate runs, so no instrument slows down the timed one.
+    rows = report(*run_load(app, requests, args.concurrency, trace_memory=True))
+    if args.profile:
+        with StackSampler() as sampler:
+            run_load(app, requests, args.concurrency, trace_memory=False)
+        os.makedirs(args.profile, exist_ok=True)
+        sampler.write(os.path.join(args.profile, "load.collapsed"))
+    print_table(rows, COLUMNS)
+    profiles = profile_requests(app, mix, args.profile_runs, args.profile) if args.profile else {}
+    if profiles:
+        print()
+        print_table(profile_rows(profiles), PROFILE_COLUMNS)
+    result = summary(rows, profiles, app=args.app, requests=args.requests, concurrency=args.concurrency)
+    changes = compare(baseline, result) if baseline is not None else []
+    if changes:
+        print()
+        print_table(changes, COMPARE_COLUMNS)
+    if args.json:
+        write_json(result, args.json)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Synthetic models of growing size for the benchmarks."""
+from enum import Enum
+from typing import Dict, List, Literal, Optional, Type, Union
+
+from pydantic import BaseModel, Field, PositiveInt, create_model
+
+
+def wide_model(fields: int) -> Type[BaseModel]:
+    """A flat model with ``fields`` optional string, int and list fields."""
+    types = [(Optional[str], None), (int, 0), (List[str], [])]
+    definitions = {
+        f"field_{i}": (types[i % 3][0], Field(types[i % 3][1], description=f"Field number {i}")) for i in range(fields)
+    }
+    return create_model(f"Wide{fields}", **definitions)
+
+
+def deep_model(depth: int, width: int = 3) -> Type[BaseModel]:
+    """A chain of ``depth`` nested models, each with ``width`` scalar fields and a list of the next level."""
+    model = create_model(f"Deep{depth}Leaf", **{f"value_{i}": (str, "") for i in range(width)})
+    for level in range(depth):
+        model = create_model(
+            f"Deep{depth}Level{level}",
+            **{f"value_{i}": (str, "") for i in range(width)},
+            child=(Optional[model], None),
+            children=(List[model], []),
+        )
+    return model
+
+
+def union_model(variants: int) -> Type[BaseModel]:
+    """A Parameter style model (see examples/fastapi_example2.py) with many ``$ref`` heavy unions."""
+    defaults = [
+        create_model(f"Default{i}", **{f"set_default_{i}": ((str, int, float)[i % 3], None)}) for i in range(variants)
+    ]
+    allowed = [List[create_model(f"Allowed{i}", **{f"set_allowed_{i}": (str, None)})] for i in range(variants)]
+    kind = Enum("Kind", {f"KIND_{i}": f"kind-{i}" for i in range(variants)})
+    parameter = create_model(
+        f"Parameter{variants}",
+        Type=(Literal["String", "Number", "List<Number>", "CommaDelimitedList"], "String"),
+        Kind=(kind, next(iter(kind))),
+        Default=(Union[tuple(defaults)], ...),
+        AllowedValues=(Union[tuple(allowed)], None),
+        MinLength=(Optional[PositiveInt], None),
+        MaxLength=(Optional[PositiveInt], None),
+        Tags=(Dict[str, str], {}),
+    )
+    return create_model(f"Parameters{variants}", parameters=(List[parameter], ...))
+
+
+def about_page() -> Optional[Type[BaseModel]]:
+    """The schema.org AboutPage used by examples/fastapi_example.py, if schorg is installed."""
+    try:
+        from schorg.AboutPage import AboutPage
+    except ImportError:
+        return None
+    return AboutPage
+
+
+def benchmark_models(scale: int = 1) -> Dict[str, Type[BaseModel]]:
+    models = {}
+    for size in (10, 100, 500 * scale):
+        models[f"wide-{size}"] = wide_model(size)
+    for depth in (3, 10, 25 * scale):
+        models[f"deep-{depth}"] = deep_model(depth)
+    for variants in (3, 20 * scale):
+        models[f"union-{variants}"] = union_model(variants)
+    page = about_page()
+    if page is not None:
+        models["schema.org-AboutPage"] = page
+    return models
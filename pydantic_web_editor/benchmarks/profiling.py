@@ -0,0 +1,178 @@
+"""
+CPU and allocation profiles for the load harness: a sampling stack collector and per-request cProfile/tracemalloc.
+
+The sampler records whole call stacks from every thread, so its collapsed output (``frame;frame;frame count`` lines)
+can be fed to flamegraph.pl, speedscope or inferno as is. cProfile only records caller and callee pairs, so it is used
+for the per-function tables instead, and its ``.prof`` dumps open in snakeviz or ``python -m pstats``.
+"""
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+SAMPLE_INTERVAL = 0.001
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 10
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of every other thread every ``interval`` seconds while running, e.g. around a load run.
+
+    Sampling holds the GIL briefly once per interval, so it slows the sampled code down by a few percent; compare
+    sampled runs with sampled runs only.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self, skip: Optional[int] = None):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == skip:
+                continue
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=own)
+
+    def start(self) -> "StackSampler":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="harness-stack-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def collapsed(self) -> str:
+        """The samples in collapsed stack format, one ``root;...;leaf count`` line per distinct stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+
+
+def top_functions(stats: pstats.Stats, runs: int, limit: int = TOP_FUNCTIONS) -> List[Dict[str, object]]:
+    """The functions with the most own time, with times in milliseconds per request."""
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{name} ({os.path.basename(filename)}:{line})",
+                "calls": calls / runs,
+                "tottime_ms": tottime * 1000 / runs,
+                "cumtime_ms": cumtime * 1000 / runs,
+            }
+        )
+    rows.sort(key=lambda row: row["tottime_ms"], reverse=True)
+    return rows[:limit]
+
+
+def top_allocations(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, runs: int, limit: int = TOP_ALLOCATIONS):
+    """The source lines whose retained memory grew the most between two snapshots, in bytes per request."""
+    rows = []
+    for diff in after.compare_to(before, "lineno")[:limit]:
+        if diff.size_diff <= 0:
+            break
+        frame = diff.traceback[0]
+        rows.append(
+            {
+                "line": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                "bytes": diff.size_diff / runs,
+                "blocks": diff.count_diff / runs,
+            }
+        )
+    return rows
+
+
+def slug(name: str) -> str:
+    """A file name for a request, e.g. ``"GET /static/bundle.js"`` to ``"get_static_bundle.js"``."""
+    return re.sub(r"[^A-Za-z0-9.]+", "_", name).strip("_").lower() or "request"
+
+
+def profile_request(call: Callable[[], object], runs: int, out_dir: Optional[str] = None, name: str = "request"):
+    """
+    Profile ``runs`` sequential calls of one request: CPU time, cProfile tables, peak and retained allocations, and
+    sampled stacks.
+
+    With ``out_dir`` the cProfile stats are dumped to ``<slug>.prof`` and the sampled stacks to ``<slug>.collapsed``.
+
+    Returns:
+        Dict[str, object]: Per request averages, ``top_functions`` and ``top_allocations``.
+    """
+    # Three passes, so no instrument is measured by another: cProfile on Python 3.12+ sees every thread, sampler
+    # included, and both slow down the timed calls.
+    cpu_start = time.process_time()
+    for _ in range(runs):
+        call()
+    cpu = time.process_time() - cpu_start
+
+    profile = cProfile.Profile()
+    tracemalloc.start()
+    peak = 0
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(runs):
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            profile.enable()
+            try:
+                call()
+            finally:
+                profile.disable()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    with StackSampler() as sampler:
+        for _ in range(runs):
+            call()
+
+    stats = pstats.Stats(profile)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        stats.dump_stats(os.path.join(out_dir, f"{slug(name)}.prof"))
+        sampler.write(os.path.join(out_dir, f"{slug(name)}.collapsed"))
+    # Snapshots include the tracemalloc bookkeeping of the first snapshot, which is not the request's.
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before, after = before.filter_traces(filters), after.filter_traces(filters)
+    return {
+        "runs": runs,
+        "cpu_ms": cpu * 1000 / runs,
+        "peak_kib": peak / 1024,
+        "retained_kib": sum(max(0, diff.size_diff) for diff in after.compare_to(before, "filename")) / 1024 / runs,
+        "top_functions": top_functions(stats, runs),
+        "top_allocations": top_allocations(before, after, runs),
+    }
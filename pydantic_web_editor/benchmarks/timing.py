@@ -0,0 +1,78 @@
+"""Small timing and reporting helpers shared by the benchmark scripts."""
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds for a list of durations in seconds."""
+    ms = [sample * 1000 for sample in samples]
+    return {
+        "runs": len(ms),
+        "mean_ms": statistics.fmean(ms) if ms else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p90_ms": percentile(ms, 90),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": max(ms, default=0.0),
+    }
+
+
+def traced_peak(fn: Callable[[], object]) -> int:
+    """Call ``fn`` once under tracemalloc, returning the most memory it held at once in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn: Callable[[], object], repeat: int = 20, setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:
+    """
+    Time ``fn`` ``repeat`` times, calling ``setup`` (untimed) before each run, and record its peak traced memory.
+
+    The peak is taken in one more, untimed run, since tracing every allocation makes the traced runs several times
+    slower.
+    """
+    samples = []
+    gc.collect()
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    result = summarize(samples)
+    result["peak_kib"] = traced_peak(fn) / 1024
+    return result
+
+
+def print_table(rows: List[Dict[str, object]], columns: List[str]):
+    widths = {column: max(len(column), *(len(_fmt(row.get(column))) for row in rows)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(column)).ljust(widths[column]) for column in columns))
+
+
+def _fmt(value) -> str:
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+
+def write_json(results: object, path: str):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
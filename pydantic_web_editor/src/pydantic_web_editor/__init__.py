@@ -1,3 +1,12 @@
 __version__ = "0.1.0"
 
 from pydantic_web_editor.main import *
+from pydantic_web_editor.compiled import CompiledEditor
+from pydantic_web_editor.compose import compose_page
+
+
+def __getattr__(name: str):
+    # ENV and the *_TEMPLATE globals are created lazily, so star imports cannot re-export them.
+    from pydantic_web_editor import main
+
+    return getattr(main, name)
@@ -0,0 +1,63 @@
+"""
+Command line tools, run as ``python -m pydantic_web_editor <command>``.
+
+    build      Prerender editor configs into a static site folder.
+    assets     Fingerprint and precompress a static folder.
+    templates  Precompile the page templates into Python modules.
+"""
+import argparse
+import sys
+
+
+def build(args):
+    from pydantic_web_editor.build import build_site, load_configs
+
+    if args.path:
+        sys.path.insert(0, args.path)
+    configs = load_configs(args.targets)
+    if not configs:
+        raise SystemExit(f"no WebEditorConfig objects found in {', '.join(args.targets)}")
+    for result in build_site(configs, args.out, force=args.force):
+        print(f"{'skipped' if result.skipped else 'built'}  {result.name} -> {result.path}")
+
+
+def assets(args):
+    from pydantic_web_editor.assets import build_static_assets
+
+    for name, hashed in build_static_assets(args.static_path).items():
+        print(f"{name} -> {hashed}")
+
+
+def templates(args):
+    from pydantic_web_editor.templating import COMPILED_TEMPLATES_ENV, compile_templates
+
+    target = compile_templates(args.out, zip="deflated" if args.zip else None)
+    print(f"compiled templates -> {target}, load them with {COMPILED_TEMPLATES_ENV}={target}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pydantic_web_editor", description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="prerender editor configs into a static site folder")
+    build_parser.add_argument("targets", nargs="+", help="module:attribute, or a module to collect every config from")
+    build_parser.add_argument("-o", "--out", default="site", help="output folder (default: site)")
+    build_parser.add_argument("--path", default=".", help="added to sys.path before importing targets (default: .)")
+    build_parser.add_argument("--force", action="store_true", help="rebuild pages even if their inputs are unchanged")
+    build_parser.set_defaults(func=build)
+
+    assets_parser = commands.add_parser("assets", help="fingerprint and precompress a static folder")
+    assets_parser.add_argument("static_path", nargs="?", help="defaults to the package static folder")
+    assets_parser.set_defaults(func=assets)
+
+    templates_parser = commands.add_parser("templates", help="precompile the page templates into Python modules")
+    templates_parser.add_argument("out", help="output folder, or zip file with --zip")
+    templates_parser.add_argument("--zip", action="store_true", help="write a zip archive instead of a folder")
+    templates_parser.set_defaults(func=templates)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
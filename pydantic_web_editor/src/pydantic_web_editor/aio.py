@@ -0,0 +1,77 @@
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional
+
+from pydantic_web_editor.cache import RENDER_CACHE
+
+if TYPE_CHECKING:  # asyncio and concurrent.futures are imported on first use to keep the package import fast
+    import asyncio
+    from concurrent.futures import Executor
+
+
+_RENDER_EXECUTOR: Optional["Executor"] = None
+# In-flight renders per event loop, so callers on different loops never await each other's futures.
+_IN_FLIGHT: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def set_render_executor(executor: Optional["Executor"]):
+    """
+    Choose where async renders run their CPU-bound schema generation and template rendering.
+
+    Parameters:
+        executor (Optional[Executor]): A ThreadPoolExecutor or ProcessPoolExecutor. None uses the event loop's
+            default thread pool. With a process pool, models must be importable so configs can be pickled.
+    """
+    global _RENDER_EXECUTOR
+    _RENDER_EXECUTOR = executor
+
+
+def _render_config(config: Any) -> str:
+    render = getattr(config, "render", None)
+    return render() if render is not None else config.html
+
+
+async def _render_and_store(config: Any, key: Hashable, executor: Optional["Executor"]) -> str:
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    html = await loop.run_in_executor(executor, _render_config, config)
+    if getattr(config, "cache_render", False):
+        RENDER_CACHE.set(key, html, getattr(config, "cache_shared", True))
+    return html
+
+
+async def render_async(config: Any, executor: Optional["Executor"] = None) -> str:
+    """
+    Render an editor page without blocking the event loop.
+
+    Cached pages are returned immediately. Otherwise the render is offloaded to ``executor`` (or the one set with
+    set_render_executor) and concurrent renders of the same config share a single in-flight computation.
+
+    Parameters:
+        config (Any): A WebEditorConfig, or anything with an ``html`` property.
+        executor (Optional[Executor]): Overrides the configured render executor for this call.
+
+    Returns:
+        str: The rendered html.
+    """
+    import asyncio
+
+    key = getattr(config, "cache_key", None)
+    if key is None:
+        key = ("id", id(config))
+    elif getattr(config, "cache_render", False):
+        html = RENDER_CACHE.get(key, getattr(config, "cache_shared", True))
+        if html is not None:
+            return html
+
+    loop = asyncio.get_running_loop()
+    in_flight = _IN_FLIGHT.setdefault(loop, {})
+    task = in_flight.get(key)
+    if task is None:
+        task = loop.create_task(_render_and_store(config, key, executor or _RENDER_EXECUTOR))
+        in_flight[key] = task
+        task.add_done_callback(lambda _: in_flight.pop(key, None))
+    # shield() keeps one cancelled request from cancelling the render the other waiters share.
+    return await asyncio.shield(task)
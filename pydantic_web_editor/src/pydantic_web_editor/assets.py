@@ -0,0 +1,388 @@
+import contextlib
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, only gzip siblings are produced without it
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, syncing then relies on atomic renames alone
+    fcntl = None
+
+
+MANIFEST_NAME = "manifest.json"
+SYNC_MANIFEST_NAME = ".pydantic_web_editor_sync.json"
+SYNC_LOCK_NAME = ".pydantic_web_editor.lock"
+FINGERPRINT_SUFFIXES = (".js", ".css")
+COMPRESS_SUFFIXES = (".js", ".css", ".json", ".svg", ".txt", ".html", ".map")
+COMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+CHUNK_SIZE = 64 * 1024
+
+
+def package_static_path() -> str:
+    """The static folder shipped inside the installed pydantic_web_editor package."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprinted_name(name: str, digest: str) -> str:
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest[:12]}{ext}"
+
+
+def _source_files(static_path: str, manifest: Dict[str, str]) -> Iterable[str]:
+    generated = set(manifest.values()) | {MANIFEST_NAME}
+    for dirpath, _, filenames in os.walk(static_path):
+        for filename in sorted(filenames):
+            rel = os.path.relpath(os.path.join(dirpath, filename), static_path).replace(os.sep, "/")
+            if filename.startswith(".") or rel in generated or rel.endswith(tuple(COMPRESSED_SUFFIXES.values())):
+                continue
+            yield rel
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def compress_file(path: str) -> List[str]:
+    """Write ``.gz`` (and ``.br`` when brotli is installed) siblings next to ``path``."""
+    with open(path, "rb") as f:
+        data = f.read()
+    written = [f"{path}.gz"]
+    # mtime=0 keeps the gzip output byte for byte reproducible between builds.
+    _write_atomic(written[0], gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        written.append(f"{path}.br")
+        _write_atomic(written[1], brotli.compress(data, quality=11))
+    return written
+
+
+def build_static_assets(static_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Fingerprint and precompress a static folder, writing a manifest of logical to hashed names.
+
+    Parameters:
+        static_path (Optional[str]): The folder to process. Defaults to the package static folder.
+
+    Returns:
+        Dict[str, str]: The manifest, e.g. ``{"bundle.js": "bundle.0123456789ab.js"}``.
+    """
+    static_path = static_path or package_static_path()
+    old_manifest = read_manifest(static_path)
+    manifest = {}
+    for rel in _source_files(static_path, old_manifest):
+        source = os.path.join(static_path, rel)
+        target = source
+        if rel.endswith(FINGERPRINT_SUFFIXES):
+            hashed = fingerprinted_name(rel, file_digest(source))
+            manifest[rel] = hashed
+            target = os.path.join(static_path, hashed)
+            if not os.path.exists(target):
+                with open(source, "rb") as f:
+                    _write_atomic(target, f.read())
+        if rel.endswith(COMPRESS_SUFFIXES):
+            compress_file(target)
+    # Drop fingerprinted files left over from previous builds.
+    for rel, hashed in old_manifest.items():
+        if manifest.get(rel) != hashed:
+            for stale in [hashed] + [hashed + suffix for suffix in COMPRESSED_SUFFIXES.values()]:
+                stale_path = os.path.join(static_path, stale)
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+    _write_atomic(os.path.join(static_path, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    load_manifest.cache_clear()
+    return manifest
+
+
+def read_manifest(static_path: str) -> Dict[str, str]:
+    return read_manifest_file(os.path.join(static_path, MANIFEST_NAME))
+
+
+@lru_cache(maxsize=None)
+def load_manifest(static_path: Optional[str] = None) -> Dict[str, str]:
+    return read_manifest(static_path or package_static_path())
+
+
+def asset_path(name: str, static_path: Optional[str] = None) -> str:
+    """The fingerprinted name for a static asset, or the name itself if the folder was never built."""
+    return load_manifest(static_path).get(name, name)
+
+
+def _file_signature(path: str, compare: str):
+    if compare == "hash":
+        return file_digest(path)
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _source_signatures(source: str, compare: str) -> Dict[str, object]:
+    signatures = {}
+    for dirpath, _, filenames in os.walk(source):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            rel = os.path.relpath(path, source).replace(os.sep, "/")
+            signatures[rel] = _file_signature(path, compare)
+    return signatures
+
+
+def _out_of_sync(dest: str, signatures: Dict[str, object]) -> List[str]:
+    """The relative paths that are missing from ``dest`` or changed since the last sync."""
+    synced = read_manifest_file(os.path.join(dest, SYNC_MANIFEST_NAME))
+    return [
+        rel
+        for rel, signature in signatures.items()
+        if synced.get(rel) != signature or not os.path.exists(os.path.join(dest, rel))
+    ]
+
+
+def read_manifest_file(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+@contextlib.contextmanager
+def host_lock(path: str):
+    """An exclusive advisory lock on ``path`` shared by every process on the host."""
+    with open(path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _copy_atomic(source: str, target: str):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp, open(source, "rb") as f:
+            shutil.copyfileobj(f, tmp, CHUNK_SIZE)
+        os.replace(tmp_path, target)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+def sync_static_folder(source: str, dest: str, compare: str = "stat") -> int:
+    """
+    Incrementally mirror ``source`` into ``dest``.
+
+    Only files whose size/mtime (``compare="stat"``) or content hash (``compare="hash"``) changed since the
+    last sync are copied. Files are written to a temp file and renamed into place, so readers never see a
+    partial file, and a per-host file lock makes concurrent workers wait for one process to do the work.
+
+    Parameters:
+        source (str): The folder to copy from.
+        dest (str): The existing folder to copy into.
+        compare (str): "stat" or "hash".
+
+    Returns:
+        int: The number of files copied.
+    """
+    if compare not in ("stat", "hash"):
+        raise ValueError(f"compare must be 'stat' or 'hash', got {compare!r}")
+    signatures = _source_signatures(source, compare)
+    if not _out_of_sync(dest, signatures):
+        # Fast path: every worker after the first returns here without taking the lock.
+        return 0
+    with host_lock(os.path.join(dest, SYNC_LOCK_NAME)):
+        # Another worker may have finished the sync while we waited for the lock.
+        changed = _out_of_sync(dest, signatures)
+        for rel in changed:
+            _copy_atomic(os.path.join(source, rel), os.path.join(dest, rel))
+        if changed:
+            _write_atomic(os.path.join(dest, SYNC_MANIFEST_NAME), json.dumps(signatures, sort_keys=True).encode())
+        return len(changed)
+
+
+def parse_accept_encoding(header: Optional[str]) -> List[str]:
+    """The encodings in an Accept-Encoding header that we can serve, most preferred first."""
+    if not header:
+        return []
+    weighted = []
+    for position, part in enumerate(header.split(",")):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        coding = coding.strip().lower()
+        if q > 0 and coding in COMPRESSED_SUFFIXES:
+            # Prefer brotli over gzip at equal weight, it is noticeably smaller for js bundles.
+            weighted.append((-q, 0 if coding == "br" else 1, position, coding))
+    return [coding for *_, coding in sorted(weighted)]
+
+
+class ResolvedAsset(NamedTuple):
+    path: str
+    size: int
+    headers: List[Tuple[str, str]]
+
+
+class StaticAssets:
+    """
+    Resolves request paths to precompressed files in a static folder with cache headers.
+
+    Fingerprinted names from the manifest are served with far-future immutable caching. Use
+    ``StaticAssets.wsgi()`` or ``StaticAssets.asgi()`` to mount it in a framework.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = os.path.realpath(directory or package_static_path())
+        self.immutable = set(read_manifest(self.directory).values())
+
+    def resolve(self, path: str, accept_encoding: Optional[str] = None) -> Optional[ResolvedAsset]:
+        rel = path.lstrip("/")
+        full_path = os.path.realpath(os.path.join(self.directory, rel))
+        if os.path.commonpath([full_path, self.directory]) != self.directory or not os.path.isfile(full_path):
+            return None
+        content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        headers = [("Content-Type", content_type), ("Vary", "Accept-Encoding")]
+        served_path = full_path
+        for coding in parse_accept_encoding(accept_encoding):
+            candidate = full_path + COMPRESSED_SUFFIXES[coding]
+            if os.path.isfile(candidate):
+                served_path = candidate
+                headers.append(("Content-Encoding", coding))
+                break
+        from email.utils import formatdate
+
+        stat = os.stat(served_path)
+        cache_control = IMMUTABLE_CACHE_CONTROL if rel in self.immutable else DEFAULT_CACHE_CONTROL
+        headers += [
+            ("Content-Length", str(stat.st_size)),
+            ("Cache-Control", cache_control),
+            ("ETag", f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'),
+            ("Last-Modified", formatdate(stat.st_mtime, usegmt=True)),
+        ]
+        return ResolvedAsset(served_path, stat.st_size, headers)
+
+    def wsgi(self):
+        return StaticAssetsWSGI(self)
+
+    def asgi(self):
+        return StaticAssetsASGI(self)
+
+
+def _not_modified(asset: ResolvedAsset, if_none_match: Optional[str]) -> bool:
+    etag = dict(asset.headers)["ETag"]
+    return bool(if_none_match) and etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+class StaticAssetsWSGI:
+    def __init__(self, assets: StaticAssets):
+        self.assets = assets
+
+    def __call__(self, environ, start_response):
+        if environ["REQUEST_METHOD"] not in ("GET", "HEAD"):
+            start_response("405 Method Not Allowed", [("Allow", "GET, HEAD")])
+            return [b""]
+        asset = self.assets.resolve(environ.get("PATH_INFO", ""), environ.get("HTTP_ACCEPT_ENCODING"))
+        if asset is None:
+            start_response("404 Not Found", [("Content-Type", "text/plain")])
+            return [b"Not Found"]
+        if _not_modified(asset, environ.get("HTTP_IF_NONE_MATCH")):
+            start_response("304 Not Modified", [h for h in asset.headers if h[0] != "Content-Length"])
+            return [b""]
+        start_response("200 OK", asset.headers)
+        if environ["REQUEST_METHOD"] == "HEAD":
+            return [b""]
+        f = open(asset.path, "rb")
+        # wsgi.file_wrapper lets servers like gunicorn hand the file to sendfile().
+        file_wrapper = environ.get("wsgi.file_wrapper")
+        if file_wrapper is not None:
+            return file_wrapper(f, CHUNK_SIZE)
+        return _iter_file(f)
+
+
+def _iter_file(f):
+    with f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            yield chunk
+
+
+class StaticAssetsASGI:
+    def __init__(self, assets: StaticAssets):
+        self.assets = assets
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        request_headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        if scope["method"] not in ("GET", "HEAD"):
+            await _send_simple(send, 405, [("Allow", "GET, HEAD")])
+            return
+        asset = self.assets.resolve(scope["path"], request_headers.get("accept-encoding"))
+        if asset is None:
+            await _send_simple(send, 404, [("Content-Type", "text/plain")], b"Not Found")
+            return
+        if _not_modified(asset, request_headers.get("if-none-match")):
+            await _send_simple(send, 304, [h for h in asset.headers if h[0] != "Content-Length"])
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in asset.headers],
+            }
+        )
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        f = await loop.run_in_executor(None, open, asset.path, "rb")
+        try:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({"type": "http.response.zerocopysend", "file": f})
+                return
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, CHUNK_SIZE)
+                more_body = len(chunk) == CHUNK_SIZE
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                if not more_body:
+                    break
+        finally:
+            f.close()
+
+
+async def _send_simple(send, status: int, headers: List[Tuple[str, str]], body: bytes = b""):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,202 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from pydantic_web_editor import __version__
+from pydantic_web_editor.fingerprint import model_fingerprint
+
+
+class CacheBackend:
+    """
+    A string store that RenderCache and SchemaRegistry use behind their per-process caches.
+
+    Implementations shared between processes, like SQLiteBackend, let every worker on a host reuse pages and schemas
+    any one of them rendered. Keys are strings built with model_identity, so they mean the same in every process.
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str):
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with ``prefix``, returning how many were removed."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """A bounded, per-process LRU backend, mostly useful for tests and single process servers."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _check_owner(path: str, info: os.stat_result):
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user, refusing to use it as a cache")
+
+
+def default_cache_path() -> str:
+    """
+    The database file SQLiteBackend uses by default, in a per-user ``pydantic_web_editor`` folder under
+    ``$XDG_CACHE_HOME`` or ``~/.cache`` that only the user can open.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.path.join(base, "pydantic_web_editor")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    _check_owner(directory, info)
+    if hasattr(os, "getuid") and info.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+    return os.path.join(directory, "cache.sqlite")
+
+
+def _open_private(path: str):
+    """Create ``path`` for this user only, refusing it or its WAL files if another user owns them."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    try:
+        info = os.fstat(fd)
+        _check_owner(path, info)
+        if hasattr(os, "fchmod") and info.st_mode & 0o077:
+            os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+    # SQLite creates these with the database's permissions, but one planted beforehand would be used as is.
+    for suffix in ("-wal", "-shm"):
+        if os.path.lexists(path + suffix):
+            _check_owner(path + suffix, os.lstat(path + suffix))
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    A backend in a local SQLite file that every process on the host opens, so pages and schemas are stored and warmed
+    once per host instead of once per worker.
+
+    The database runs in WAL mode, so readers never block each other or the writer, and is memory mapped, so reads
+    are served from the OS page cache that all workers share rather than a private copy per process. Each process
+    keeps only what it is currently using in its own LRU in front.
+
+    Every entry belongs to a generation, a hash of the package version and ``version``, which prefixes its key, so
+    workers only ever read entries written by the same release. During a rolling deploy, pages that workers still on
+    the old release keep writing are never served by the new ones. Opening the store with a different generation
+    drops every other generation's entries. Keys already include each model's fingerprint, so ``version`` is only
+    needed to drop entries after changes a fingerprint cannot see, e.g. to your own templates.
+
+    The file is created readable by its owner only, and one owned by another user is refused with PermissionError,
+    since whoever can write it decides what pages are served. Pages rendered with a ``start_val`` are only stored
+    here if their config sets ``share_start_val``.
+
+    Parameters:
+        path (Optional[str]): The database file, by default one in the user's cache folder, see default_cache_path.
+        version (Optional[str]): Your app's version, mixed into the generation.
+        mmap_size (int): Bytes of the database to memory map.
+    """
+
+    def __init__(self, path: Optional[str] = None, version: Optional[str] = None, mmap_size: int = 256 * 1024 * 1024):
+        self.path = path or default_cache_path()
+        _open_private(self.path)
+        self.mmap_size = mmap_size
+        self.generation = hashlib.sha256(f"{__version__}\0{version or ''}".encode("utf-8")).hexdigest()[:16]
+        self._prefix = f"{self.generation}:"
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+            if row is None or row[0] != self.generation:
+                connection.execute(
+                    "DELETE FROM entries WHERE substr(key, 1, ?) != ?", (len(self._prefix), self._prefix)
+                )
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (self.generation,))
+
+    def _connection(self):
+        # Connections are per thread and per process, sqlite3 connections must not cross a fork.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            import sqlite3
+
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            connection.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def get(self, key):
+        row = self._connection().execute("SELECT value FROM entries WHERE key = ?", (self._prefix + key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, key, value):
+        self._connection().execute("INSERT OR REPLACE INTO entries VALUES (?, ?)", (self._prefix + key, value))
+
+    def delete_prefix(self, prefix):
+        escaped = (self._prefix + prefix).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        cursor = self._connection().execute("DELETE FROM entries WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",))
+        return cursor.rowcount
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries")
+
+
+@lru_cache(maxsize=None)
+def model_identity(model: Any) -> Optional[str]:
+    """
+    A name for a model that is the same in every process, or None if it has none.
+
+    It ends with the model's structural fingerprint, so entries written for a different definition of the model, e.g.
+    by workers still running the previous release during a rolling deploy, are never read back.
+    """
+    if isinstance(model, TypeAdapter):
+        return f"TypeAdapter@{model_fingerprint(model)}"
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        return None
+    return f"{model.__module__}.{model.__qualname__}@{model_fingerprint(model)}"
+
+
+def set_cache_backend(backend: Optional[CacheBackend]):
+    """
+    Put ``backend`` behind the render cache and the schema registry, e.g. ``set_cache_backend(SQLiteBackend())`` in
+    each worker. None goes back to per-process caching only.
+    """
+    from pydantic_web_editor.cache import RENDER_CACHE
+    from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY
+
+    RENDER_CACHE.backend = backend
+    SCHEMA_REGISTRY.backend = backend
@@ -0,0 +1,140 @@
+import importlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+from pydantic_web_editor import __version__
+from pydantic_web_editor.assets import build_static_assets, file_digest, package_static_path, sync_static_folder
+from pydantic_web_editor.cache import stable_hash
+from pydantic_web_editor.lazy import DEFS_KEY, DEFS_SEGMENT, lazy_def_entry
+from pydantic_web_editor.main import WebEditorConfig, WebEditorConfig2
+from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY, schema_name
+
+BUILD_MANIFEST_NAME = ".pydantic_web_editor_build.json"
+TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+EDITOR_CONFIG_TYPES = (WebEditorConfig, WebEditorConfig2)
+
+
+class BuildResult(NamedTuple):
+    name: str
+    path: str
+    skipped: bool
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "editor"
+
+
+def _named_configs(value: Any, name: str) -> Dict[str, Any]:
+    if isinstance(value, EDITOR_CONFIG_TYPES):
+        return {name: value}
+    if isinstance(value, dict):
+        return {slugify(key): config for key, config in value.items()}
+    if isinstance(value, (list, tuple)):
+        return {slugify(config.title): config for config in value}
+    raise TypeError(f"{name} is not a WebEditorConfig, or a list or dict of them")
+
+
+def load_configs(targets: Iterable[str]) -> Dict[str, Any]:
+    """
+    Import editor configs from ``module:attribute`` targets, or every module level config from a ``module`` target.
+
+    An attribute may be a single config (named after the attribute), a list (named after each title) or a dict
+    (named after each key).
+    """
+    configs = {}
+    for target in targets:
+        module_name, _, attribute = target.partition(":")
+        module = importlib.import_module(module_name)
+        if attribute:
+            configs.update(_named_configs(getattr(module, attribute), slugify(attribute)))
+            continue
+        for name, value in vars(module).items():
+            if isinstance(value, EDITOR_CONFIG_TYPES):
+                configs[slugify(name)] = value
+    return configs
+
+
+def _templates_digest() -> str:
+    return stable_hash({name: file_digest(os.path.join(TEMPLATES_PATH, name)) for name in sorted(os.listdir(TEMPLATES_PATH))})
+
+
+def _write(path: str, data: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_schemas(out_dir: str, config: Any) -> List[str]:
+    """Write the schema, and each lazily loaded definition, where the schema handlers would serve them."""
+    schema_mount = getattr(config, "schema_mount", "schemas")
+    name = schema_name(config.model)
+    written = [os.path.join(out_dir, schema_mount, f"{name}.json")]
+    _write(written[0], SCHEMA_REGISTRY.schema_json(config.model))
+    for def_name in SCHEMA_REGISTRY.schema(config.model).get(DEFS_KEY, {}):
+        path = os.path.join(out_dir, schema_mount, name, DEFS_SEGMENT, f"{def_name}.json")
+        _write(path, lazy_def_entry(config.model, def_name, schema_mount).json)
+        written.append(path)
+    return written
+
+
+def build_site(configs: Dict[str, Any], out_dir: str, force: bool = False) -> List[BuildResult]:
+    """
+    Prerender editor pages into a static site that any web server can serve without Python.
+
+    Writes ``<out_dir>/<name>/index.html`` per config, the schemas under each config's schema_mount, and the
+    package's static assets, fingerprinted and precompressed, under ``<out_dir>/static``. Pages whose inputs (config,
+    schema, templates, assets and package version) are unchanged since the last build are skipped.
+
+    Parameters:
+        configs (Dict[str, Any]): Editor configs keyed by the folder name their page is written to.
+        out_dir (str): The site folder, created if needed.
+        force (bool): Rebuild every page even if unchanged.
+
+    Returns:
+        List[BuildResult]: One result per config.
+    """
+    static_dir = os.path.join(out_dir, "static")
+    os.makedirs(static_dir, exist_ok=True)
+    assets_changed = sync_static_folder(package_static_path(), static_dir)
+    manifest_path = os.path.join(static_dir, "manifest.json")
+    if assets_changed or not os.path.exists(manifest_path):
+        build_static_assets(static_dir)
+    shared_inputs = {
+        "version": __version__,
+        "templates": _templates_digest(),
+        "assets": file_digest(manifest_path),
+    }
+
+    build_manifest_path = os.path.join(out_dir, BUILD_MANIFEST_NAME)
+    try:
+        with open(build_manifest_path) as f:
+            previous = json.load(f)
+    except (FileNotFoundError, ValueError):
+        previous = {}
+
+    results, built = [], {}
+    for name, config in configs.items():
+        if isinstance(config, WebEditorConfig):
+            config = config.model_copy(update={"static_path": static_dir, "cache_render": False})
+        page_path = os.path.join(out_dir, name, "index.html")
+        inputs = stable_hash(
+            {
+                **shared_inputs,
+                "config": config.model_dump(mode="json", exclude={"model", "static_path"}),
+                "schema": SCHEMA_REGISTRY.get(config.model).etag,
+            }
+        )
+        built[name] = inputs
+        if not force and previous.get(name) == inputs and os.path.exists(page_path):
+            results.append(BuildResult(name, page_path, True))
+            continue
+        _write_schemas(out_dir, config)
+        _write(page_path, config.html)
+        results.append(BuildResult(name, page_path, False))
+
+    _write(build_manifest_path, json.dumps({**previous, **built}, indent=2, sort_keys=True))
+    return results
@@ -0,0 +1,197 @@
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+
+from pydantic import BaseModel, ValidationError
+
+from pydantic_web_editor.encoding import dumps_json
+from pydantic_web_editor.instrumentation import SUBMISSION_VALIDATE, timed
+from pydantic_web_editor.submissions import (
+    SubmissionResponse,
+    _json_response,
+    editor_errors,
+    get_batch_type_adapter,
+)
+
+BULK_PAGE_SIZE = 50
+MAX_BULK_PAGE_SIZE = 500
+# Schema types shown as columns in the bulk list, anything else is only visible in the row's editor.
+COLUMN_TYPES = ("string", "integer", "number", "boolean")
+MAX_BULK_COLUMNS = 4
+
+
+def bulk_columns(schema: dict, limit: int = MAX_BULK_COLUMNS) -> List[str]:
+    """The first ``limit`` scalar properties of an object schema, shown as the bulk list's columns."""
+    columns = []
+    for name, prop in schema.get("properties", {}).items():
+        types = prop.get("type")
+        types = types if isinstance(types, list) else [types]
+        if any(t in COLUMN_TYPES for t in types) or "enum" in prop:
+            columns.append(name)
+            if len(columns) == limit:
+                break
+    return columns
+
+
+class BulkStore:
+    """
+    The documents a bulk editor pages through, for BulkHandler.
+
+    ``window`` returns ``(id, document)`` pairs for one page, in a stable order, and ``save`` receives validated
+    instances keyed by id for only the rows the user edited. Ids must be JSON serializable and survive the round trip,
+    e.g. primary keys. Raise KeyError from ``save`` for an id that does not exist.
+    """
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def window(self, offset: int, limit: int) -> List[Tuple[Hashable, Any]]:
+        raise NotImplementedError
+
+    def save(self, rows: Dict[Hashable, Any]):
+        raise NotImplementedError
+
+
+class ListBulkStore(BulkStore):
+    """A BulkStore over an in-memory list, using list indexes as ids. Saved rows replace the list items in place."""
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self._lock = threading.Lock()
+
+    def count(self):
+        return len(self.items)
+
+    def window(self, offset, limit):
+        with self._lock:
+            items = self.items[offset : offset + limit]
+        return [(offset + i, item) for i, item in enumerate(items)]
+
+    def save(self, rows):
+        with self._lock:
+            for row_id in rows:
+                if not isinstance(row_id, int) or not 0 <= row_id < len(self.items):
+                    raise KeyError(row_id)
+            for row_id, instance in rows.items():
+                self.items[row_id] = instance
+
+
+def _page_response(value: Any) -> SubmissionResponse:
+    return SubmissionResponse(200, {"Content-Type": "application/json"}, dumps_json(value).encode("utf-8"))
+
+
+def _bad_request(property: str, message: str) -> SubmissionResponse:
+    return _json_response(400, {"valid": False, "errors": [{"path": "root", "property": property, "message": message}]})
+
+
+class BulkHandler:
+    """
+    Serves a bulk editor's rows a page at a time and saves the rows it edited.
+
+    GET requests page through the store with ``?offset=&limit=``, answering ``{"total", "offset", "items"}`` where
+    each item is ``{"id", "value"}``; the editor only fetches the windows scrolled into view. POST bodies are
+    ``{"rows": [{"id", "value"}, ...]}`` holding only edited rows, which are validated in one pass. Invalid rows get
+    a 422 with json-editor style errors carrying the row's ``id``, valid ones are saved together.
+
+    Parameters:
+        model (Any): The BaseModel subclass each row is an instance of.
+        store (BulkStore): Where the rows live.
+        on_valid (Optional[Callable]): Called with the saved ``{id: instance}`` dict. Its return value, if JSON
+            serializable, becomes the response's ``result``.
+        max_page_size (int): The most rows one GET may ask for.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        store: BulkStore,
+        on_valid: Optional[Callable[[Dict[Hashable, Any]], Any]] = None,
+        max_page_size: int = MAX_BULK_PAGE_SIZE,
+    ):
+        self.model = model
+        self.store = store
+        self.on_valid = on_valid
+        self.max_page_size = max_page_size
+
+    def page(self, offset: int = 0, limit: int = BULK_PAGE_SIZE) -> SubmissionResponse:
+        if offset < 0 or limit < 1:
+            return _bad_request("page", "offset must be >= 0 and limit >= 1")
+        limit = min(limit, self.max_page_size)
+        items = []
+        for row_id, value in self.store.window(offset, limit):
+            if isinstance(value, BaseModel):
+                value = value.model_dump(mode="json")
+            items.append({"id": row_id, "value": value})
+        return _page_response({"total": self.store.count(), "offset": offset, "items": items})
+
+    def page_from_query(self, query_string: str) -> SubmissionResponse:
+        """Like page, taking ``offset`` and ``limit`` from a raw query string."""
+        query = parse_qs(query_string or "")
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(BULK_PAGE_SIZE)])[0])
+        except ValueError as e:
+            return _bad_request("page", str(e))
+        return self.page(offset, limit)
+
+    def validate(self, ids: Sequence[Hashable], values: List[Any]) -> Dict[Hashable, Any]:
+        with timed(SUBMISSION_VALIDATE, model=self.model, mode="bulk"):
+            return dict(zip(ids, get_batch_type_adapter(self.model).validate_python(values)))
+
+    def __call__(self, body: bytes, content_type: Optional[str] = None) -> SubmissionResponse:
+        try:
+            rows = json.loads(body or b"null")["rows"]
+            ids = [row["id"] for row in rows]
+            values = [row["value"] for row in rows]
+        except (ValueError, TypeError, KeyError) as e:
+            return _bad_request("json", f"expected {{\"rows\": [{{\"id\", \"value\"}}]}}: {e}")
+        try:
+            validated = self.validate(ids, values)
+        except ValidationError as e:
+            errors = editor_errors(e)
+            for error, detail in zip(errors, e.errors(include_url=False)):
+                error["id"] = ids[detail["loc"][0]] if detail["loc"] else None
+            return _json_response(422, {"valid": False, "errors": errors})
+        try:
+            self.store.save(validated)
+        except KeyError as e:
+            errors = [{"path": "root", "property": "id", "message": f"no row with id {e.args[0]!r}", "id": e.args[0]}]
+            return _json_response(404, {"valid": False, "errors": errors})
+        result = self.on_valid(validated) if self.on_valid is not None else None
+        return _json_response(200, {"valid": True, "count": len(validated), "result": result})
+
+
+def flask_bulk_view(handler: BulkHandler):
+    """
+    Create a Flask view for a bulk handler, e.g. ``app.add_url_rule("/rows", view_func=..., methods=["GET", "POST"])``.
+    """
+    from flask import Response, request
+
+    def bulk_view():
+        if request.method == "GET":
+            status, headers, body = handler.page_from_query(request.query_string.decode("latin-1"))
+        else:
+            status, headers, body = handler(request.get_data(), request.content_type)
+        return Response(body, status=status, headers=headers)
+
+    return bulk_view
+
+
+def fastapi_bulk_router(handler: BulkHandler, path: str):
+    """Create a FastAPI router paging on GET and saving on POST at ``path``."""
+    from fastapi import APIRouter, Request, Response
+
+    router = APIRouter()
+
+    async def bulk_page(request: Request):
+        status, headers, body = handler.page_from_query(request.url.query)
+        return Response(content=body, status_code=status, headers=headers)
+
+    async def bulk_save(request: Request):
+        status, headers, body = handler(await request.body(), request.headers.get("content-type"))
+        return Response(content=body, status_code=status, headers=headers)
+
+    router.add_api_route(path, bulk_page, methods=["GET"])
+    router.add_api_route(path, bulk_save, methods=["POST"])
+    return router
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable, Optional, Type
+
+from pydantic import BaseModel
+
+from pydantic_web_editor.backends import CacheBackend, model_identity
+from pydantic_web_editor.instrumentation import RENDER_CACHE_HIT, RENDER_CACHE_MISS, record_count
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def stable_hash(value: Any) -> str:
+    """
+    Hash a JSON-compatible value so equal configs always produce the same digest.
+
+    Parameters:
+        value (Any): The value to hash. Keys are sorted and non JSON types fall back to ``str``.
+
+    Returns:
+        str: A hex sha256 digest.
+    """
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    A thread-safe, bounded LRU cache of rendered editor pages.
+
+    Keys are ``(model, config_hash)`` tuples so entries can be invalidated per model class. With a ``backend``,
+    misses fall through to it and renders are written to it, so processes sharing the backend share pages. Pass
+    ``shared=False`` to keep a page out of the backend, e.g. one embedding a user's own data.
+    """
+
+    def __init__(self, maxsize: int = 128, backend: Optional[CacheBackend] = None):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    @staticmethod
+    def shared_key(key: Hashable) -> Optional[str]:
+        """The backend key for a ``(model, config_hash)`` key, None if the model cannot be named across processes."""
+        identity = model_identity(key[0])
+        return None if identity is None else f"page:{identity}:{key[1]}"
+
+    def get(self, key: Hashable, shared: bool = True) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if value is not None:
+            record_count(RENDER_CACHE_HIT, model=key[0])
+            return value
+
+        shared_key = self.shared_key(key) if shared and self.backend is not None else None
+        if shared_key is not None:
+            value = self.backend.get(shared_key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._store(key, value)
+        if value is None:
+            record_count(RENDER_CACHE_MISS, model=key[0])
+            return None
+        record_count(RENDER_CACHE_HIT, model=key[0], backend=True)
+        return value
+
+    def _store(self, key: Hashable, value: str):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set(self, key: Hashable, value: str, shared: bool = True):
+        with self._lock:
+            self._store(key, value)
+        if shared and self.backend is not None:
+            shared_key = self.shared_key(key)
+            if shared_key is not None:
+                self.backend.set(shared_key, value)
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str], shared: bool = True) -> str:
+        value = self.get(key, shared)
+        if value is None:
+            value = render()
+            self.set(key, value, shared)
+        return value
+
+    def invalidate(self, model: Optional[Type[BaseModel]] = None) -> int:
+        """
+        Drop cached pages, from the backend too if there is one.
+
+        Parameters:
+            model (Optional[Type[BaseModel]]): Only drop pages rendered for this model. If None, drop everything.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        if self.backend is not None:
+            if model is None:
+                self.backend.delete_prefix("page:")
+            elif model_identity(model) is not None:
+                self.backend.delete_prefix(f"page:{model_identity(model)}:")
+        with self._lock:
+            if model is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale = [key for key in self._entries if key[0] is model]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def models(self) -> set:
+        """The models with cached pages."""
+        with self._lock:
+            return {key[0] for key in self._entries}
+
+    def resize(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+RENDER_CACHE = RenderCache()
@@ -0,0 +1,106 @@
+import secrets
+from typing import Any, Dict, Optional, Tuple
+
+from markupsafe import Markup
+
+from pydantic_web_editor.instrumentation import RENDER_BYTES, TEMPLATE_RENDER, record_text_size, timed
+from pydantic_web_editor.main import WebEditorConfig
+from pydantic_web_editor.schema_registry import dumps_html_safe
+from pydantic_web_editor.ssr import render_form
+from pydantic_web_editor.templating import EDITOR_TEMPLATE_NAME, get_template
+
+# The per-request parts of a page.
+TITLE_SLOT = "title"
+START_VAL_SLOT = "start_val"
+START_VERSION_SLOT = "start_version"
+SSR_FORM_SLOT = "ssr_form"
+
+
+class CompiledEditor:
+    """
+    An editor page rendered once, with only its title and start value filled in per request.
+
+    Build one at startup with ``config.compile()`` instead of constructing a WebEditorConfig in every handler, which
+    validates the model, buttons and editor options again each time. The asset block, schema, editor options and
+    buttons script are rendered once around placeholders. The result is immutable, so ``render`` can be called from
+    any number of threads or tasks at once and costs only the serialization of what it fills in.
+
+    Parameters:
+        config (WebEditorConfig): The editor. It is copied, later changes to it are not seen.
+    """
+
+    __slots__ = ("config", "_parts", "_defaults", "_page")
+
+    def __init__(self, config: WebEditorConfig):
+        config = config.model_copy(deep=True)
+        marker = f"pwe-slot-{secrets.token_hex(8)}-"
+
+        def slot(name: str) -> Markup:
+            return Markup(marker + name + marker)
+
+        json_editor_config = [
+            Markup('{"title":'),
+            slot(TITLE_SLOT),
+            Markup(',"schema":'),
+            config._schema_json(),
+            Markup(',"startval":'),
+            slot(START_VAL_SLOT),
+            Markup(',"config":%s}') % dumps_html_safe(config.json_editor_config),
+        ]
+        context = config._template_context(json_editor_config)
+        context["start_version"] = slot(START_VERSION_SLOT)
+        if context["ssr_form"] is not None:
+            context["ssr_form"] = slot(SSR_FORM_SLOT)
+        html = get_template(EDITOR_TEMPLATE_NAME).render(**context)
+        # Even items are static markup, odd items slot names.
+        parts = html.split(marker)
+        self.config = config
+        self._parts: Tuple[str, ...] = tuple(parts)
+        self._defaults: Dict[str, str] = self._fill(config.title, config.start_val, config.start_version)
+        self._page = self._join(self._defaults)
+
+    def _fill(self, title: Any, start_val: Any, start_version: Any) -> Dict[str, str]:
+        slots = set(self._parts[1::2])
+        filled = {TITLE_SLOT: dumps_html_safe(title), START_VERSION_SLOT: dumps_html_safe(start_version)}
+        if START_VAL_SLOT in slots:
+            filled[START_VAL_SLOT] = dumps_html_safe(start_val)
+        if SSR_FORM_SLOT in slots:
+            filled[SSR_FORM_SLOT] = render_form(self.config.model, start_val)
+        return filled
+
+    def _join(self, values: Dict[str, str]) -> str:
+        return "".join(part if i % 2 == 0 else values[part] for i, part in enumerate(self._parts))
+
+    def render(
+        self, start_val: Optional[Any] = None, title: Optional[str] = None, start_version: Optional[str] = None
+    ) -> str:
+        """
+        The page for one request. Arguments left as None keep the config's own.
+
+        Parameters:
+            start_val (Optional[Any]): The document to edit, a dict or model instance. It is not validated.
+            title (Optional[str]): The editor title.
+            start_version (Optional[str]): The document's version token for ``SaveMode.PATCH`` buttons.
+        """
+        if start_val is None and title is None and start_version is None:
+            return self._page
+        model = self.config.model
+        with timed(TEMPLATE_RENDER, model=model, template="compiled"):
+            values = dict(self._defaults)
+            if title is not None:
+                values[TITLE_SLOT] = dumps_html_safe(title)
+            if start_version is not None:
+                values[START_VERSION_SLOT] = dumps_html_safe(start_version)
+            if start_val is not None:
+                if START_VAL_SLOT in values:
+                    values[START_VAL_SLOT] = dumps_html_safe(start_val)
+                if SSR_FORM_SLOT in values:
+                    values[SSR_FORM_SLOT] = render_form(model, start_val)
+            html = self._join(values)
+        record_text_size(RENDER_BYTES, html, model=model, template="compiled")
+        return html
+
+    @property
+    def html(self) -> str:
+        """The page with the config's own title and start value, prerendered once."""
+        return self._page
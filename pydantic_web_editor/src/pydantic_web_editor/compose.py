@@ -0,0 +1,117 @@
+from typing import Dict, List, Sequence, Tuple
+
+from pydantic_web_editor.lazy import DEFS_KEY, DEFS_REF_PREFIX, rewrite_refs
+from pydantic_web_editor.main import LoadSchemaType, WebEditorConfig
+from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY, dumps_html_safe
+from pydantic_web_editor.templating import COMPOSED_TEMPLATE_NAME, get_template
+
+SHARED_DEFS_VAR = "PYDANTIC_WEB_EDITOR_DEFS"
+
+
+def _free_name(name: str, definition: dict, shared: Dict[str, dict], own: Dict[str, dict]) -> str:
+    """
+    ``name``, or the first ``name_<n>`` that is unused or already holds an identical definition, and is not another
+    of the schema's ``own`` definitions.
+    """
+    candidate, n = name, 1
+    while (candidate in shared and shared[candidate] != definition) or (candidate != name and candidate in own):
+        n += 1
+        candidate = f"{name}_{n}"
+    return candidate
+
+
+def _renames(defs: Dict[str, dict], shared: Dict[str, dict]) -> Tuple[Dict[str, str], Dict[str, dict]]:
+    """
+    The names ``defs`` get in ``shared`` and the definitions with their refs rewritten to those names.
+
+    Definitions are compared after their refs are rewritten, so one whose refs point at a renamed definition differs
+    too. Renaming one can change another in turn, so this repeats until no name changes.
+    """
+    renames: Dict[str, str] = {}
+    for _ in range(len(defs) + 1):
+        rewritten = {name: _rewrite_defs(definition, renames) for name, definition in defs.items()}
+        names = {name: _free_name(name, rewritten[name], shared, defs) for name in defs}
+        changed = {name: final for name, final in names.items() if final != name}
+        if changed == renames:
+            break
+        renames = changed
+    else:
+        rewritten = {name: _rewrite_defs(definition, renames) for name, definition in defs.items()}
+    return renames, rewritten
+
+
+def _rewrite_defs(value, renames: Dict[str, str]):
+    if not renames:
+        return value
+
+    def rewrite(ref: str) -> str:
+        if ref.startswith(DEFS_REF_PREFIX):
+            name = ref[len(DEFS_REF_PREFIX) :]
+            return DEFS_REF_PREFIX + renames.get(name, name)
+        return ref
+
+    return rewrite_refs(value, rewrite)
+
+
+def merge_defs(schemas: Sequence[dict]) -> Tuple[List[dict], Dict[str, dict]]:
+    """
+    Hoist the ``$defs`` of several schemas into one shared mapping, emitting identical definitions once.
+
+    Definitions that share a name but differ, including only in the definitions they reference, are renamed
+    (``Name_2``, ...) and the refs in their schema rewritten.
+
+    Returns:
+        Tuple[List[dict], Dict[str, dict]]: The schemas without ``$defs``, in order, and the shared definitions.
+    """
+    shared: Dict[str, dict] = {}
+    roots = []
+    for schema in schemas:
+        renames, defs = _renames(schema.get(DEFS_KEY, {}), shared)
+        for name, definition in defs.items():
+            shared.setdefault(renames.get(name, name), definition)
+        roots.append(_rewrite_defs({key: value for key, value in schema.items() if key != DEFS_KEY}, renames))
+    return roots, shared
+
+
+def unique_container_ids(configs: Sequence[WebEditorConfig]) -> List[WebEditorConfig]:
+    """Copies of ``configs`` whose container ids are unique on the page, suffixing duplicates with their position."""
+    seen = set()
+    unique = []
+    for position, config in enumerate(configs):
+        if config.container_id in seen:
+            config = config.model_copy(update={"container_id": f"{config.container_id}_{position}"})
+        seen.add(config.container_id)
+        unique.append(config)
+    return unique
+
+
+def compose_page(configs: Sequence[WebEditorConfig]) -> str:
+    """
+    Render several editors into one page with a single asset block, unique container ids and shared ``$defs``.
+
+    The asset block is taken from the first config. Editors with inline schemas reference one shared ``$defs``
+    object, so page weight grows with the number of distinct models rather than the number of forms.
+
+    Parameters:
+        configs (Sequence[WebEditorConfig]): The editors, in page order.
+
+    Returns:
+        str: The rendered html.
+    """
+    if not configs:
+        raise ValueError("compose_page needs at least one config")
+    configs = unique_container_ids(configs)
+    inline = [config for config in configs if config.load_schema == LoadSchemaType.INLINE]
+    roots, shared_defs = merge_defs([SCHEMA_REGISTRY.schema(config.model) for config in inline])
+    inline_roots = {id(config): root for config, root in zip(inline, roots)}
+
+    editors = []
+    for config in configs:
+        root = inline_roots.get(id(config))
+        if root is None:
+            editors.append(config.render_fragment())
+        else:
+            editors.append(config.render_fragment(dumps_html_safe(root), SHARED_DEFS_VAR))
+    context = configs[0]._template_context([], shared_defs_var=SHARED_DEFS_VAR)
+    template = get_template(COMPOSED_TEMPLATE_NAME)
+    return template.render(**context, shared_defs=dumps_html_safe(shared_defs), editors=editors)
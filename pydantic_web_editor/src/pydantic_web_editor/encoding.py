@@ -0,0 +1,64 @@
+import json
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JsonEncoder = Callable[[Any], str]
+
+# Characters escaped so JSON can be embedded in a <script> block or an HTML attribute, as jinja's tojson does, plus
+# the line separators some older JavaScript engines reject in string literals.
+HTML_UNSAFE = str.maketrans(
+    {"<": "\\u003c", ">": "\\u003e", "&": "\\u0026", "'": "\\u0027", "\u2028": "\\u2028", "\u2029": "\\u2029"}
+)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(value: Any) -> str:
+    """Minified JSON with the standard library encoder."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default)
+
+
+def orjson_dumps(value: Any) -> str:
+    """Minified JSON with orjson, several times faster than the standard library on large documents."""
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+_ENCODER: JsonEncoder = orjson_dumps if orjson is not None else stdlib_dumps
+
+
+def set_json_encoder(encoder: Optional[JsonEncoder]):
+    """
+    Set the function used to serialize schemas, start values and editor options into pages.
+
+    It must return minified JSON as a str; HTML escaping is applied afterwards. None restores the default, orjson
+    when it is installed and the standard library otherwise.
+    """
+    global _ENCODER
+    if encoder is None:
+        encoder = orjson_dumps if orjson is not None else stdlib_dumps
+    _ENCODER = encoder
+
+
+def get_json_encoder() -> JsonEncoder:
+    return _ENCODER
+
+
+def dumps_json(value: Any) -> str:
+    """
+    Serialize ``value`` to minified JSON with the configured encoder.
+
+    Model instances are serialized by pydantic-core with ``model_dump_json``, skipping the intermediate dict.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    return _ENCODER(value)
@@ -0,0 +1,176 @@
+"""
+Structural fingerprints of models, so anything cached from a model's schema is keyed by what the model is rather
+than by where it was loaded from.
+
+A fingerprint hashes the field names, types, defaults and constraints of a model and of every model it references,
+plus the pydantic version. It is the same in every process running the same model definitions, and changes when any
+of them does, so it is safe to share cached pages and schemas across workers and rolling deploys.
+"""
+import dataclasses
+import enum
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, get_args, get_origin, get_type_hints, is_typeddict
+
+import pydantic
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+
+# Class attributes that change a model's schema without changing its fields.
+SCHEMA_HOOKS = ("model_json_schema", "__get_pydantic_json_schema__", "__get_pydantic_core_schema__")
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _function(method: Any) -> Any:
+    return getattr(method, "__func__", method)
+
+
+def _code_digest(function: Any) -> str:
+    function = _function(function)
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return _ADDRESS.sub("", repr(function))
+    material = repr((code.co_code, code.co_consts, code.co_names))
+    return hashlib.sha256(_ADDRESS.sub("", material).encode("utf-8")).hexdigest()[:16]
+
+
+def _describe_value(value: Any) -> Any:
+    """A process independent description of a default or metadata value."""
+    if isinstance(value, BaseModel):
+        return [_name(type(value)), value.model_dump(mode="json")]
+    if isinstance(value, enum.Enum):
+        return [_name(type(value)), value.name]
+    if callable(value) and not isinstance(value, type):
+        return ["callable", getattr(value, "__qualname__", ""), _code_digest(value)]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_describe_value(item) for item in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return {str(key): _describe_value(item) for key, item in value.items()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # Reprs of metadata like annotated_types.Gt or validator wrappers, without memory addresses.
+    return _ADDRESS.sub("", repr(value))
+
+
+def _field_types(annotation: type) -> Any:
+    """The fields of a dataclass, TypedDict or NamedTuple, which pydantic describes in the schema, or None."""
+    if dataclasses.is_dataclass(annotation):
+        hints = get_type_hints(annotation)
+        fields = dataclasses.fields(annotation)
+        return [[field.name, hints.get(field.name, field.type), field.default] for field in fields]
+    if is_typeddict(annotation):
+        required = getattr(annotation, "__required_keys__", ())
+        return [[name, hint, name in required] for name, hint in get_type_hints(annotation).items()]
+    if issubclass(annotation, tuple) and hasattr(annotation, "_fields"):
+        defaults = getattr(annotation, "_field_defaults", {})
+        return [[name, hint, defaults.get(name)] for name, hint in get_type_hints(annotation).items()]
+    return None
+
+
+def _describe_type(annotation: Any, refs: List[type], expanding: Tuple[type, ...] = ()) -> Any:
+    """Describe a type annotation, collecting the models it references in ``refs``."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        refs.append(annotation)
+        return _name(annotation)
+    fields = _field_types(annotation) if isinstance(annotation, type) and annotation not in expanding else None
+    if fields is not None:
+        # Described in place rather than as refs; ``expanding`` stops recursive ones.
+        nested = expanding + (annotation,)
+        return [
+            _name(annotation),
+            annotation.__doc__,
+            [[name, _describe_type(hint, refs, nested), _describe_value(extra)] for name, hint, extra in fields],
+        ]
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return [_name(annotation), [[member.name, _describe_value(member.value)] for member in annotation]]
+    origin = get_origin(annotation)
+    if origin is not None:
+        args = get_args(annotation)
+        origin = _name(origin) if isinstance(origin, type) else _ADDRESS.sub("", repr(origin))
+        return [origin, [_describe_type(arg, refs, expanding) for arg in args]]
+    if isinstance(annotation, type):
+        return _name(annotation)
+    if isinstance(annotation, (list, tuple)):
+        return [_describe_type(arg, refs, expanding) for arg in annotation]
+    return _describe_value(annotation)
+
+
+@lru_cache(maxsize=None)
+def _shallow(model: type) -> Tuple[str, Tuple[type, ...]]:
+    """A model's own description, naming the models it references rather than describing them, and those models."""
+    refs: List[type] = []
+    fields = []
+    for name, field in model.model_fields.items():
+        default = field.default if field.default is not PydanticUndefined else None
+        fields.append(
+            [
+                name,
+                field.alias,
+                _describe_type(field.annotation, refs),
+                _describe_value(default),
+                _describe_value(field.default_factory),
+                _describe_value(field.metadata),
+                _describe_value(field.title),
+                _describe_value(field.description),
+                _describe_value(field.json_schema_extra),
+                _describe_value(field.examples),
+                _describe_value(field.deprecated),
+                _describe_value(field.discriminator),
+            ]
+        )
+    hooks = [
+        [hook, _code_digest(getattr(model, hook))]
+        for hook in SCHEMA_HOOKS
+        if _function(getattr(model, hook, None)) is not _function(getattr(BaseModel, hook, None))
+    ]
+    config = _describe_value({key: value for key, value in model.model_config.items() if key != "defer_build"})
+    description = [_name(model), model.__doc__, config, fields, hooks]
+    return json.dumps(description, sort_keys=True, default=str), tuple(refs)
+
+
+def _closure(roots: List[type]) -> Dict[type, str]:
+    described: Dict[type, str] = {}
+    stack = list(roots)
+    while stack:
+        model = stack.pop()
+        if model in described:
+            continue
+        described[model], refs = _shallow(model)
+        stack.extend(refs)
+    return described
+
+
+@lru_cache(maxsize=None)
+def model_fingerprint(model: Any) -> str:
+    """
+    A stable structural hash of a BaseModel subclass or TypeAdapter, computed once per class or adapter.
+
+    Covers every field's name, alias, type, default, constraints and examples, the model config and docstring,
+    overridden schema hooks, every model, dataclass, TypedDict and NamedTuple reachable from its fields (recursive
+    ones included) and the pydantic version, since all of these can change the generated schema. It keys shared
+    cache entries; schema ETags and ``?v=`` versions hash the schema JSON itself, so they can never go stale.
+
+    Parameters:
+        model (Any): A BaseModel subclass or a TypeAdapter instance.
+
+    Returns:
+        str: 16 hex characters.
+    """
+    refs: List[type] = []
+    if isinstance(model, TypeAdapter):
+        root = ["TypeAdapter", _describe_type(getattr(model, "_type", None), refs), _describe_value(model._config)]
+    elif isinstance(model, type) and issubclass(model, BaseModel):
+        root = ["BaseModel", _describe_type(model, refs)]
+    else:
+        raise ValueError("can only fingerprint a BaseModel or TypeAdapter")
+    # Models are described once each, sorted, so cycles terminate and the order they are reached in does not matter.
+    described = sorted(_closure(refs).values())
+    material = json.dumps([pydantic.VERSION, root, described], default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
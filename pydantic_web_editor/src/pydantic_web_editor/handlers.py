@@ -0,0 +1,116 @@
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+from urllib.parse import unquote
+
+from pydantic_web_editor.lazy import DEFS_SEGMENT, lazy_def_entry
+from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY, SchemaEntry, schema_name
+
+
+SCHEMA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class SchemaResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against an ETag, as RFC 9110 requires for GET."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def schema_response(model: Any, if_none_match: Optional[str] = None) -> SchemaResponse:
+    """
+    Build a framework independent response serving a model's JSON schema.
+
+    Parameters:
+        model (Any): A BaseModel subclass or TypeAdapter.
+        if_none_match (Optional[str]): The request's If-None-Match header, if any.
+
+    Returns:
+        SchemaResponse: A 200 with the schema body, or an empty 304 if the client copy is current.
+    """
+    return entry_response(SCHEMA_REGISTRY.get(model), if_none_match)
+
+
+def entry_response(entry: SchemaEntry, if_none_match: Optional[str] = None) -> SchemaResponse:
+    headers = {"ETag": entry.etag, "Cache-Control": SCHEMA_CACHE_CONTROL}
+    if etag_matches(if_none_match, entry.etag):
+        return SchemaResponse(304, headers, b"")
+    headers["Content-Type"] = "application/json"
+    return SchemaResponse(200, headers, entry.json.encode("utf-8"))
+
+
+def _not_found(name: str) -> SchemaResponse:
+    return SchemaResponse(404, {"Content-Type": "text/plain"}, f"No schema named {name}".encode("utf-8"))
+
+
+class SchemaHandler:
+    """
+    Serves schemas for a fixed set of models by name, and their ``$defs`` entries for lazy loading.
+
+    Paths look like ``<name>.json`` for a whole schema or ``<name>/defs/<definition>.json`` for one definition.
+
+    Parameters:
+        models (Mapping[str, Any] | list): Models keyed by the name they are served under. A list is keyed by schema_name.
+        schema_mount (str): The mount the handler is served under, used to build the URLs inside lazy definitions.
+    """
+
+    def __init__(self, models, schema_mount: str = "schemas"):
+        if not isinstance(models, Mapping):
+            models = {schema_name(model): model for model in models}
+        self.models = dict(models)
+        self.schema_mount = schema_mount
+
+    def __call__(self, name: str, if_none_match: Optional[str] = None) -> SchemaResponse:
+        name = name.removesuffix(".json")
+        name, _, def_name = name.partition(f"/{DEFS_SEGMENT}/")
+        model = self.models.get(name)
+        if model is None:
+            return _not_found(name)
+        if not def_name:
+            return schema_response(model, if_none_match)
+        try:
+            entry = lazy_def_entry(model, unquote(def_name), self.schema_mount)
+        except KeyError:
+            return _not_found(f"{name}/{DEFS_SEGMENT}/{def_name}")
+        return entry_response(entry, if_none_match)
+
+
+def flask_schema_view(models, schema_mount: str = "schemas"):
+    """
+    Create a Flask view serving schemas, e.g.
+    ``app.add_url_rule("/schemas/<path:name>", view_func=flask_schema_view([MyModel]))``.
+    """
+    from flask import Response, request
+
+    handler = SchemaHandler(models, schema_mount)
+
+    def schema_view(name: str):
+        status, headers, body = handler(name, request.headers.get("If-None-Match"))
+        return Response(body, status=status, headers=headers)
+
+    return schema_view
+
+
+def fastapi_schema_router(models, schema_mount: str = "schemas"):
+    """
+    Create a FastAPI router serving schemas under ``/{schema_mount}/{name}.json`` (and their lazy definitions), e.g.
+    ``app.include_router(fastapi_schema_router([MyModel]))``.
+    """
+    from fastapi import APIRouter, Request, Response
+
+    handler = SchemaHandler(models, schema_mount)
+    router = APIRouter()
+
+    @router.get(f"/{schema_mount}/{{name:path}}")
+    def schema_view(name: str, request: Request):
+        status, headers, body = handler(name, request.headers.get("if-none-match"))
+        return Response(content=body, status_code=status, headers=headers)
+
+    return router
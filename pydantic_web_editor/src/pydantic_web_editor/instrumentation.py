@@ -0,0 +1,168 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+SCHEMA_BUILD = "schema.build"
+SCHEMA_BYTES = "schema.bytes"
+UI_SCHEMA_BUILD = "ui_schema.build"
+DERIVED_SCHEMA_BUILD = "derived_schema.build"
+TEMPLATE_RENDER = "template.render"
+RENDER_BYTES = "render.bytes"
+RENDER_CACHE_HIT = "render_cache.hit"
+RENDER_CACHE_MISS = "render_cache.miss"
+SUBMISSION_VALIDATE = "submission.validate"
+
+
+def label(value: Any) -> str:
+    """A short, readable tag value, e.g. a model's class name."""
+    if isinstance(value, (str, int, float, bool)):
+        return str(value)
+    return getattr(value, "__name__", type(value).__name__)
+
+
+class MetricEvent(NamedTuple):
+    kind: str  # "timing", "size" or "count"
+    name: str
+    value: float
+    tags: Dict[str, Any]
+
+
+class Observer:
+    """
+    Receives timing, size and count metrics. Subclass it and override the methods you care about.
+
+    ``span`` wraps a timed block; by default it just reports the block's duration to ``timing``.
+    """
+
+    enabled = True
+
+    def timing(self, name: str, seconds: float, tags: Dict[str, Any]):
+        pass
+
+    def size(self, name: str, nbytes: int, tags: Dict[str, Any]):
+        pass
+
+    def count(self, name: str, value: int, tags: Dict[str, Any]):
+        pass
+
+    @contextmanager
+    def span(self, name: str, tags: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timing(name, time.perf_counter() - start, tags)
+
+
+class NoopObserver(Observer):
+    enabled = False
+
+
+class CallbackObserver(Observer):
+    """Passes every metric to ``callback`` as a MetricEvent, e.g. to forward it to statsd or collect it in a list."""
+
+    def __init__(self, callback: Callable[[MetricEvent], Any]):
+        self.callback = callback
+
+    def timing(self, name, seconds, tags):
+        self.callback(MetricEvent("timing", name, seconds, tags))
+
+    def size(self, name, nbytes, tags):
+        self.callback(MetricEvent("size", name, nbytes, tags))
+
+    def count(self, name, value, tags):
+        self.callback(MetricEvent("count", name, value, tags))
+
+
+class OpenTelemetryObserver(Observer):
+    """
+    Reports timed blocks as OpenTelemetry spans, and sizes and counts as metrics if a meter is given.
+
+    Without a meter, sizes and counts are set as attributes on the current span. Requires ``opentelemetry-api``.
+    """
+
+    def __init__(self, tracer=None, meter=None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("pydantic_web_editor")
+        self.meter = meter
+        self._instruments = {}
+
+    @staticmethod
+    def _attributes(tags: Dict[str, Any]) -> Dict[str, str]:
+        return {f"pydantic_web_editor.{key}": label(value) for key, value in tags.items()}
+
+    @contextmanager
+    def span(self, name, tags):
+        with self.tracer.start_as_current_span(f"pydantic_web_editor.{name}", attributes=self._attributes(tags)):
+            yield
+
+    def _record(self, create: str, name: str, value, tags):
+        if self.meter is None:
+            self._trace.get_current_span().set_attribute(f"pydantic_web_editor.{name}", value)
+            return
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            instrument = self._instruments[name] = getattr(self.meter, create)(f"pydantic_web_editor.{name}")
+        if create == "create_counter":
+            instrument.add(value, self._attributes(tags))
+        else:
+            instrument.record(value, self._attributes(tags))
+
+    def size(self, name, nbytes, tags):
+        self._record("create_histogram", name, nbytes, tags)
+
+    def count(self, name, value, tags):
+        self._record("create_counter", name, value, tags)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_OBSERVER: Observer = NoopObserver()
+
+
+def set_observer(observer: Optional[Observer]):
+    """Install the process-wide observer. None restores the no-op default."""
+    global _OBSERVER
+    _OBSERVER = observer if observer is not None else NoopObserver()
+
+
+def get_observer() -> Observer:
+    return _OBSERVER
+
+
+def timed(name: str, **tags):
+    """Time a block: ``with timed(SCHEMA_BUILD, model=Model): ...``. Returns a shared no-op when disabled."""
+    observer = _OBSERVER
+    if not observer.enabled:
+        return _NOOP_SPAN
+    return observer.span(name, tags)
+
+
+def record_size(name: str, nbytes: int, **tags):
+    observer = _OBSERVER
+    if observer.enabled:
+        observer.size(name, nbytes, tags)
+
+
+def record_text_size(name: str, text: str, **tags):
+    """Record the utf-8 size of ``text``, only paying for the encoding when an observer is installed."""
+    observer = _OBSERVER
+    if observer.enabled:
+        observer.size(name, len(text.encode("utf-8")), tags)
+
+
+def record_count(name: str, value: int = 1, **tags):
+    observer = _OBSERVER
+    if observer.enabled:
+        observer.count(name, value, tags)
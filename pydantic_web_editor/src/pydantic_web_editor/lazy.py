@@ -0,0 +1,62 @@
+from typing import Any, Callable
+from urllib.parse import quote
+
+from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY, SchemaEntry, schema_name
+
+DEFS_KEY = "$defs"
+DEFS_REF_PREFIX = f"#/{DEFS_KEY}/"
+DEFS_SEGMENT = "defs"
+
+
+def def_url(schema_mount: str, model: Any, def_name: str) -> str:
+    """The versioned URL a ``$defs`` entry of ``model`` is served from in lazy mode."""
+    version = SCHEMA_REGISTRY.get(model).version
+    return f"/{schema_mount}/{schema_name(model)}/{DEFS_SEGMENT}/{quote(def_name, safe='')}.json?v={version}"
+
+
+def rewrite_refs(node: Any, rewrite: Callable[[str], str]) -> Any:
+    """Copy ``node`` with every ``$ref`` string passed through ``rewrite``. The input is left untouched."""
+    if isinstance(node, dict):
+        return {
+            key: rewrite(value) if key == "$ref" and isinstance(value, str) else rewrite_refs(value, rewrite)
+            for key, value in node.items()
+        }
+    if isinstance(node, list):
+        return [rewrite_refs(value, rewrite) for value in node]
+    return node
+
+
+def _ref_rewriter(model: Any, schema_mount: str) -> Callable[[str], str]:
+    def rewrite(ref: str) -> str:
+        if ref.startswith(DEFS_REF_PREFIX):
+            return def_url(schema_mount, model, ref[len(DEFS_REF_PREFIX) :])
+        return ref
+
+    return rewrite
+
+
+def lazy_root_entry(model: Any, schema_mount: str) -> SchemaEntry:
+    """
+    The model's schema without ``$defs``, with references to them pointing at their own URLs.
+
+    json-editor's ajax ``$ref`` loader resolves every external reference before it builds the form, so all the
+    definitions the schema reaches are still fetched when the page loads. The page gets smaller and each definition
+    is a separate, versioned document browsers can cache across visits, but no fetch is deferred.
+    """
+
+    def build(schema: dict) -> dict:
+        root = {key: value for key, value in schema.items() if key != DEFS_KEY}
+        return rewrite_refs(root, _ref_rewriter(model, schema_mount))
+
+    return SCHEMA_REGISTRY.derived(model, ("lazy", schema_mount), build)
+
+
+def lazy_def_entry(model: Any, def_name: str, schema_mount: str) -> SchemaEntry:
+    """A single ``$defs`` entry as a standalone document, its own references rewritten to URLs. KeyError if unknown."""
+    if def_name not in SCHEMA_REGISTRY.schema(model).get(DEFS_KEY, {}):
+        raise KeyError(def_name)
+
+    def build(schema: dict) -> dict:
+        return rewrite_refs(schema[DEFS_KEY][def_name], _ref_rewriter(model, schema_mount))
+
+    return SCHEMA_REGISTRY.derived(model, ("lazy", schema_mount, def_name), build)
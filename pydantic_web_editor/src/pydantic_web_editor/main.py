@@ -1,42 +1,115 @@
 import os
 import json
-import shutil
 from enum import Enum
-from typing import List, Optional, Type, get_type_hints, Any, Union
-
-from jinja2 import Environment, PackageLoader
-from pydantic import BaseModel, create_model, TypeAdapter
-
-# from sqlmodel import SQLModel
-
-
-ENV = Environment(loader=PackageLoader("pydantic_web_editor"))
-EDITOR_TEMPLATE = ENV.get_template("pydantic_web_editor.html")
+from types import MappingProxyType
+from typing import Iterable, Iterator, List, Optional, Type, get_type_hints, Any, Union
+
+from markupsafe import Markup
+from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, create_model, TypeAdapter, model_validator
+
+from pydantic_web_editor.aio import render_async, set_render_executor
+from pydantic_web_editor.assets import StaticAssets, asset_path, build_static_assets, package_static_path, sync_static_folder
+from pydantic_web_editor.backends import CacheBackend, MemoryBackend, SQLiteBackend, set_cache_backend
+from pydantic_web_editor.bulk import (
+    BULK_PAGE_SIZE,
+    BulkHandler,
+    BulkStore,
+    ListBulkStore,
+    bulk_columns,
+    fastapi_bulk_router,
+    flask_bulk_view,
+)
+from pydantic_web_editor.cache import RENDER_CACHE, RenderCache, stable_hash
+from pydantic_web_editor.handlers import SchemaHandler, fastapi_schema_router, flask_schema_view, schema_response
+from pydantic_web_editor.encoding import dumps_json, orjson_dumps, set_json_encoder, stdlib_dumps
+from pydantic_web_editor.fingerprint import model_fingerprint
+from pydantic_web_editor.instrumentation import (
+    RENDER_BYTES,
+    TEMPLATE_RENDER,
+    CallbackObserver,
+    MetricEvent,
+    NoopObserver,
+    Observer,
+    OpenTelemetryObserver,
+    record_text_size,
+    set_observer,
+    timed,
+)
+from pydantic_web_editor.lazy import lazy_def_entry, lazy_root_entry
+from pydantic_web_editor.optimize import (
+    SchemaSizeReport,
+    optimize_json_schema,
+    optimized_schema_entry,
+    schema_size_report,
+)
+from pydantic_web_editor.orm import OrmBulkStore, load_options, load_row, load_rows, orm_model, upsert_rows
+from pydantic_web_editor.patches import DocumentStore, JsonPatchError, PatchHandler, apply_patch
+from pydantic_web_editor.reload import ReloadWatcher, stale_models
+from pydantic_web_editor.schema_registry import (
+    JSON_CHUNK_SIZE,
+    SCHEMA_REGISTRY,
+    SchemaRegistry,
+    dumps_html_safe,
+    schema_name,
+    iter_chunks,
+    iter_json_html_safe,
+    warm_schemas,
+)
+from pydantic_web_editor.ssr import compile_form, compiled_form, render_form
+from pydantic_web_editor.submissions import (
+    SubmissionHandler,
+    fastapi_submission_router,
+    flask_submission_view,
+    get_type_adapter,
+)
+from pydantic_web_editor.templating import (
+    BULK_FRAGMENT_TEMPLATE_NAME,
+    COMPOSED_TEMPLATE_NAME,
+    EDITOR_FRAGMENT_TEMPLATE_NAME,
+    EDITOR_TEMPLATE_NAME,
+    INDEX_TEMPLATE_NAME,
+    compile_templates,
+    configure_templates,
+    get_environment,
+    get_template,
+)
+from pydantic_web_editor.ui_schema import parse_json_schema
+
+
+# ENV and the templates below are created on first access, see templating.
+_LAZY_TEMPLATES = {
+    "EDITOR_TEMPLATE": EDITOR_TEMPLATE_NAME,
+    "INDEX_TEMPLATE": INDEX_TEMPLATE_NAME,
+    "EDITOR_FRAGMENT_TEMPLATE": EDITOR_FRAGMENT_TEMPLATE_NAME,
+    "COMPOSED_TEMPLATE": COMPOSED_TEMPLATE_NAME,
+}
 
 
-# def sqlmodel_to_pydantic(sql_model: Type[SQLModel]) -> Type[BaseModel]:
-#     type_hints = get_type_hints(sql_model)
-#     Model = create_model("Model", **type_hints)
-#     instance = Model(**sql_model.dict())
-#     return instance
+def __getattr__(name: str):
+    if name == "ENV":
+        return get_environment()
+    if name in _LAZY_TEMPLATES:
+        return get_template(_LAZY_TEMPLATES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def copy_static_folder(copy_path: str, create: bool = False):
+def copy_static_folder(copy_path: str, create: bool = False, compare: str = "stat") -> int:
     """
-    Recursively copy a static folder from a pip package to a static folder on a relative path.
+    Incrementally copy the static folder from the pip package to a static folder on a relative path.
+
+    Unchanged files are skipped, changed files are replaced atomically and only one process per host does the
+    copying, so it is cheap to call on every worker boot. To skip copying entirely, serve
+    ``package_static_path()`` directly, e.g. with ``StaticAssets(package_static_path())``.
 
     Parameters:
         copy_path: str (str): The relative path where the static folder will be copied.
         create: bool: If True, the directory structure is created if it does not exist.
                       If False and the directory does not exist, a ValueError is raised.
+        compare: str: "stat" compares size and mtime against the last sync, "hash" compares file contents.
 
     Returns:
-        None
+        int: The number of files copied.
     """
-    # Get the absolute path to the static folder in the pip package
-    package_path = os.path.dirname(__import__("pydantic_web_editor").__file__)
-    static_path = os.path.join(package_path, "static")
-
     # Check if the destination directory exists, create if necessary and allowed
     if not os.path.exists(copy_path):
         if create:
@@ -44,17 +117,34 @@ def copy_static_folder(copy_path: str, create: bool = False):
         else:
             raise ValueError(f"Copy destination: {copy_path} does not exist!")
 
-    shutil.copytree(static_path, copy_path, dirs_exist_ok=True)
+    return sync_static_folder(package_static_path(), copy_path, compare=compare)
+
+
+class SaveMode(Enum):
+    FULL = "full"
+    PATCH = "patch"
 
 
 class Button(BaseModel):
+    """
+    A button under the editor that sends its value to ``path``.
+
+    With ``save_mode=SaveMode.PATCH`` the button posts only a JSON Patch of what changed since the last save, against
+    the editor's ``start_version``, to a PatchHandler. The outcome is dispatched on the editor container as a
+    ``pydantic-web-editor:saved`` or ``pydantic-web-editor:save-failed`` event with the response in ``detail``.
+    """
+
     id: str
     path: str
     text: Optional[str] = "Submit"
     div_classes: Optional[str] = "row mt-2 p-3"
     classes: Optional[str] = "btn"
     verb: Optional[str] = "POST"
-    request_kwargs: Optional[str] = "'values': {'payload': payload}"
+    request_kwargs: Optional[str] = "'values': {'payload': JSON.stringify(payload), '_pydantic_web_editor': 1}"
+    save_mode: Optional[SaveMode] = SaveMode.FULL
+
+    # Validators are built on first use rather than at import, see templating for the other cold start savings.
+    model_config = ConfigDict(defer_build=True)
 
 
 class LoadStaticType(Enum):
@@ -63,7 +153,48 @@ class LoadStaticType(Enum):
     BUNDLED = "bundled"
 
 
-JSON_EDITOR_CONFIG_DEFAULT = {
+class LoadSchemaType(Enum):
+    INLINE = "inline"
+    URL = "url"
+    LAZY = "lazy"
+
+
+def editor_config_json(title: str, schema_json: Markup, start_val: Any, config: dict) -> Markup:
+    """Assemble the JSONEditor options object around an already serialized schema."""
+    return Markup('{"title":%s,"schema":%s,"startval":%s,"config":%s}') % (
+        dumps_html_safe(title),
+        schema_json,
+        dumps_html_safe(start_val),
+        dumps_html_safe(config),
+    )
+
+
+def iter_editor_config_json(
+    title: str, schema_json: Markup, start_val: Any, config: dict, chunk_size: int = JSON_CHUNK_SIZE
+) -> Iterator[Markup]:
+    """The same object as editor_config_json, produced in chunks so huge schemas and start values can be streamed."""
+    yield Markup('{"title":%s,"schema":') % dumps_html_safe(title)
+    yield from iter_chunks(schema_json, chunk_size)
+    yield Markup(',"startval":')
+    yield from iter_json_html_safe(start_val, chunk_size)
+    yield Markup(',"config":%s}') % dumps_html_safe(config)
+
+
+def buffer_stream(pieces: Iterable[str], chunk_size: int = 16 * 1024) -> Iterator[str]:
+    """Join the many small strings Template.generate() yields into chunks worth a network write."""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+# Read only, so it cannot be changed for every editor at once by accident; each config gets its own copy.
+JSON_EDITOR_CONFIG_DEFAULT = MappingProxyType({
     "object_layout": "normal",
     "template": "default",
     "show_errors": "interaction",
@@ -72,102 +203,240 @@ JSON_EDITOR_CONFIG_DEFAULT = {
     "prompt_before_delete": 1,
     "lib_simplemde": 1,
     "lib_dompurify": 1,
-}
+})
 
 
 class WebEditorConfig(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     title: str
     model: Type[BaseModel]
-    start_val: Optional[dict] = {}
+    start_val: Optional[Union[dict, SerializeAsAny[BaseModel]]] = {}
     buttons: Optional[List[Button]] = []
     theme: Optional[str] = "bootstrap5"
     iconlib: Optional[str] = "jqueryui"
     load_static: Optional[LoadStaticType] = LoadStaticType.REMOTE
     static_mount: Optional[str] = "static"
-    json_editor_config: Optional[dict] = JSON_EDITOR_CONFIG_DEFAULT
+    json_editor_config: Optional[dict] = Field(default_factory=lambda: dict(JSON_EDITOR_CONFIG_DEFAULT))
+    cache_render: Optional[bool] = True
+    # Let pages rendered with a start_val go to the shared cache backend too, see set_cache_backend.
+    share_start_val: Optional[bool] = False
+    load_schema: Optional[LoadSchemaType] = LoadSchemaType.INLINE
+    schema_mount: Optional[str] = "schemas"
+    start_val_url: Optional[str] = None
+    static_path: Optional[str] = None
+    container_id: Optional[str] = "pydantic_web_editor"
+    start_version: Optional[str] = None
+    # Embed the schema shrunk by optimize_json_schema, see schema_size_report. Applies to inline schemas.
+    optimize_schema: Optional[bool] = False
+    # Edit a long list of ``model`` documents served by a BulkHandler at this URL, see bulk_handler.
+    bulk_url: Optional[str] = None
+    bulk_page_size: Optional[int] = BULK_PAGE_SIZE
+    # Paint a plain HTML form of start_val, see ssr.render_form, until json-editor replaces it.
+    server_render: Optional[bool] = False
+
+    @model_validator(mode="after")
+    def _check_bulk(self):
+        if self.bulk_url is not None and self.load_static == LoadStaticType.REMOTE:
+            raise ValueError(
+                "bulk_url needs the bundled bulk_editor.js, set load_static to bundled (or skip and load it yourself)"
+            )
+        return self
+
+    @property
+    def cache_key(self):
+        """The render cache key: the model class itself plus a stable hash of every other rendered field."""
+        return (
+            self.model,
+            stable_hash(self.model_dump(mode="json", exclude={"model", "cache_render", "share_start_val"})),
+        )
+
+    @property
+    def cache_shared(self) -> bool:
+        """Whether the page may go to the shared cache backend: pages with a start_val only with share_start_val."""
+        return self.share_start_val or not self.start_val
 
     @property
     def html(self):
-        return EDITOR_TEMPLATE.render(
+        if not self.cache_render:
+            return self.render()
+        return RENDER_CACHE.get_or_render(self.cache_key, self.render, self.cache_shared)
+
+    def submission_handler(self, on_valid=None, allow_batch: bool = True) -> SubmissionHandler:
+        """A handler validating this editor's submissions, to mount at a Button's path."""
+        return SubmissionHandler(self.model, on_valid=on_valid, allow_batch=allow_batch)
+
+    def patch_handler(self, store: DocumentStore, on_valid=None) -> PatchHandler:
+        """A handler applying and validating JSON Patch saves, to mount at a ``SaveMode.PATCH`` Button's path."""
+        return PatchHandler(self.model, store, on_valid=on_valid)
+
+    def bulk_handler(self, store: BulkStore, on_valid=None) -> BulkHandler:
+        """
+        A handler to mount at ``bulk_url``, paging through ``store`` on GET and saving edited rows on POST.
+
+        In bulk mode the page lists the store's documents in a virtualized table, fetching only the windows scrolled
+        into view, and opens one editor at a time for the selected row. ``start_val`` and ``buttons`` are not used;
+        the list's own Save button posts the edited rows and dispatches the same saved and save-failed events.
+        """
+        return BulkHandler(self.model, store, on_valid=on_valid)
+
+    def compile(self) -> "CompiledEditor":
+        """
+        Prerender this editor once, for a CompiledEditor whose ``render(start_val=..., title=...)`` is cheap and thread
+        safe. Build it at startup rather than constructing a config per request.
+        """
+        from pydantic_web_editor.compiled import CompiledEditor
+
+        return CompiledEditor(self)
+
+    async def html_async(self, executor=None):
+        """Like html, but renders off the event loop and coalesces concurrent renders of the same config."""
+        return await render_async(self, executor=executor)
+
+    @property
+    def schema_url(self) -> Optional[str]:
+        """Where the page fetches its schema from when load_schema is URL, versioned so it can be cached forever."""
+        if self.load_schema != LoadSchemaType.URL:
+            return None
+        version = SCHEMA_REGISTRY.get(self.model).version
+        return f"/{self.schema_mount}/{schema_name(self.model)}.json?v={version}"
+
+    def _template_context(self, json_editor_config: Iterable[Markup], shared_defs_var: Optional[str] = None) -> dict:
+        return dict(
+            container_id=self.container_id,
+            shared_defs_var=shared_defs_var,
             load_static=self.load_static.value,
             static_mount=self.static_mount,
             theme=self.theme,
             iconlib=self.iconlib,
+            bundle_js=asset_path("bundle.js", self.static_path),
+            bundle_css=asset_path("bundle.css", self.static_path),
+            bulk_js=asset_path("bulk_editor.js", self.static_path),
             buttons=self.buttons,
-            json_editor_config={
-                "title": self.title,
-                "schema": self.model.model_json_schema(),
-                "startval": self.start_val,
-                "config": self.json_editor_config,
-            },
+            patch_save=any(button.save_mode == SaveMode.PATCH for button in self.buttons),
+            start_version=dumps_html_safe(self.start_version),
+            schema_url=self.schema_url,
+            start_val_url=self.start_val_url,
+            lazy_schema=self.load_schema == LoadSchemaType.LAZY,
+            json_editor_config=json_editor_config,
+            ssr_form=render_form(self.model, self.start_val) if self.server_render and not self.bulk_url else None,
+            bulk_url=dumps_html_safe(self.bulk_url) if self.bulk_url is not None else None,
+            bulk_page_size=self.bulk_page_size,
+            bulk_columns=dumps_html_safe(bulk_columns(SCHEMA_REGISTRY.schema(self.model))) if self.bulk_url else None,
         )
 
-import json
-
-def parse_json_schema(schema, base_path="#"):
-    elements = []
-
-    def parse_object(obj, path):
-        if 'properties' in obj:
-            for prop, value in obj['properties'].items():
-                new_path = f"{path}/properties/{prop}"
-                elements.append({
-                    "type": "Control",
-                    "scope": new_path,
-                    "label": prop
-                })
-                parse_object(value, new_path)
-        elif 'items' in obj and isinstance(obj['items'], dict):  # For arrays
-            # Handle $ref in items
-            if '$ref' in obj['items']:
-                ref_path = obj['items']['$ref']
-                ref_obj = resolve_ref(schema, ref_path)
-                parse_object(ref_obj, path)
-            else:
-                parse_object(obj['items'], path)
-
-    def resolve_ref(schema, ref_path):
-        # Resolve a $ref to the actual object it refers to
-        parts = ref_path.split('/')[1:]  # Skip the leading '#'
-        ref_obj = schema
-        for part in parts:
-            ref_obj = ref_obj[part]
-        return ref_obj
-
-    # Start parsing from the root
-    parse_object(schema, base_path)
-
-    return {
-        "type": "VerticalLayout",
-        "elements": elements
-    }
+    def _schema_json(self) -> Markup:
+        if self.load_schema == LoadSchemaType.INLINE:
+            if self.optimize_schema:
+                return optimized_schema_entry(self.model).json
+            return SCHEMA_REGISTRY.schema_json(self.model)
+        if self.load_schema == LoadSchemaType.LAZY:
+            return lazy_root_entry(self.model, self.schema_mount).json
+        return Markup("null")
+
+    def _editor_config_json(self, schema_json: Optional[Markup] = None) -> Markup:
+        return editor_config_json(
+            title=self.title,
+            schema_json=self._schema_json() if schema_json is None else schema_json,
+            start_val=self.start_val,
+            config=self.json_editor_config,
+        )
 
+    def render(self):
+        with timed(TEMPLATE_RENDER, model=self.model, template="page"):
+            template = get_template(EDITOR_TEMPLATE_NAME)
+            html = template.render(**self._template_context([self._editor_config_json()]))
+        record_text_size(RENDER_BYTES, html, model=self.model, template="page")
+        return html
+
+    def render_fragment(self, schema_json: Optional[Markup] = None, shared_defs_var: Optional[str] = None) -> str:
+        """
+        Render just the editor container, buttons and script, without the asset block, for composing pages.
+
+        Parameters:
+            schema_json (Optional[Markup]): Serialized schema to embed instead of the model's own.
+            shared_defs_var (Optional[str]): A window global holding ``$defs`` shared by every editor on the page.
+        """
+        with timed(TEMPLATE_RENDER, model=self.model, template="fragment"):
+            json_editor_config = self._editor_config_json(schema_json)
+            template = get_template(BULK_FRAGMENT_TEMPLATE_NAME if self.bulk_url else EDITOR_FRAGMENT_TEMPLATE_NAME)
+            html = template.render(**self._template_context([json_editor_config], shared_defs_var))
+        record_text_size(RENDER_BYTES, html, model=self.model, template="fragment")
+        return html
+
+    def html_stream(self, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Render the page incrementally with Template.generate(), streaming the embedded schema and start value in chunks.
+
+        The asset block is sent first so browsers can start fetching scripts while the schema is still arriving. Pass
+        the iterator straight to ``flask.Response(config.html_stream(), mimetype="text/html")`` or
+        ``StreamingResponse(config.html_stream(), media_type="text/html")``. A cached page is streamed from memory,
+        but streaming never populates the render cache since the full page is never held at once.
+        """
+        if self.cache_render:
+            html = RENDER_CACHE.get(self.cache_key, self.cache_shared)
+            if html is not None:
+                yield from iter_chunks(html, chunk_size)
+                return
+        json_editor_config = iter_editor_config_json(
+            title=self.title,
+            schema_json=self._schema_json(),
+            start_val=self.start_val,
+            config=self.json_editor_config,
+            chunk_size=chunk_size,
+        )
+        template = get_template(EDITOR_TEMPLATE_NAME)
+        yield from buffer_stream(template.generate(**self._template_context(json_editor_config)), chunk_size)
 
 
 class WebEditorConfig2(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     title: str
     model: Union[BaseModel, Any]
     static_mount: str = "static"
     ui_schema: Optional[str] = None
     gen_ui_schema: Optional[bool] = None
+    optimize_schema: Optional[bool] = False
+
+    @property
+    def cache_key(self):
+        """The key concurrent ``html_async`` renders of equal configs are coalesced on, like WebEditorConfig's."""
+        return (self.model, stable_hash(["index", self.model_dump(mode="json", exclude={"model"})]))
 
     @property
     def html(self):
-        if issubclass(self.model, BaseModel):
-            schema = self.model.model_json_schema()
-        elif isinstance(self.model, TypeAdapter):
-            schema =  self.model.json_schema()
-        else:
-            raise ValueError("can only generate schema from BaseModel or TypeAdapter")
-        
+        with timed(TEMPLATE_RENDER, model=self.model, template="index"):
+            template = get_template(INDEX_TEMPLATE_NAME)
+            html = template.render(**self._template_context([self._schema_json()]))
+        record_text_size(RENDER_BYTES, html, model=self.model, template="index")
+        return html
+
+    def html_stream(self, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[str]:
+        """Render the page incrementally, see WebEditorConfig.html_stream."""
+        schema_chunks = iter_chunks(self._schema_json(), chunk_size)
+        template = get_template(INDEX_TEMPLATE_NAME)
+        yield from buffer_stream(template.generate(**self._template_context(schema_chunks)), chunk_size)
+
+    def _schema_json(self) -> Markup:
+        if self.optimize_schema:
+            return optimized_schema_entry(self.model).json
+        return SCHEMA_REGISTRY.schema_json(self.model)
+
+    def _template_context(self, json_schema: Iterable[Markup]) -> dict:
         if self.gen_ui_schema:
-            ui_schema = parse_json_schema(schema=schema)
-            
-        return EDITOR_TEMPLATE.render(
+            ui_schema = SCHEMA_REGISTRY.ui_schema_json(self.model)
+        else:
+            ui_schema = self.ui_schema
+
+        return dict(
             title=self.title,
-            json_schema=schema,
+            json_schema=json_schema,
             static_mount=self.static_mount,
-            #ui_schema=self.ui_schema,
+            ui_schema=ui_schema,
         )
 
+    async def html_async(self, executor=None):
+        return await render_async(self, executor=executor)
+
 
@@ -0,0 +1,252 @@
+import copy
+import json
+from collections import Counter
+from typing import Any, Dict, Iterator, List, NamedTuple, Set
+
+from pydantic_web_editor.lazy import DEFS_KEY, DEFS_REF_PREFIX
+from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY, SchemaEntry
+
+# Where JSON Schema keywords hold subschemas, so only real schemas are rewritten and never e.g. a default value.
+SCHEMA_KEYS = ("items", "additionalProperties", "not", "if", "then", "else", "contains", "propertyNames")
+SCHEMA_MAP_KEYS = ("properties", "patternProperties", "dependentSchemas", DEFS_KEY)
+SCHEMA_LIST_KEYS = ("anyOf", "oneOf", "allOf", "prefixItems")
+
+# OpenAPI's discriminator is ignored by json-editor, which picks a oneOf branch by validating against each.
+UNUSED_KEYS = ("discriminator",)
+# Keys a $ref site may drop when the referenced definition already says the same.
+REF_SIBLING_KEYS = ("title", "description")
+# Keys an Optional's outer schema may override in its non-null branch when the two are merged.
+OUTER_KEYS = ("title", "description")
+NULL_SCHEMA = {"type": "null"}
+DEFAULT_MIN_SHARED_SIZE = 128
+
+
+class SchemaSizeReport(NamedTuple):
+    original_bytes: int
+    optimized_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+    @property
+    def ratio(self) -> float:
+        """The optimized size as a fraction of the original."""
+        return self.optimized_bytes / self.original_bytes if self.original_bytes else 1.0
+
+
+def _canonical(node: Any) -> str:
+    return json.dumps(node, sort_keys=True, separators=(",", ":"))
+
+
+def _slots(node: dict) -> Iterator[tuple]:
+    """The ``(container, key)`` of each direct subschema of ``node``."""
+    for key in SCHEMA_KEYS:
+        value = node.get(key)
+        if isinstance(value, dict):
+            yield node, key
+        elif isinstance(value, list):
+            yield from ((value, i) for i, item in enumerate(value) if isinstance(item, dict))
+    for key in SCHEMA_MAP_KEYS:
+        value = node.get(key)
+        if isinstance(value, dict):
+            yield from ((value, name) for name, item in value.items() if isinstance(item, dict))
+    for key in SCHEMA_LIST_KEYS:
+        value = node.get(key)
+        if isinstance(value, list):
+            yield from ((value, i) for i, item in enumerate(value) if isinstance(item, dict))
+
+
+def _iter_slots(schema: dict, skip_defs: Set[str] = frozenset(), root: bool = True) -> Iterator[tuple]:
+    """
+    Every subschema's ``(container, key)``, parents before children, starting with the root in a one item list
+    unless ``root`` is False. Children are listed only after the caller has seen their parent, so the caller may
+    rewrite a node in place and its new children are walked.
+    """
+    defs = schema.get(DEFS_KEY)
+    stack = [(container, key) for container, key in _slots(schema) if not (container is defs and key in skip_defs)]
+    stack.reverse()
+    if root:
+        yield [schema], 0
+    while stack:
+        container, key = stack.pop()
+        yield container, key
+        node = container[key]
+        if isinstance(node, dict):
+            stack.extend(reversed(list(_slots(node))))
+
+
+def _ref_name(node: dict):
+    ref = node.get("$ref")
+    if isinstance(ref, str) and ref.startswith(DEFS_REF_PREFIX):
+        return ref[len(DEFS_REF_PREFIX) :]
+    return None
+
+
+def _free_name(defs: dict, base: str) -> str:
+    name, n = base, 1
+    while name in defs:
+        n += 1
+        name = f"{base}_{n}"
+    return name
+
+
+def _drop_unused_keys(schema: dict):
+    for container, key in _iter_slots(schema):
+        for unused in UNUSED_KEYS:
+            container[key].pop(unused, None)
+
+
+def _merge_duplicate_defs(schema: dict, defs: dict):
+    """Point references to definitions identical but for their title, e.g. two enums of the same values, at one."""
+    while True:
+        groups: Dict[str, List[str]] = {}
+        for name, definition in defs.items():
+            body = {key: value for key, value in definition.items() if key != "title"}
+            groups.setdefault(_canonical(body), []).append(name)
+        renames = {duplicate: names[0] for names in groups.values() for duplicate in names[1:]}
+        if not renames:
+            return
+        for container, key in _iter_slots(schema):
+            node = container[key]
+            name = _ref_name(node)
+            if name in renames:
+                target = renames[name]
+                node["$ref"] = DEFS_REF_PREFIX + target
+                # The duplicate's title labelled this site in the editor, keep it there.
+                title = defs[name].get("title")
+                if title is not None and "title" not in node and title != defs[target].get("title"):
+                    node["title"] = title
+        for duplicate in renames:
+            del defs[duplicate]
+
+
+def _cyclic_defs(defs: dict) -> Set[str]:
+    references = {}
+    for name, definition in defs.items():
+        wrapper = {DEFS_KEY: {name: definition}}
+        references[name] = {_ref_name(c[k]) for c, k in _iter_slots(wrapper, root=False)} - {None}
+    cyclic = set()
+    for start in defs:
+        stack, seen = list(references[start]), set()
+        while stack:
+            name = stack.pop()
+            if name == start:
+                cyclic.add(start)
+                break
+            if name in seen or name not in references:
+                continue
+            seen.add(name)
+            stack.extend(references[name])
+    return cyclic
+
+
+def _inline_single_use_defs(schema: dict, defs: dict):
+    """Replace each reference to a definition used exactly once, and not recursively, with the definition itself."""
+    counts = Counter(_ref_name(container[key]) for container, key in _iter_slots(schema))
+    inline = {name for name, count in counts.items() if count == 1 and name in defs} - _cyclic_defs(defs)
+    if not inline:
+        return
+    for container, key in _iter_slots(schema, skip_defs=inline):
+        node = container[key]
+        name = _ref_name(node)
+        if name in inline:
+            siblings = {k: v for k, v in node.items() if k != "$ref"}
+            node.clear()
+            node.update(defs[name])
+            node.update(siblings)
+    for name in inline:
+        del defs[name]
+
+
+def _collapse_optional(schema: dict):
+    """``anyOf: [X, {"type": "null"}]`` becomes X with ``"type": [X's type, "null"]`` where that is equivalent."""
+    for container, key in _iter_slots(schema):
+        node = container[key]
+        branches = node.get("anyOf")
+        if not isinstance(branches, list) or len(branches) != 2 or NULL_SCHEMA not in branches:
+            continue
+        other = branches[1 - branches.index(NULL_SCHEMA)]
+        if not isinstance(other, dict) or not isinstance(other.get("type"), str) or any(
+            k in other for k in ("$ref", "anyOf", "oneOf", "allOf", "not", "enum", "const")
+        ):
+            continue
+        if any(k in node and k not in OUTER_KEYS and node[k] != v for k, v in other.items()):
+            continue
+        del node["anyOf"]
+        for k, v in other.items():
+            node.setdefault(k, v)
+        node["type"] = [other["type"], "null"]
+
+
+def _share_duplicate_subtrees(schema: dict, defs: dict, min_size: int):
+    """Move subschemas repeated verbatim into ``$defs``, largest saving first, and reference them instead."""
+    while True:
+        occurrences: Dict[str, list] = {}
+        for container, key in _iter_slots(schema, root=False):
+            node = container[key]
+            if container is defs or _ref_name(node) is not None:
+                continue
+            canonical = _canonical(node)
+            if len(canonical) >= min_size:
+                occurrences.setdefault(canonical, []).append((container, key))
+        repeated = [(len(c) * (len(slots) - 1), c) for c, slots in occurrences.items() if len(slots) > 1]
+        if not repeated:
+            return
+        _, canonical = max(repeated)
+        slots = occurrences[canonical]
+        first = slots[0][0][slots[0][1]]
+        name = _free_name(defs, str(first.get("title") or "Shared").replace("/", "_").replace("~", "_"))
+        defs[name] = copy.deepcopy(first)
+        for container, key in slots:
+            container[key] = {"$ref": DEFS_REF_PREFIX + name}
+
+
+def _strip_redundant_ref_siblings(schema: dict, defs: dict):
+    for container, key in _iter_slots(schema):
+        node = container[key]
+        name = _ref_name(node)
+        if name in defs:
+            for sibling in REF_SIBLING_KEYS:
+                if sibling in node and node[sibling] == defs[name].get(sibling):
+                    del node[sibling]
+
+
+def optimize_json_schema(schema: dict, min_shared_size: int = DEFAULT_MIN_SHARED_SIZE) -> dict:
+    """
+    Shrink a JSON schema for embedding in an editor page, without changing what it accepts.
+
+    Drops keys json-editor ignores, merges definitions that differ only in title, inlines definitions used once,
+    collapses ``Optional`` unions into type lists, moves repeated subschemas of at least ``min_shared_size``
+    serialized characters into ``$defs`` and drops titles and descriptions a ``$ref`` site repeats from its target.
+
+    Parameters:
+        schema (dict): The schema, which is not modified.
+        min_shared_size (int): The smallest repeated subschema worth replacing with a reference.
+
+    Returns:
+        dict: The optimized schema.
+    """
+    schema = copy.deepcopy(schema)
+    _drop_unused_keys(schema)
+    defs = schema.setdefault(DEFS_KEY, {})
+    _merge_duplicate_defs(schema, defs)
+    _inline_single_use_defs(schema, defs)
+    _collapse_optional(schema)
+    _share_duplicate_subtrees(schema, defs, min_shared_size)
+    _strip_redundant_ref_siblings(schema, defs)
+    if not defs:
+        del schema[DEFS_KEY]
+    return schema
+
+
+def optimized_schema_entry(model: Any) -> SchemaEntry:
+    """The model's optimized schema, built once and invalidated with the schema."""
+    return SCHEMA_REGISTRY.derived(model, "optimized", optimize_json_schema)
+
+
+def schema_size_report(model: Any) -> SchemaSizeReport:
+    """How many bytes the optimizer saves on the model's embedded schema."""
+    original = SCHEMA_REGISTRY.schema_json(model).encode("utf-8")
+    optimized = optimized_schema_entry(model).json.encode("utf-8")
+    return SchemaSizeReport(len(original), len(optimized))
@@ -0,0 +1,287 @@
+"""
+SQLAlchemy and SQLModel tables as editor models.
+
+A table class is turned into a plain pydantic model once per set of columns and relationships, so its schema is
+generated and cached like any other model's. Rows are loaded with only the columns the editor shows, related rows
+in one batched query per relationship and every other lazy load disabled, and saved back as one bulk upsert.
+
+SQLAlchemy is imported on first use, it is only needed if these helpers are.
+"""
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from pydantic_web_editor.bulk import BulkStore
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE, everything else falls back to Session.merge per row.
+UPSERT_DIALECTS = ("sqlite", "postgresql")
+
+
+def _mapper(table: Any):
+    from sqlalchemy import inspect
+
+    return inspect(table)
+
+
+def _column_type(column: Any) -> Any:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return Any
+
+
+def _column_field(column: Any) -> Tuple[Any, Any]:
+    annotation = _column_type(column)
+    default = column.default
+    if default is not None and default.is_scalar:
+        value = default.arg
+    elif column.nullable or column.primary_key or default is not None or column.server_default is not None:
+        # Generated keys and database defaults are filled in on insert, so new rows may leave them out.
+        value = None
+    else:
+        return annotation, ...
+    return (Optional[annotation] if value is None else annotation), value
+
+
+def _suffix(*parts: Any) -> str:
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:8]
+
+
+@lru_cache(maxsize=None)
+def _orm_model(table: Any, columns: Optional[Tuple[str, ...]], relationships: Tuple[Tuple[str, Any], ...]):
+    mapper = _mapper(table)
+    fields: Dict[str, Any] = {}
+    for prop in mapper.column_attrs:
+        if columns is None or prop.key in columns:
+            fields[prop.key] = _column_field(prop.columns[0])
+    for name, nested in relationships:
+        relationship = mapper.relationships[name]
+        related = _orm_model(relationship.mapper.class_, *nested)
+        fields[name] = (List[related], []) if relationship.uselist else (Optional[related], None)
+    # A name of its own so the model never shares a model_identity (and cached schemas) with the table class or
+    # another selection of its columns.
+    name = f"{table.__name__}Data"
+    if columns is not None or relationships:
+        name = f"{name}_{_suffix(columns, relationships)}"
+    model = create_model(
+        name,
+        __config__=ConfigDict(from_attributes=True, title=table.__name__),
+        __module__=table.__module__,
+        **fields,
+    )
+    model.__orm_table__ = table
+    return model
+
+
+def _normalize_relationships(relationships: Any) -> Tuple[Tuple[str, Any], ...]:
+    """``["items", ("owner", ["id", "name"])]`` to hashable ``(name, (columns, relationships))`` pairs."""
+    normalized = []
+    for relationship in relationships or ():
+        if isinstance(relationship, str):
+            normalized.append((relationship, (None, ())))
+            continue
+        name, columns, *nested = relationship
+        columns = tuple(columns) if columns is not None else None
+        normalized.append((name, (columns, _normalize_relationships(nested[0] if nested else ()))))
+    return tuple(normalized)
+
+
+def orm_model(table: Any, columns: Optional[Sequence[str]] = None, relationships: Any = ()) -> Type[BaseModel]:
+    """
+    The pydantic model for a SQLAlchemy or SQLModel table class, built once per table and selection.
+
+    Parameters:
+        table (Any): A mapped table class.
+        columns (Optional[Sequence[str]]): The column attributes to include, all of them by default.
+        relationships (Any): Relationships to nest, as names or ``(name, columns, relationships)`` tuples selecting
+            the related table's columns and relationships in turn.
+
+    Returns:
+        Type[BaseModel]: A model validating from ORM instances (``from_attributes``) and from editor values.
+    """
+    columns = tuple(columns) if columns is not None else None
+    return _orm_model(table, columns, _normalize_relationships(relationships))
+
+
+def _primary_key(table: Any) -> Any:
+    keys = _mapper(table).primary_key
+    if len(keys) != 1:
+        raise ValueError(f"{table.__name__} needs a single column primary key")
+    return keys[0]
+
+
+def load_options(model: Type[BaseModel]) -> list:
+    """
+    Loader options fetching exactly what ``model`` validates: its columns only, each nested relationship in one
+    batched ``SELECT ... WHERE key IN (...)`` and nothing else, so validation can never trigger a lazy load.
+    """
+    from sqlalchemy.orm import load_only, raiseload, selectinload
+
+    def options_for(model, path=None):
+        table = model.__orm_table__
+        mapper = _mapper(table)
+        columns = [getattr(table, prop.key) for prop in mapper.column_attrs if prop.key in model.model_fields]
+        options = [path.load_only(*columns) if path is not None else load_only(*columns)]
+        for name in model.model_fields:
+            if name in mapper.relationships:
+                nested = selectinload(getattr(table, name)) if path is None else path.selectinload(getattr(table, name))
+                related = _related_model(model, name)
+                options.extend(options_for(related, nested))
+        options.append(path.raiseload("*") if path is not None else raiseload("*"))
+        return options
+
+    return options_for(model)
+
+
+def _related_model(model: Type[BaseModel], name: str) -> Type[BaseModel]:
+    annotation = model.model_fields[name].annotation
+    while getattr(annotation, "__args__", None):
+        annotation = next(arg for arg in annotation.__args__ if arg is not type(None))
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def load_rows(session: Any, model: Type[BaseModel], statement: Any = None) -> List[BaseModel]:
+    """
+    Run a query for ``model``'s table and return the rows as ``model`` instances, e.g. for ``start_val``.
+
+    Parameters:
+        session (Any): A SQLAlchemy Session.
+        model (Type[BaseModel]): A model from orm_model.
+        statement (Any): A ``select(table)`` with the caller's filters and ordering, by default every row.
+
+    Returns:
+        List[BaseModel]: The validated rows.
+    """
+    from sqlalchemy import select
+
+    if statement is None:
+        statement = select(model.__orm_table__)
+    rows = session.scalars(statement.options(*load_options(model))).all()
+    return _list_adapter(model).validate_python(rows)
+
+
+def load_row(session: Any, model: Type[BaseModel], ident: Any) -> Optional[BaseModel]:
+    """One row of ``model``'s table by primary key, or None."""
+    from sqlalchemy import select
+
+    table = model.__orm_table__
+    rows = load_rows(session, model, select(table).where(_primary_key(table) == ident))
+    return rows[0] if rows else None
+
+
+def upsert_rows(session: Any, model: Type[BaseModel], rows: Iterable[Any]) -> int:
+    """
+    Write editor values back to ``model``'s table in one INSERT ... ON CONFLICT DO UPDATE on the primary key.
+
+    Only the model's columns are written, nested relationships are not. Rows without a primary key are inserted.
+    Fields a model instance left unset, and empty values of columns with a default, are not written, so inserts get
+    the column default and updates keep the stored value.
+    Dialects other than SQLite and PostgreSQL fall back to ``Session.merge`` per row. The caller commits.
+
+    Parameters:
+        session (Any): A SQLAlchemy Session.
+        model (Type[BaseModel]): A model from orm_model.
+        rows (Iterable[Any]): Model instances or dicts.
+
+    Returns:
+        int: The number of rows written.
+    """
+    table = model.__orm_table__
+    mapper = _mapper(table)
+    # Attribute keys to column names, which the INSERT is written in.
+    columns = {prop.key: prop.columns[0].name for prop in mapper.column_attrs if prop.key in model.model_fields}
+    key = _primary_key(table).name
+    # _column_field gives these None defaults, which stand for the database's default rather than NULL.
+    defaulted = {
+        prop.columns[0].name
+        for prop in mapper.column_attrs
+        if prop.columns[0].default is not None or prop.columns[0].server_default is not None
+    }
+    defaulted.add(key)
+    values = []
+    for row in rows:
+        if isinstance(row, BaseModel):
+            row = row.model_dump(include=set(columns), exclude_unset=True)
+        row = {columns[name]: value for name, value in row.items() if name in columns}
+        values.append({name: value for name, value in row.items() if value is not None or name not in defaulted})
+    if not values:
+        return 0
+
+    dialect = session.get_bind(mapper=mapper).dialect.name
+    if dialect not in UPSERT_DIALECTS:
+        attributes = {name: attribute for attribute, name in columns.items()}
+        for row in values:
+            session.merge(table(**{attributes[name]: value for name, value in row.items()}))
+        session.flush()
+        return len(values)
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    # One statement per set of keys, since an executemany INSERT must bind the same columns on every row.
+    groups: Dict[Tuple[str, ...], List[dict]] = {}
+    for row in values:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    for keys, group in groups.items():
+        statement = insert(mapper.local_table)
+        updates = {name: statement.excluded[name] for name in keys if name != key}
+        if key in keys and updates:
+            statement = statement.on_conflict_do_update(index_elements=[key], set_=updates)
+        elif key in keys:
+            statement = statement.on_conflict_do_nothing(index_elements=[key])
+        session.execute(statement, group)
+    return len(values)
+
+
+class OrmBulkStore(BulkStore):
+    """
+    A BulkStore over a table, for bulk editing it with BulkHandler. Rows are identified by their primary key, paged
+    in primary key order with only the model's columns loaded, and edited rows are saved with one bulk upsert.
+
+    Parameters:
+        session_factory (Any): Creates sessions, e.g. a ``sessionmaker``.
+        model (Type[BaseModel]): A model from orm_model.
+        statement (Any): A ``select(table)`` restricting which rows are listed, by default all of them.
+    """
+
+    def __init__(self, session_factory: Any, model: Type[BaseModel], statement: Any = None):
+        from sqlalchemy import select
+
+        self.session_factory = session_factory
+        self.model = model
+        self.table = model.__orm_table__
+        self.key = _primary_key(self.table)
+        self.key_attribute = _mapper(self.table).get_property_by_column(self.key).key
+        self.statement = statement if statement is not None else select(self.table)
+
+    def count(self):
+        from sqlalchemy import func, select
+
+        with self.session_factory() as session:
+            return session.scalar(select(func.count()).select_from(self.statement.subquery()))
+
+    def window(self, offset, limit):
+        with self.session_factory() as session:
+            statement = self.statement.order_by(self.key).offset(offset).limit(limit)
+            rows = load_rows(session, self.model, statement)
+        return [(getattr(row, self.key_attribute), row) for row in rows]
+
+    def save(self, rows: Dict[Hashable, Any]):
+        from sqlalchemy import select
+
+        with self.session_factory() as session:
+            found = set(session.scalars(select(self.key).where(self.key.in_(list(rows)))))
+            for row_id in rows:
+                if row_id not in found:
+                    raise KeyError(row_id)
+            key = self.key_attribute
+            upsert_rows(session, self.model, [row.model_copy(update={key: row_id}) for row_id, row in rows.items()])
+            session.commit()
@@ -0,0 +1,319 @@
+import copy
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from pydantic_web_editor.instrumentation import SUBMISSION_VALIDATE, timed
+from pydantic_web_editor.submissions import SubmissionResponse, _json_response, editor_errors, get_type_adapter
+
+PATCH_OPS = ("add", "remove", "replace", "move", "copy", "test")
+# RFC 6901 array indexes: ASCII digits only, without leading zeros.
+ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+
+class JsonPatchError(ValueError):
+    """A patch that is malformed or does not apply to the document."""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """A ``test`` operation found a different value, i.e. the document changed underneath the client."""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON Pointer into unescaped reference tokens."""
+    if pointer == "":
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise JsonPatchError(f"invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not ARRAY_INDEX.fullmatch(token):
+        raise JsonPatchError(f"invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"array index out of range: {index}")
+    return index
+
+
+def _child(node: Any, token: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise JsonPatchError(f"no member {token!r}")
+        return node[token]
+    if isinstance(node, list):
+        return node[_index(node, token)]
+    raise JsonPatchError(f"cannot traverse into {type(node).__name__} at {token!r}")
+
+
+def resolve_pointer(document: Any, tokens: Sequence[str]) -> Any:
+    node = document
+    for token in tokens:
+        node = _child(node, token)
+    return node
+
+
+class _Patcher:
+    """
+    Applies operations copy-on-write: only the containers along each patched path are shallow copied, so a small
+    patch to a multi-megabyte document costs a few copies instead of a deep copy, and the original is left untouched.
+    """
+
+    def __init__(self, document: Any):
+        self.root = document
+        self._owned: Dict[int, Any] = {}
+
+    def _own(self, node: Any) -> Any:
+        if id(node) in self._owned:
+            return node
+        if isinstance(node, dict):
+            node = dict(node)
+        elif isinstance(node, list):
+            node = list(node)
+        else:
+            raise JsonPatchError(f"cannot traverse into {type(node).__name__}")
+        self._owned[id(node)] = node
+        return node
+
+    def _parent(self, tokens: Sequence[str]) -> Any:
+        self.root = node = self._own(self.root)
+        for token in tokens[:-1]:
+            child = self._own(_child(node, token))
+            if isinstance(node, dict):
+                node[token] = child
+            else:
+                node[_index(node, token)] = child
+            node = child
+        return node
+
+    def add(self, tokens: Sequence[str], value: Any):
+        if not tokens:
+            self.root = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, dict):
+            parent[tokens[-1]] = value
+        else:
+            parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+
+    def remove(self, tokens: Sequence[str]) -> Any:
+        if not tokens:
+            raise JsonPatchError("cannot remove the document root")
+        parent = self._parent(tokens)
+        value = _child(parent, tokens[-1])
+        if isinstance(parent, dict):
+            del parent[tokens[-1]]
+        else:
+            del parent[_index(parent, tokens[-1])]
+        return value
+
+    def replace(self, tokens: Sequence[str], value: Any):
+        if not tokens:
+            self.root = value
+            return
+        parent = self._parent(tokens)
+        _child(parent, tokens[-1])
+        if isinstance(parent, dict):
+            parent[tokens[-1]] = value
+        else:
+            parent[_index(parent, tokens[-1])] = value
+
+
+def _operation_value(operation: dict) -> Any:
+    if "value" not in operation:
+        raise JsonPatchError(f"{operation['op']} operation has no value")
+    return operation["value"]
+
+
+def apply_patch(document: Any, operations: Iterable[dict]) -> Any:
+    """
+    Apply an RFC 6902 JSON Patch, returning the patched document. The input document is not modified.
+
+    Parameters:
+        document (Any): The JSON document to patch.
+        operations (Iterable[dict]): The patch operations, applied in order and atomically.
+
+    Returns:
+        Any: The patched document. Unchanged subtrees are shared with the input.
+
+    Raises:
+        JsonPatchTestFailed: A ``test`` operation did not match.
+        JsonPatchError: An operation is malformed or its path does not exist.
+    """
+    patcher = _Patcher(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in PATCH_OPS:
+            raise JsonPatchError(f"invalid patch operation: {operation!r}")
+        op = operation["op"]
+        tokens = parse_pointer(operation.get("path"))
+        if op == "add":
+            patcher.add(tokens, _operation_value(operation))
+        elif op == "remove":
+            patcher.remove(tokens)
+        elif op == "replace":
+            patcher.replace(tokens, _operation_value(operation))
+        elif op == "test":
+            if resolve_pointer(patcher.root, tokens) != _operation_value(operation):
+                raise JsonPatchTestFailed(f"test failed at {operation['path']!r}")
+        else:
+            from_tokens = parse_pointer(operation.get("from"))
+            if op == "move":
+                if tokens[: len(from_tokens)] == from_tokens and tokens != from_tokens:
+                    raise JsonPatchError("cannot move a value into one of its own children")
+                patcher.add(tokens, patcher.remove(from_tokens))
+            else:
+                patcher.add(tokens, copy.deepcopy(resolve_pointer(patcher.root, from_tokens)))
+    return patcher.root
+
+
+def affected_paths(operations: Iterable[dict]) -> List[List[str]]:
+    """The pointer tokens of every location a patch writes to, which is what needs revalidating."""
+    paths = []
+    for operation in operations:
+        if operation["op"] == "test":
+            continue
+        paths.append(parse_pointer(operation["path"]))
+        if operation["op"] == "move":
+            paths.append(parse_pointer(operation["from"]))
+    return paths
+
+
+def _field_names(model: type) -> Dict[str, str]:
+    """Map document keys (aliases where set) to attribute names."""
+    return {field.alias or name: name for name, field in model.model_fields.items()}
+
+
+def _revalidate(instance: BaseModel, document: Any, tokens: Sequence[str]) -> BaseModel:
+    """
+    Return a copy of ``instance`` with the field at ``tokens`` revalidated from ``document``.
+
+    Descends through nested models so only the innermost affected field is validated, then reassigns each copied
+    parent so parent level validators still run. Raises LookupError where that is not possible, e.g. a change to a
+    list item or a removed field, and the caller falls back to validating the whole document.
+    """
+    if not tokens:
+        raise LookupError("document root changed")
+    model = type(instance)
+    name = _field_names(model).get(tokens[0])
+    if name is None or not isinstance(document, dict) or tokens[0] not in document:
+        raise LookupError(tokens[0])
+    value = document[tokens[0]]
+    current = getattr(instance, name)
+    if len(tokens) > 1 and isinstance(current, BaseModel):
+        value = _revalidate(current, value, tokens[1:])
+    updated = instance.model_copy()
+    return model.__pydantic_validator__.validate_assignment(updated, name, value)
+
+
+def _new_version() -> str:
+    return os.urandom(16).hex()
+
+
+class DocumentStore:
+    """
+    Holds one editor document and its version token for PatchHandler, in memory.
+
+    Subclass it to keep documents elsewhere: ``load`` returns ``(document, version)`` and ``save`` must only write if
+    the stored version still equals ``expected_version``, e.g. with a conditional UPDATE, returning the new version or
+    None on a conflict.
+    """
+
+    def __init__(self, document: Any = None, version: Optional[str] = None):
+        self._document = {} if document is None else document
+        self._version = version or _new_version()
+        self._lock = threading.Lock()
+
+    def load(self) -> Tuple[Any, str]:
+        with self._lock:
+            return self._document, self._version
+
+    def save(self, document: Any, expected_version: str) -> Optional[str]:
+        with self._lock:
+            if expected_version != self._version:
+                return None
+            self._document, self._version = document, _new_version()
+            return self._version
+
+
+class PatchHandler:
+    """
+    Saves editor changes sent as JSON Patches instead of whole documents.
+
+    The body is ``{"version": ..., "patch": [...]}``, where ``version`` is the token the client's copy was loaded
+    at. A stale version or failed ``test`` operation gets a 409 with the current version; an invalid result gets a
+    422 with json-editor style errors. Otherwise the patched document is stored and the response carries its new
+    version.
+
+    The last validated instance is kept, so a save revalidates only the fields its patch touched (descending into
+    nested models) via pydantic's ``validate_assignment``. Edits inside lists, removed fields, a changed root or a
+    store changed by someone else fall back to validating the whole document.
+
+    Parameters:
+        model (Any): The BaseModel subclass or TypeAdapter the editor was rendered from.
+        store (DocumentStore): Where the document and its version live.
+        on_valid (Optional[Callable]): Called with the validated model instance after it is stored. Its return value,
+            if JSON serializable, becomes the response's ``result``.
+    """
+
+    def __init__(self, model: Any, store: DocumentStore, on_valid: Optional[Callable[[Any], Any]] = None):
+        self.model = model
+        self.store = store
+        self.on_valid = on_valid
+        self.adapter = get_type_adapter(model)
+        self._validated: Optional[Tuple[str, Any]] = None
+
+    def validate(self, document: Any, version: str, operations: List[dict]):
+        with timed(SUBMISSION_VALIDATE, model=self.model, mode="patch"):
+            validated = self._validated
+            if validated is not None and validated[0] == version and isinstance(validated[1], BaseModel):
+                instance = validated[1]
+                try:
+                    for tokens in affected_paths(operations):
+                        instance = _revalidate(instance, document, tokens)
+                    return instance
+                except (LookupError, ValidationError):
+                    # Errors are reported from a full validation so their paths are relative to the document root.
+                    pass
+            return self.adapter.validate_python(document)
+
+    def __call__(self, body: bytes, content_type: Optional[str] = None) -> SubmissionResponse:
+        try:
+            request = json.loads(body or b"null")
+            version, operations = request["version"], request["patch"]
+            if not isinstance(operations, list):
+                raise ValueError("patch must be a list of operations")
+        except (ValueError, TypeError, KeyError) as e:
+            return _json_response(400, {"valid": False, "errors": [{"path": "root", "property": "json", "message": str(e)}]})
+
+        document, current_version = self.store.load()
+        if version != current_version:
+            return self._conflict(current_version, "the document was changed since it was loaded")
+        try:
+            document = apply_patch(document, operations)
+        except JsonPatchTestFailed as e:
+            return self._conflict(current_version, str(e))
+        except JsonPatchError as e:
+            return _json_response(422, {"valid": False, "errors": [{"path": "root", "property": "patch", "message": str(e)}]})
+        try:
+            validated = self.validate(document, version, operations)
+        except ValidationError as e:
+            return _json_response(422, {"valid": False, "errors": editor_errors(e)})
+
+        new_version = self.store.save(document, version)
+        if new_version is None:
+            return self._conflict(self.store.load()[1], "the document was changed while saving")
+        self._validated = (new_version, validated)
+        result = self.on_valid(validated) if self.on_valid is not None else None
+        return _json_response(200, {"valid": True, "version": new_version, "result": result})
+
+    @staticmethod
+    def _conflict(version: str, message: str) -> SubmissionResponse:
+        errors = [{"path": "root", "property": "conflict", "message": message}]
+        return _json_response(409, {"valid": False, "conflict": True, "version": version, "errors": errors})
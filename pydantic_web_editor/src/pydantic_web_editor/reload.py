@@ -0,0 +1,99 @@
+"""
+Evicting the cached pages and schemas of models whose module was reloaded, for development servers that reload
+code in process (e.g. ``importlib.reload`` or a hot reloader) instead of restarting.
+
+A reload defines new model classes, whose fingerprints already give them fresh cache keys, but the entries of the
+old classes would otherwise stay in the caches, and in a shared backend, until evicted. ReloadWatcher finds models
+whose module now binds their name to a different class and drops only their entries.
+"""
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic_web_editor.cache import RENDER_CACHE, RenderCache
+from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY, SchemaRegistry
+
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+def _is_replaced(model: type) -> bool:
+    module = sys.modules.get(model.__module__)
+    if module is None:
+        return True
+    current = module
+    for part in model.__qualname__.split("."):
+        current = getattr(current, part, None)
+        if current is None:
+            # Classes made by create_model or inside functions are not module attributes, so cannot be checked.
+            return False
+    return current is not model
+
+
+def stale_models(models: Iterable[Any]) -> Dict[str, List[type]]:
+    """The model classes among ``models`` that were replaced by a reload, grouped by ``__module__``."""
+    stale: Dict[str, List[type]] = {}
+    for model in models:
+        # TypeAdapters and model instances have no module binding to compare, their entries age out of the caches.
+        if isinstance(model, type) and _is_replaced(model):
+            stale.setdefault(model.__module__, []).append(model)
+    return stale
+
+
+class ReloadWatcher:
+    """
+    Periodically evicts cached pages and schemas of reloaded models, e.g. ``ReloadWatcher().start()`` in dev mode.
+
+    Parameters:
+        interval (float): Seconds between checks when started.
+        render_cache (RenderCache): The page cache to evict from.
+        schema_registry (SchemaRegistry): The schema registry to evict from.
+        on_evict (Optional[Callable]): Called with the evicted models grouped by module, e.g. to log them.
+    """
+
+    def __init__(
+        self,
+        interval: float = RELOAD_CHECK_INTERVAL,
+        render_cache: RenderCache = RENDER_CACHE,
+        schema_registry: SchemaRegistry = SCHEMA_REGISTRY,
+        on_evict: Optional[Callable[[Dict[str, List[type]]], Any]] = None,
+    ):
+        self.interval = interval
+        self.render_cache = render_cache
+        self.schema_registry = schema_registry
+        self.on_evict = on_evict
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> Dict[str, List[type]]:
+        """Evict the entries of every reloaded model now, returning the evicted models grouped by module."""
+        stale = stale_models(self.render_cache.models() | self.schema_registry.models())
+        for models in stale.values():
+            for model in models:
+                self.render_cache.invalidate(model)
+                self.schema_registry.invalidate(model)
+        if stale and self.on_evict is not None:
+            self.on_evict(stale)
+        return stale
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> "ReloadWatcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pydantic-web-editor-reload", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, NamedTuple, Optional
+
+from markupsafe import Markup
+from pydantic import BaseModel, TypeAdapter
+
+from pydantic_web_editor.backends import CacheBackend, model_identity
+from pydantic_web_editor.encoding import HTML_UNSAFE, dumps_json
+from pydantic_web_editor.instrumentation import (
+    DERIVED_SCHEMA_BUILD,
+    SCHEMA_BUILD,
+    SCHEMA_BYTES,
+    UI_SCHEMA_BUILD,
+    record_text_size,
+    timed,
+)
+from pydantic_web_editor.ui_schema import parse_json_schema
+
+
+class SchemaEntry(NamedTuple):
+    schema: dict
+    json: Markup
+    etag: str
+
+    @property
+    def version(self) -> str:
+        """A short content hash suitable for cache busting URLs."""
+        return self.etag.strip('"')[:16]
+
+
+def build_json_schema(model: Any) -> dict:
+    """
+    Generate the JSON schema for a pydantic model class or TypeAdapter.
+
+    Parameters:
+        model (Any): A BaseModel subclass or a TypeAdapter instance.
+
+    Returns:
+        dict: The JSON schema.
+    """
+    if isinstance(model, TypeAdapter):
+        return model.json_schema()
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        return model.model_json_schema()
+    raise ValueError("can only generate schema from BaseModel or TypeAdapter")
+
+
+def schema_name(model: Any) -> str:
+    """The name a model's schema is served under, e.g. ``/schemas/<name>.json``."""
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        return model.__name__
+    title = SCHEMA_REGISTRY.schema(model).get("title")
+    if not title:
+        raise ValueError(f"{model!r} has no schema title, register it under an explicit name instead")
+    return title
+
+
+def dumps_html_safe(value: Any) -> Markup:
+    """Serialize ``value`` to minified JSON that is safe to embed in a ``<script>`` block, see set_json_encoder."""
+    return Markup(dumps_json(value).translate(HTML_UNSAFE))
+
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_html_safe(value: Any, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Markup]:
+    """
+    Serialize ``value`` like dumps_html_safe, but yield it in chunks of roughly ``chunk_size`` characters.
+
+    It is serialized whole with the configured encoder and then chunked, so a streamed page embeds exactly what a
+    rendered one does, datetimes and nested models included. Escaping is per character, so the chunks can be split
+    anywhere and still concatenate to valid JSON.
+    """
+    yield from iter_chunks(dumps_html_safe(value), chunk_size)
+
+
+def make_entry(schema: dict, schema_json: Optional[str] = None) -> SchemaEntry:
+    """Build an entry from a schema, or from its already serialized, HTML-safe JSON, e.g. read back from a backend."""
+    schema_json = dumps_html_safe(schema) if schema_json is None else Markup(schema_json)
+    # A hash of the JSON itself, since the ETag and ?v= version are cached as immutable by browsers and CDNs.
+    etag = '"%s"' % hashlib.sha256(schema_json.encode("utf-8")).hexdigest()
+    return SchemaEntry(schema=schema, json=schema_json, etag=etag)
+
+
+def iter_chunks(text: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Markup]:
+    """Split already serialized, HTML-safe JSON into chunks."""
+    for start in range(0, len(text), chunk_size):
+        yield Markup(text[start : start + chunk_size])
+
+
+class SchemaRegistry:
+    """
+    A thread-safe, process-wide store of generated JSON schemas.
+
+    Each model's schema is generated once and kept both as a dict and as pre-serialized, HTML-safe JSON
+    so templates can embed it without running ``tojson`` again. With a ``backend``, schemas generated by one
+    process are read back by the others instead of being generated again.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend
+        self._entries: Dict[Any, SchemaEntry] = {}
+        self._derived: Dict[Any, Dict[Hashable, SchemaEntry]] = {}
+        self._key_locks: Dict[Any, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, model: Any):
+        return model in self._entries
+
+    def get(self, model: Any) -> SchemaEntry:
+        entry = self._entries.get(model)
+        if entry is not None:
+            return entry
+        with self._lock:
+            key_lock = self._key_locks.setdefault(model, threading.Lock())
+        # Only one thread builds a given model's schema, others wait for its result.
+        with key_lock:
+            entry = self._entries.get(model)
+            if entry is None:
+                entry = self._load(model)
+                self._entries[model] = entry
+        return entry
+
+    def _load(self, model: Any) -> SchemaEntry:
+        shared_key = None
+        if self.backend is not None and model_identity(model) is not None:
+            shared_key = f"schema:{model_identity(model)}:json"
+            schema_json = self.backend.get(shared_key)
+            if schema_json is not None:
+                return make_entry(json.loads(schema_json), schema_json)
+        with timed(SCHEMA_BUILD, model=model):
+            entry = make_entry(build_json_schema(model))
+        record_text_size(SCHEMA_BYTES, entry.json, model=model)
+        if shared_key is not None:
+            self.backend.set(shared_key, str(entry.json))
+        return entry
+
+    def schema(self, model: Any) -> dict:
+        return self.get(model).schema
+
+    def schema_json(self, model: Any) -> Markup:
+        return self.get(model).json
+
+    def derived(
+        self, model: Any, key: Hashable, build: Callable[[dict], dict], metric: str = DERIVED_SCHEMA_BUILD
+    ) -> SchemaEntry:
+        """
+        A document derived from a model's schema, e.g. its UI schema, built once and invalidated with the schema.
+
+        Parameters:
+            model (Any): The model whose schema is passed to ``build``.
+            key (Hashable): Identifies the derived document among the model's others.
+            build (Callable[[dict], dict]): Builds the document from the schema. It must not mutate the schema.
+            metric (str): The instrumentation name the build is timed under.
+        """
+        derived = self._derived.setdefault(model, {})
+        entry = derived.get(key)
+        if entry is None:
+            schema = self.schema(model)
+            with timed(metric, model=model):
+                entry = make_entry(build(schema))
+            derived[key] = entry
+        return entry
+
+    def ui_schema_json(self, model: Any) -> Markup:
+        """The JSON Forms UI schema generated from a model's schema, serialized and cached like the schema itself."""
+        return self.derived(model, "ui_schema", parse_json_schema, metric=UI_SCHEMA_BUILD).json
+
+    def warm(self, models: Iterable[Any]) -> int:
+        """
+        Generate and store schemas ahead of the first request, e.g. at app startup.
+
+        Parameters:
+            models (Iterable[Any]): BaseModel subclasses and/or TypeAdapter instances.
+
+        Returns:
+            int: The number of models now registered.
+        """
+        for model in models:
+            self.get(model)
+        return len(self._entries)
+
+    def models(self) -> set:
+        """The models with a cached schema or derived document."""
+        with self._lock:
+            return set(self._entries) | set(self._derived)
+
+    def invalidate(self, model: Optional[Any] = None):
+        if self.backend is not None:
+            if model is None:
+                self.backend.delete_prefix("schema:")
+            elif model_identity(model) is not None:
+                self.backend.delete_prefix(f"schema:{model_identity(model)}:")
+        with self._lock:
+            if model is None:
+                self._entries.clear()
+                self._derived.clear()
+                self._key_locks.clear()
+            else:
+                self._entries.pop(model, None)
+                self._derived.pop(model, None)
+                self._key_locks.pop(model, None)
+
+
+SCHEMA_REGISTRY = SchemaRegistry()
+
+
+def warm_schemas(models: Iterable[Any]) -> int:
+    return SCHEMA_REGISTRY.warm(models)
@@ -0,0 +1,254 @@
+"""
+A server-side rendered version of the editor form, shown until json-editor has loaded.
+
+The schema is walked once per model and compiled into a list of parts: runs of static, already escaped markup and
+slots for the values of one page's ``start_val``. Each ``$defs`` entry is compiled once into parts of its own, which
+every reference to it expands, so models reached along many paths stay linear in size. Rendering a page only fills
+the slots, so it costs about as much as serializing the value. The compiled parts are kept in SCHEMA_REGISTRY and
+invalidated with the schema.
+
+json-editor cannot adopt markup it did not build, so the browser reads the values back out of the server form,
+including anything typed before the editor was ready, builds the editor from them and then removes the server form.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+from markupsafe import Markup, escape
+from pydantic import BaseModel
+
+from pydantic_web_editor.schema_registry import SCHEMA_REGISTRY
+from pydantic_web_editor.ui_schema import MAX_DEPTH, RefResolver
+
+# The value kinds the browser reads back, see readServerForm in _editor.html.
+TEXT, NUMBER, CHECKBOX, SELECT, JSON_TEXT = "text", "number", "checkbox", "select", "json"
+# Only formats whose input type accepts pydantic's JSON output as is. Datetimes and times carry a UTC offset, which
+# datetime-local and time inputs reject by blanking the field, so they stay text.
+STRING_FORMATS = {
+    "date": "date",
+    "email": "email",
+    "uri": "url",
+    "password": "password",
+}
+NULL_SCHEMA = {"type": "null"}
+# Stands for the label of the property a definition is referenced from, filled in when the reference is rendered.
+LABEL_SLOT = "\x00label\x00"
+
+
+def _attr(value: Any) -> str:
+    return str(escape(str(value)))
+
+
+def _non_null(node: dict) -> dict:
+    """Unwrap ``Optional`` forms: ``anyOf`` with a null branch, single ``allOf`` and ``[type, "null"]`` lists."""
+    for combinator in ("anyOf", "oneOf"):
+        branches = node.get(combinator)
+        if isinstance(branches, list) and len(branches) == 2 and NULL_SCHEMA in branches:
+            merged = {k: v for k, v in node.items() if k != combinator}
+            return {**branches[1 - branches.index(NULL_SCHEMA)], **merged}
+    branches = node.get("allOf")
+    if isinstance(branches, list) and len(branches) == 1:
+        merged = {k: v for k, v in node.items() if k != "allOf"}
+        return {**branches[0], **merged}
+    types = node.get("type")
+    if isinstance(types, list) and len(types) == 2 and "null" in types:
+        return {**node, "type": types[1 - types.index("null")]}
+    return node
+
+
+class _Compiler:
+    def __init__(self, schema: dict, max_depth: int):
+        self.resolve = RefResolver(schema)
+        self.max_depth = max_depth
+        self.defs: Dict[str, Optional[dict]] = {}
+
+    def compile(self, node: Any, tokens: List[str], label: Optional[str], depth: int, parts: list):
+        """Compile ``node`` at ``tokens``. ``label`` is the escaped label of the property, if it is one."""
+        if not isinstance(node, dict):
+            return
+        if label is None and node.get("title"):
+            label = _attr(node["title"])
+        if "$ref" in node:
+            return self.ref(node, tokens, label, parts)
+        node = _non_null(node)
+        if "$ref" in node:
+            return self.compile(node, tokens, label, depth, parts)
+        if depth > self.max_depth:
+            return self.scalar(node, tokens, label, parts, JSON_TEXT)
+        kind = node.get("type")
+        if "enum" in node:
+            return self.scalar(node, tokens, label, parts, SELECT)
+        if kind == "object" and "properties" in node:
+            parts.append(["html", f'<fieldset class="mb-3"><legend>{label or ""}</legend>'])
+            for name, child in node["properties"].items():
+                child_label = _attr(child.get("title") or name) if isinstance(child, dict) else _attr(name)
+                self.compile(child, tokens + [name], child_label, depth + 1, parts)
+            parts.append(["html", "</fieldset>"])
+        elif kind == "array" and isinstance(node.get("items"), dict):
+            item_parts: list = []
+            self.compile(node["items"], [], None, depth + 1, item_parts)
+            parts.append(["html", f'<fieldset class="mb-3"><legend>{label or ""}</legend>'])
+            parts.append(["array", tokens, item_parts])
+            parts.append(["html", "</fieldset>"])
+        elif kind == "boolean":
+            self.scalar(node, tokens, label, parts, CHECKBOX)
+        elif kind in ("integer", "number"):
+            self.scalar(node, tokens, label, parts, NUMBER)
+        elif kind == "string":
+            self.scalar(node, tokens, label, parts, TEXT)
+        else:
+            self.scalar(node, tokens, label, parts, JSON_TEXT)
+
+    def ref(self, node: dict, tokens: List[str], label: Optional[str], parts: list):
+        ref = node["$ref"]
+        siblings = {k: v for k, v in node.items() if k != "$ref"}
+        if ref not in self.defs:
+            # Reserved first, so a definition referencing itself is compiled once.
+            self.defs[ref] = None
+            resolved = self.resolve(ref)
+            def_parts: list = []
+            self.compile(resolved, [], LABEL_SLOT, 0, def_parts)
+            self.defs[ref] = {"label": _attr(resolved.get("title") or ""), "parts": def_parts}
+        # A model nested in itself, or nested too deep, is rendered as JSON, its depth is only known once there is data.
+        fallback: list = []
+        self.scalar(siblings, [], LABEL_SLOT, fallback, JSON_TEXT)
+        parts.append(["ref", ref, tokens, label, "default" in siblings, siblings.get("default"), fallback[0]])
+
+    def scalar(self, node: dict, tokens: List[str], label: Optional[str], parts: list, kind: str):
+        label = label or ""
+        default = node.get("default")
+        if kind == CHECKBOX:
+            open_html = '<div class="form-check mb-2"><label class="form-check-label">'
+            open_html += '<input type="checkbox" class="form-check-input"'
+            parts.append(["field", tokens, kind, open_html, f"> {label}</label></div>", default])
+            return
+        open_html = f'<div class="mb-2"><label class="form-label">{label}</label>' if label else '<div class="mb-2">'
+        if kind == SELECT:
+            options = [[json.dumps(value), _attr(value)] for value in node["enum"]]
+            parts.append(["select", tokens, open_html + '<select class="form-select"', options, "</div>", default])
+        elif kind == JSON_TEXT:
+            open_html += '<textarea class="form-control font-monospace"'
+            parts.append(["field", tokens, kind, open_html, "</textarea></div>", default])
+        else:
+            if kind == NUMBER:
+                attrs = f' type="number" step="{"1" if node.get("type") == "integer" else "any"}"'
+            else:
+                attrs = f' type="{STRING_FORMATS.get(node.get("format"), "text")}"'
+                if "maxLength" in node:
+                    attrs += f' maxlength="{int(node["maxLength"])}"'
+            parts.append(["field", tokens, kind, f'{open_html}<input class="form-control"{attrs}', "></div>", default])
+
+
+def compile_form(schema: dict, max_depth: int = MAX_DEPTH) -> dict:
+    """Compile a schema into the parts render_form fills in. The schema is not modified."""
+    parts: list = []
+    compiler = _Compiler(schema, max_depth)
+    compiler.compile(schema, [], None, 0, parts)
+    return {"parts": parts, "defs": compiler.defs, "max_depth": max_depth}
+
+
+def compiled_form(model: Any) -> dict:
+    """The model's compiled form, built once and invalidated with its schema."""
+    return SCHEMA_REGISTRY.derived(model, "ssr_form", compile_form).schema
+
+
+_MISSING = object()
+
+
+def _lookup(value: Any, tokens: List[str], default: Any) -> Any:
+    if value is _MISSING:
+        return default
+    for token in tokens:
+        if not isinstance(value, dict) or token not in value:
+            return default
+        value = value[token]
+    return value
+
+
+def _pointer(pointer: str, tokens: List[str]) -> str:
+    return pointer + "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+class _Renderer:
+    def __init__(self, form: dict, out: List[str]):
+        self.defs = form["defs"]
+        self.max_depth = form["max_depth"]
+        self.out = out
+        # The definitions being expanded, to render a model nested in itself as JSON.
+        self.expanding: List[str] = []
+
+    def render(self, parts: list, value: Any, pointer: str, label: str):
+        """Render ``parts`` for ``value``. ``label`` fills the LABEL_SLOT of a definition's own parts."""
+        out = self.out
+        for part in parts:
+            if part[0] == "html":
+                out.append(part[1].replace(LABEL_SLOT, label))
+                continue
+            path = _pointer(pointer, part[2] if part[0] == "ref" else part[1])
+            if part[0] == "ref":
+                self.ref(part, value, path, label)
+            elif part[0] == "array":
+                items = _lookup(value, part[1], None)
+                for index, item in enumerate(items if isinstance(items, list) else ()):
+                    out.append('<div class="ms-3">')
+                    self.render(part[2], item, f"{path}/{index}", label)
+                    out.append("</div>")
+            elif part[0] == "select":
+                _, tokens, open_html, options, close_html, default = part
+                selected = json.dumps(_lookup(value, tokens, default))
+                open_html = open_html.replace(LABEL_SLOT, label)
+                out.append(f'{open_html} data-pwe-path="{_attr(path)}" data-pwe-type="{SELECT}">')
+                if all(option != selected for option, _ in options):
+                    # Preselected, so the browser does not select the first option, which would read as a change.
+                    out.append('<option value="" selected hidden></option>')
+                for option, option_label in options:
+                    flag = " selected" if option == selected else ""
+                    out.append(f'<option value="{_attr(option)}"{flag}>{option_label}</option>')
+                out.append(f"</select>{close_html}")
+            else:
+                self.field(part, _lookup(value, part[1], part[5]), path, label)
+
+    def ref(self, part: list, value: Any, path: str, label: str):
+        _, ref, tokens, ref_label, has_default, default, fallback = part
+        definition = self.defs[ref]
+        if ref_label is None:
+            ref_label = definition["label"]
+        elif ref_label == LABEL_SLOT:
+            ref_label = label
+        current = _lookup(value, tokens, default if has_default else _MISSING)
+        if ref in self.expanding or len(self.expanding) > self.max_depth:
+            return self.field(fallback, None if current is _MISSING else current, path, ref_label)
+        self.expanding.append(ref)
+        self.render(definition["parts"], current, path, ref_label)
+        self.expanding.pop()
+
+    def field(self, part: list, current: Any, path: str, label: str):
+        _, _, kind, open_html, close_html, _ = part
+        open_html = open_html.replace(LABEL_SLOT, label)
+        close_html = close_html.replace(LABEL_SLOT, label)
+        attrs = f' data-pwe-path="{_attr(path)}" data-pwe-type="{kind}"'
+        if kind == CHECKBOX:
+            self.out.append(f'{open_html}{attrs}{" checked" if current else ""}{close_html}')
+        elif kind == JSON_TEXT:
+            text = "" if current is None else json.dumps(current, indent=2)
+            self.out.append(f"{open_html}{attrs}>{_attr(text)}{close_html}")
+        else:
+            self.out.append(f'{open_html}{attrs} value="{_attr("" if current is None else current)}"{close_html}')
+
+
+def render_form(model: Any, value: Any = None) -> Markup:
+    """
+    Render the model's form as plain HTML with ``value`` filled in, e.g. a config's ``start_val``.
+
+    Parameters:
+        model (Any): A BaseModel subclass or TypeAdapter.
+        value (Any): The document shown, a dict or model instance.
+
+    Returns:
+        Markup: Bootstrap styled form controls, one per scalar field, nested in fieldsets.
+    """
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    out: List[str] = []
+    form = compiled_form(model)
+    _Renderer(form, out).render(form["parts"], value, "", "")
+    return Markup("".join(out))
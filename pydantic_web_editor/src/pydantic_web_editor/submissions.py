@@ -0,0 +1,137 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qs
+
+from pydantic import TypeAdapter, ValidationError
+
+from pydantic_web_editor.instrumentation import SUBMISSION_VALIDATE, timed
+
+
+PAYLOAD_FIELD = "payload"
+# Sent next to the payload by the editor's buttons. Model fields cannot start with an underscore, so a document can
+# never be mistaken for a wrapped one.
+PAYLOAD_MARKER = "_pydantic_web_editor"
+
+
+class SubmissionResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(model: Any) -> TypeAdapter:
+    """A TypeAdapter built once per model, so validators are compiled once per process instead of per request."""
+    return model if isinstance(model, TypeAdapter) else TypeAdapter(model)
+
+
+@lru_cache(maxsize=None)
+def get_batch_type_adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def parse_payload(body: bytes, content_type: Optional[str] = None) -> Any:
+    """
+    Extract the editor value from a submission body.
+
+    Form encoded bodies, htmx's default, must carry the JSON encoded editor value in the ``payload`` field. JSON
+    bodies are used as is, unless they carry the ``_pydantic_web_editor`` marker the editor's buttons send, as with
+    htmx's json-enc extension, in which case the value is taken from their ``payload`` field.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type == "application/x-www-form-urlencoded":
+        fields = parse_qs(body.decode("utf-8"), keep_blank_values=True)
+        if PAYLOAD_FIELD not in fields:
+            raise ValueError(f"form submission has no {PAYLOAD_FIELD} field")
+        return json.loads(fields[PAYLOAD_FIELD][0])
+    value = json.loads(body or b"null")
+    if isinstance(value, dict) and PAYLOAD_MARKER in value:
+        if PAYLOAD_FIELD not in value:
+            raise ValueError(f"editor submission has no {PAYLOAD_FIELD} field")
+        value = value[PAYLOAD_FIELD]
+        if isinstance(value, str):
+            value = json.loads(value)
+    return value
+
+
+def editor_errors(error: ValidationError, root: str = "root") -> List[dict]:
+    """Convert a pydantic ValidationError into json-editor style ``{path, property, message}`` errors."""
+    errors = []
+    for detail in error.errors(include_url=False):
+        path = ".".join([root] + [str(part) for part in detail["loc"]])
+        errors.append({"path": path, "property": detail["type"], "message": detail["msg"]})
+    return errors
+
+
+def _json_response(status: int, value: Any) -> SubmissionResponse:
+    return SubmissionResponse(status, {"Content-Type": "application/json"}, json.dumps(value, default=str).encode())
+
+
+class SubmissionHandler:
+    """
+    Validates editor submissions for a model and hands valid documents to ``on_valid``.
+
+    A JSON array is treated as a batch and validated in one pass. Invalid submissions get a 422 with
+    json-editor style errors; batch errors also carry the index of the offending document.
+
+    Parameters:
+        model (Any): The BaseModel subclass or TypeAdapter the editor was rendered from.
+        on_valid (Optional[Callable]): Called with the validated model instance, or a list of them for a batch.
+            Its return value, if JSON serializable, becomes the response body.
+        allow_batch (bool): Accept JSON arrays of documents.
+    """
+
+    def __init__(self, model: Any, on_valid: Optional[Callable[[Any], Any]] = None, allow_batch: bool = True):
+        self.model = model
+        self.on_valid = on_valid
+        self.allow_batch = allow_batch
+        self.adapter = get_type_adapter(model)
+
+    def validate(self, value: Any):
+        with timed(SUBMISSION_VALIDATE, model=self.model):
+            if isinstance(value, list) and self.allow_batch and not isinstance(self.model, TypeAdapter):
+                return get_batch_type_adapter(self.model).validate_python(value)
+            return self.adapter.validate_python(value)
+
+    def __call__(self, body: bytes, content_type: Optional[str] = None) -> SubmissionResponse:
+        try:
+            value = parse_payload(body, content_type)
+        except ValueError as e:
+            return _json_response(400, {"valid": False, "errors": [{"path": "root", "property": "json", "message": str(e)}]})
+        try:
+            validated = self.validate(value)
+        except ValidationError as e:
+            errors = editor_errors(e)
+            if isinstance(value, list):
+                for error, detail in zip(errors, e.errors(include_url=False)):
+                    error["index"] = detail["loc"][0] if detail["loc"] else None
+            return _json_response(422, {"valid": False, "errors": errors})
+        result = self.on_valid(validated) if self.on_valid is not None else None
+        count = len(validated) if isinstance(value, list) else 1
+        return _json_response(200, {"valid": True, "count": count, "result": result})
+
+
+def flask_submission_view(handler: SubmissionHandler):
+    """Create a Flask view for a submission handler, e.g. ``app.add_url_rule("/save", view_func=..., methods=["POST"])``."""
+    from flask import Response, request
+
+    def submission_view():
+        status, headers, body = handler(request.get_data(), request.content_type)
+        return Response(body, status=status, headers=headers)
+
+    return submission_view
+
+
+def fastapi_submission_router(handler: SubmissionHandler, path: str, methods: Optional[List[str]] = None):
+    """Create a FastAPI router posting to ``path``, e.g. ``app.include_router(fastapi_submission_router(handler, "/save"))``."""
+    from fastapi import APIRouter, Request, Response
+
+    router = APIRouter()
+
+    async def submission_view(request: Request):
+        status, headers, body = handler(await request.body(), request.headers.get("content-type"))
+        return Response(content=body, status_code=status, headers=headers)
+
+    router.add_api_route(path, submission_view, methods=methods or ["POST"])
+    return router
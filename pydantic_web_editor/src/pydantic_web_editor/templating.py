@@ -0,0 +1,97 @@
+"""
+The Jinja environment and templates, created on first render rather than at import.
+
+Importing jinja2 and compiling the page templates is a noticeable share of a cold start, which processes that only
+need the models, ``copy_static_folder`` or the schema handlers never use. Cold starts can be cut further with a
+bytecode cache shared by workers, or with templates precompiled to Python modules at build time, see
+configure_templates and compile_templates.
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+# Environment variables read when the environment is first created, so deployments can opt in without code changes.
+BYTECODE_CACHE_ENV = "PYDANTIC_WEB_EDITOR_BYTECODE_CACHE"
+COMPILED_TEMPLATES_ENV = "PYDANTIC_WEB_EDITOR_COMPILED_TEMPLATES"
+
+EDITOR_TEMPLATE_NAME = "pydantic_web_editor.html"
+INDEX_TEMPLATE_NAME = "index.html"
+EDITOR_FRAGMENT_TEMPLATE_NAME = "_editor.html"
+BULK_FRAGMENT_TEMPLATE_NAME = "_bulk.html"
+COMPOSED_TEMPLATE_NAME = "composed.html"
+
+_environment = None
+_templates: Dict[str, Any] = {}
+_settings: Dict[str, Any] = {"bytecode_cache": None, "compiled_path": None}
+_lock = threading.Lock()
+
+
+def configure_templates(bytecode_cache: Any = None, compiled_path: Optional[str] = None):
+    """
+    Choose how templates are loaded. Call before the first render; it resets any environment already created.
+
+    Parameters:
+        bytecode_cache (Any): A ``jinja2.BytecodeCache``, or a folder path for a ``FileSystemBytecodeCache`` that
+            workers share so each template is compiled once per deployment instead of once per process.
+        compiled_path (Optional[str]): A folder or zip written by compile_templates. Its precompiled modules are
+            loaded without parsing any template source; templates missing from it fall back to the package.
+    """
+    global _environment
+    with _lock:
+        _settings.update(bytecode_cache=bytecode_cache, compiled_path=compiled_path)
+        _environment = None
+        _templates.clear()
+
+
+def _create_environment():
+    from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, ModuleLoader, PackageLoader
+
+    loader = PackageLoader("pydantic_web_editor")
+    compiled_path = _settings["compiled_path"] or os.environ.get(COMPILED_TEMPLATES_ENV)
+    if compiled_path:
+        loader = ChoiceLoader([ModuleLoader(compiled_path), loader])
+    bytecode_cache = _settings["bytecode_cache"] or os.environ.get(BYTECODE_CACHE_ENV)
+    if isinstance(bytecode_cache, str):
+        os.makedirs(bytecode_cache, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache)
+    return Environment(loader=loader, bytecode_cache=bytecode_cache)
+
+
+def get_environment():
+    """The package's Jinja environment, created on first use."""
+    global _environment
+    environment = _environment
+    if environment is None:
+        with _lock:
+            if _environment is None:
+                _environment = _create_environment()
+            environment = _environment
+    return environment
+
+
+def get_template(name: str):
+    """A package template by name, loaded and compiled once."""
+    try:
+        return _templates[name]
+    except KeyError:
+        pass
+    template = get_environment().get_template(name)
+    _templates[name] = template
+    return template
+
+
+def compile_templates(target: str, zip: Optional[str] = None) -> str:
+    """
+    Precompile the package templates into Python modules for ``configure_templates(compiled_path=target)``.
+
+    Parameters:
+        target (str): The folder, or zip file if ``zip`` is set, to write.
+        zip (Optional[str]): "deflated" or "stored" to write a zip archive instead of a folder.
+
+    Returns:
+        str: The target.
+    """
+    from jinja2 import Environment, PackageLoader
+
+    Environment(loader=PackageLoader("pydantic_web_editor")).compile_templates(target, zip=zip, ignore_errors=False)
+    return target
@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Tuple
+
+MAX_DEPTH = 32
+# Models reaching a shared model along many paths get a Control per path, which can grow exponentially with depth.
+MAX_ELEMENTS = 10_000
+COMBINATORS = ("allOf", "anyOf", "oneOf")
+
+
+def _unescape_pointer(part: str) -> str:
+    return part.replace("~1", "/").replace("~0", "~")
+
+
+class RefResolver:
+    """Resolves local ``#/...`` JSON pointers in a schema, memoizing every lookup."""
+
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self._cache: Dict[str, Any] = {}
+
+    def __call__(self, ref: str) -> Any:
+        try:
+            return self._cache[ref]
+        except KeyError:
+            pass
+        if not ref.startswith("#"):
+            raise ValueError(f"only local $refs can be resolved, got {ref!r}")
+        node = self.schema
+        for part in ref[1:].split("/")[1:]:
+            node = node[_unescape_pointer(part)]
+        self._cache[ref] = node
+        return node
+
+
+def parse_json_schema(schema, base_path="#", max_depth: int = MAX_DEPTH, max_elements: int = MAX_ELEMENTS):
+    """
+    Generate a JSON Forms VerticalLayout UI schema with a Control for every property in ``schema``.
+
+    The schema is walked iteratively. ``$ref``s may appear anywhere and are resolved once per schema, and ``allOf``,
+    ``anyOf`` and ``oneOf`` branches are walked under the same scope. A ``$ref`` is expanded into Controls wherever it
+    is used, except inside its own expansion: self references keep just their own Control, which JSON Forms renders
+    with the default layout, so recursive models terminate. Nesting deeper than ``max_depth`` is not expanded, and
+    once there are ``max_elements`` Controls no further ``$ref``s are.
+    """
+    resolve = RefResolver(schema)
+    elements = []
+    # Work items are ("control", scope, label) or ("node", node, scope, depth, refs being expanded).
+    stack: List[Tuple] = [("node", schema, base_path, 0, ())]
+
+    while stack:
+        item = stack.pop()
+        if item[0] == "control":
+            elements.append({"type": "Control", "scope": item[1], "label": item[2]})
+            continue
+        _, node, path, depth, expanding = item
+        if not isinstance(node, dict) or depth > max_depth:
+            continue
+        if "$ref" in node:
+            ref = node["$ref"]
+            if ref not in expanding and len(elements) < max_elements:
+                stack.append(("node", resolve(ref), path, depth, expanding + (ref,)))
+            continue
+
+        children = []
+        if "properties" in node:
+            for prop, value in node["properties"].items():
+                new_path = f"{path}/properties/{prop}"
+                children.append((("control", new_path, prop), ("node", value, new_path, depth + 1, expanding)))
+        elif isinstance(node.get("items"), dict):  # For arrays
+            children.append((None, ("node", node["items"], path, depth + 1, expanding)))
+        for combinator in COMBINATORS:
+            for branch in node.get(combinator, ()):
+                children.append((None, ("node", branch, path, depth, expanding)))
+
+        # Push in reverse so children pop in document order, each Control right before its property's subtree.
+        for control, child in reversed(children):
+            stack.append(child)
+            if control is not None:
+                stack.append(control)
+
+    return {
+        "type": "VerticalLayout",
+        "elements": elements
+    }
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from pydantic_web_editor import RENDER_CACHE, WebEditorConfig, WebEditorConfig2
+
+RENDERS = []
+
+
+class Ticket(BaseModel):
+    subject: str
+
+
+class CountingConfig(WebEditorConfig):
+    def render(self):
+        RENDERS.append(threading.current_thread().name)
+        return super().render()
+
+
+class CountingConfig2(WebEditorConfig2):
+    @property
+    def html(self):
+        RENDERS.append(threading.current_thread().name)
+        return super().html
+
+
+def test_concurrent_renders_are_coalesced():
+    RENDER_CACHE.cache_clear()
+    RENDERS.clear()
+
+    async def burst():
+        configs = [CountingConfig(title="Tickets", model=Ticket) for _ in range(10)]
+        return await asyncio.gather(*(config.html_async() for config in configs))
+
+    pages = asyncio.run(burst())
+    assert len(set(pages)) == 1
+    assert len(RENDERS) == 1
+    assert CountingConfig(title="Tickets", model=Ticket).html == pages[0]
+
+    RENDERS.clear()
+
+    async def burst2():
+        configs = [CountingConfig2(title="Tickets", model=Ticket) for _ in range(10)]
+        return await asyncio.gather(*(config.html_async() for config in configs))
+
+    pages = asyncio.run(burst2())
+    assert len(set(pages)) == 1
+    assert len(RENDERS) == 1
+    other = CountingConfig2(title="Other", model=Ticket)
+    assert CountingConfig2(title="Tickets", model=Ticket).cache_key != other.cache_key
+
+
+def test_render_runs_on_given_executor():
+    RENDER_CACHE.cache_clear()
+    RENDERS.clear()
+    with ThreadPoolExecutor(1, thread_name_prefix="editor-render") as executor:
+        config = CountingConfig(title="Tickets", model=Ticket, cache_render=False)
+        asyncio.run(config.html_async(executor=executor))
+    assert RENDERS[0].startswith("editor-render")
@@ -0,0 +1,63 @@
+import gzip
+
+from pydantic_web_editor.assets import StaticAssets, build_static_assets, parse_accept_encoding, sync_static_folder
+
+
+def test_build_fingerprints_and_precompresses(tmp_path):
+    (tmp_path / "bundle.js").write_text("console.log('hi');" * 100)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+    manifest = build_static_assets(str(tmp_path))
+
+    hashed = manifest["bundle.js"]
+    assert hashed.startswith("bundle.") and hashed != "bundle.js"
+    assert "logo.png" not in manifest
+    assert gzip.decompress((tmp_path / f"{hashed}.gz").read_bytes()) == (tmp_path / "bundle.js").read_bytes()
+
+    (tmp_path / "bundle.js").write_text("changed")
+    assert build_static_assets(str(tmp_path))["bundle.js"] != hashed
+    assert not (tmp_path / hashed).exists()
+
+
+def test_accept_encoding_preference():
+    assert parse_accept_encoding("gzip, deflate, br") == ["br", "gzip"]
+    assert parse_accept_encoding("br;q=0.5, gzip") == ["gzip", "br"]
+    assert parse_accept_encoding("br;q=0, identity") == []
+
+
+def test_wsgi_serves_precompressed_variant(tmp_path):
+    (tmp_path / "bundle.js").write_text("x" * 1000)
+    hashed = build_static_assets(str(tmp_path))["bundle.js"]
+    app = StaticAssets(str(tmp_path)).wsgi()
+    captured = {}
+
+    def start_response(status, headers):
+        captured["status"] = status
+        captured["headers"] = dict(headers)
+
+    environ = {"REQUEST_METHOD": "GET", "PATH_INFO": f"/{hashed}", "HTTP_ACCEPT_ENCODING": "gzip"}
+    body = b"".join(app(environ, start_response))
+    assert captured["status"] == "200 OK"
+    assert captured["headers"]["Content-Encoding"] == "gzip"
+    assert "immutable" in captured["headers"]["Cache-Control"]
+    assert gzip.decompress(body) == b"x" * 1000
+
+    app({"REQUEST_METHOD": "GET", "PATH_INFO": "/../secret"}, start_response)
+    assert captured["status"] == "404 Not Found"
+
+
+def test_sync_static_folder_is_incremental(tmp_path):
+    source, dest = tmp_path / "source", tmp_path / "dest"
+    (source / "js").mkdir(parents=True)
+    dest.mkdir()
+    (source / "bundle.js").write_text("one")
+    (source / "js" / "main.js").write_text("two")
+
+    assert sync_static_folder(str(source), str(dest)) == 2
+    assert sync_static_folder(str(source), str(dest)) == 0
+    assert (dest / "js" / "main.js").read_text() == "two"
+
+    (source / "bundle.js").write_text("three!")
+    assert sync_static_folder(str(source), str(dest), compare="hash") == 2
+    assert sync_static_folder(str(source), str(dest), compare="hash") == 0
+    assert (dest / "bundle.js").read_text() == "three!"
+    assert not [path for path in dest.iterdir() if path.name.startswith(".tmp-")]
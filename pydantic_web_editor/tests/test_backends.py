@@ -0,0 +1,107 @@
+import os
+import stat
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_web_editor import (
+    RENDER_CACHE,
+    SCHEMA_REGISTRY,
+    MemoryBackend,
+    RenderCache,
+    SQLiteBackend,
+    WebEditorConfig,
+    set_cache_backend,
+)
+from pydantic_web_editor.backends import default_cache_path
+
+
+class Invoice(BaseModel):
+    number: int
+    customer: str
+
+
+def test_render_cache_falls_through_to_backend():
+    backend = MemoryBackend()
+    first, second = RenderCache(backend=backend), RenderCache(backend=backend)
+    key = WebEditorConfig(title="Invoice", model=Invoice).cache_key
+    first.set(key, "<html>")
+    assert second.get(key) == "<html>" and len(second) == 1
+    # Invalidating in one process drops the shared copy too.
+    assert second.invalidate(Invoice) == 1
+    first.cache_clear()
+    assert first.get(key) is None
+
+
+def test_sqlite_backend_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    set_cache_backend(SQLiteBackend(path, version="1"))
+    try:
+        RENDER_CACHE.invalidate(Invoice)
+        SCHEMA_REGISTRY.invalidate(Invoice)
+        html = WebEditorConfig(title="Invoice", model=Invoice).html
+    finally:
+        set_cache_backend(None)
+
+    # Another worker reads the page and schema without rendering or generating them.
+    code = textwrap.dedent(
+        f"""
+        import sys
+        sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))!r})
+        from {Invoice.__module__} import Invoice
+        from pydantic_web_editor import RENDER_CACHE, SQLiteBackend, WebEditorConfig, set_cache_backend
+        import pydantic_web_editor.schema_registry as registry
+        registry.build_json_schema = None
+        set_cache_backend(SQLiteBackend({path!r}, version="1"))
+        sys.stdout.write(WebEditorConfig(title="Invoice", model=Invoice).html)
+        assert RENDER_CACHE.cache_info().hits == 1
+        """
+    )
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    assert result.stdout == html
+
+    # A new generation empties the store for everyone.
+    key = RENDER_CACHE.shared_key(WebEditorConfig(title="Invoice", model=Invoice).cache_key)
+    old, new = SQLiteBackend(path, version="1"), SQLiteBackend(path, version="2")
+    assert new.get(key) is None
+    # Workers still on the old release keep writing during a rolling deploy, but only for each other.
+    old.set(key, "old page")
+    new.set(key, "new page")
+    assert old.get(key) == "old page" and new.get(key) == "new page"
+    assert new.delete_prefix("page:") == 1 and old.get(key) == "old page"
+
+
+def test_pages_with_start_val_stay_out_of_the_backend():
+    backend = MemoryBackend()
+    set_cache_backend(backend)
+    try:
+        RENDER_CACHE.invalidate(Invoice)
+        WebEditorConfig(title="Invoice", model=Invoice, start_val={"number": 1, "customer": "Ada"}).html
+        assert list(backend._entries) == []
+        WebEditorConfig(title="Invoice", model=Invoice).html
+        shared = WebEditorConfig(title="Invoice", model=Invoice, start_val={"number": 2}, share_start_val=True)
+        shared.html
+        assert sum(key.startswith("page:") for key in backend._entries) == 2
+        assert backend.get(RENDER_CACHE.shared_key(shared.cache_key)) == shared.html
+    finally:
+        set_cache_backend(None)
+        RENDER_CACHE.invalidate(Invoice)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_sqlite_backend_is_private(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    backend = SQLiteBackend()
+    assert backend.path == default_cache_path() == str(tmp_path / "cache" / "pydantic_web_editor" / "cache.sqlite")
+    assert stat.S_IMODE(os.stat(os.path.dirname(backend.path)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(backend.path).st_mode) == 0o600
+
+    # A file someone else created first could hold their pages, so it is refused.
+    planted = tmp_path / "planted.sqlite"
+    planted.write_bytes(b"")
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(planted).st_uid + 1)
+    with pytest.raises(PermissionError):
+        SQLiteBackend(str(planted))
@@ -0,0 +1,110 @@
+import importlib
+import json
+import os
+import tracemalloc
+
+import pytest
+from benchmarks.harness import Request, call_wsgi, example_mix, main, report, run_load
+from benchmarks.models import deep_model, union_model, wide_model
+from benchmarks.timing import measure
+from pydantic import BaseModel
+
+from pydantic_web_editor import StaticAssets, SubmissionHandler, WebEditorConfig
+
+
+class Student(BaseModel):
+    name: str
+
+
+EDITOR = WebEditorConfig(title="Students", model=Student).compile()
+SAVE = SubmissionHandler(Student)
+
+
+def example_app(environ, start_response):
+    """A WSGI stand-in for the example apps' page, static and /save routes."""
+    path = environ["PATH_INFO"]
+    if path == "/save":
+        body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"]))
+        status, headers, body = SAVE(body, environ.get("CONTENT_TYPE"))
+        start_response(f"{status} -", list(headers.items()))
+        return [body]
+    start_response("200 OK", [("Content-Type", "text/html")])
+    return [EDITOR.render().encode() if path == "/" else b"bundle"]
+
+
+TRACING = []
+
+
+def tracing_app(environ, start_response):
+    TRACING.append(tracemalloc.is_tracing())
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"ok"]
+
+
+def test_synthetic_models_grow():
+    assert len(wide_model(50).model_fields) == 50
+    assert "$defs" in deep_model(5).model_json_schema()
+    assert "anyOf" in str(union_model(4).model_json_schema())
+
+
+def test_harness_drives_wsgi_and_asgi(tmp_path):
+    (tmp_path / "bundle.js").write_text("x")
+    assets = StaticAssets(str(tmp_path))
+    requests = [Request.parse("GET /bundle.js"), Request.parse("GET /missing.js")] * 5
+    for app in (assets.wsgi(), assets.asgi()):
+        rows = report(*run_load(app, requests, concurrency=3))
+        assert rows[-1]["request"] == "all"
+        assert rows[-1]["statuses"] == "200x5 404x5"
+
+
+def test_timed_runs_are_not_traced():
+    tracing = []
+    result = measure(lambda: tracing.append(tracemalloc.is_tracing()), repeat=5)
+    assert tracing == [False] * 5 + [True] and result["runs"] == 5
+
+    def app(environ, start_response):
+        tracing.append(tracemalloc.is_tracing())
+        start_response("200 OK", [])
+        return [bytes(100_000)]
+
+    tracing.clear()
+    results, _, peak = run_load(app, [Request.parse("GET /")] * 4, concurrency=2)
+    assert len(results) == 4 and tracing == [False] * 4 + [True] * 4 and peak >= 100_000
+
+
+def test_example_mix_profiles_and_compares(tmp_path, capsys):
+    argv = ["tests.test_benchmarks:example_app", "--mix", "example", "--payload", '{"name": "Ada"}', "--requests", "20"]
+    argv += ["--concurrency", "2", "--warmup", "1", "--profile-runs", "3"]
+    result = main(argv + ["--profile", str(tmp_path / "profiles"), "--json", str(tmp_path / "base.json")])
+    assert {row["request"]: row["statuses"] for row in result["load"]}["POST /save"] == "200x2"
+    assert set(result["profiles"]) == {"GET /", "GET /static/bundle.js", "GET /static/bundle.css", "POST /save"}
+    assert result["profiles"]["GET /"]["top_functions"]
+    assert (tmp_path / "profiles" / "post_save.prof").exists()
+    stacks = (tmp_path / "profiles" / "load.collapsed").read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    assert json.loads((tmp_path / "base.json").read_text())["meta"]["requests"] == 20
+
+    main(argv + ["--baseline", str(tmp_path / "base.json")])
+    assert "change_pct" in capsys.readouterr().out
+
+
+def test_harness_drives_flask_example(monkeypatch):
+    pytest.importorskip("flask")
+    monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), "..", ".."))
+    app = importlib.import_module("examples.flask_example").app
+    mix = example_mix(json.dumps({"name": "Ada", "classes": ["math"], "hobby": "sports"}))
+    rows = report(*run_load(app, mix * 2, concurrency=2))
+    assert {row["request"]: row["statuses"] for row in rows}["all"] == "200x20"
+    page = app.test_client().get("/").get_data(as_text=True)
+    assert "htmx.ajax(\"POST\", '/save'" in page and "verbatim" not in page
+    invalid = call_wsgi(app, Request.parse('POST /save payload={"name": "Ada"}'))
+    assert invalid.status == 422
+
+
+def test_main_times_untraced(tmp_path):
+    TRACING.clear()
+    argv = ["tests.test_benchmarks:tracing_app", "--requests", "6", "--warmup", "2", "--concurrency", "2"]
+    result = main(argv + ["--profile", str(tmp_path), "--profile-runs", "1"])
+    # Warm up, timed, memory traced and sampled runs, then the profile's three passes over the single request.
+    assert TRACING == [False] * 8 + [True] * 6 + [False] * 6 + [False, True, False]
+    assert result["load"][-1]["runs"] == 6 and result["load"][-1]["peak_kib"] > 0
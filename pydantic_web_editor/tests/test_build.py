@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+
+from pydantic_web_editor import LoadStaticType, WebEditorConfig
+from pydantic_web_editor.__main__ import main
+from pydantic_web_editor.build import build_site
+
+
+class Survey(BaseModel):
+    question: str
+
+
+def test_build_site_writes_pages_and_skips_unchanged(tmp_path):
+    config = WebEditorConfig(title="Survey", model=Survey, load_static=LoadStaticType.BUNDLED)
+    results = build_site({"survey": config}, str(tmp_path))
+    assert [result.skipped for result in results] == [False]
+
+    html = (tmp_path / "survey" / "index.html").read_text()
+    manifest = (tmp_path / "static" / "manifest.json").read_text()
+    assert "/static/bundle." in html and html.split("/static/")[1].split('"')[0] in manifest
+    assert (tmp_path / "schemas" / "Survey.json").exists()
+
+    assert [result.skipped for result in build_site({"survey": config}, str(tmp_path))] == [True]
+    changed = config.model_copy(update={"title": "Survey v2"})
+    assert [result.skipped for result in build_site({"survey": changed}, str(tmp_path))] == [False]
+
+
+def test_cli_collects_module_configs(tmp_path, monkeypatch, capsys):
+    (tmp_path / "cli_forms.py").write_text(
+        "from pydantic import BaseModel\n"
+        "from pydantic_web_editor import WebEditorConfig\n"
+        "class Vote(BaseModel):\n    choice: str\n"
+        "vote_form = WebEditorConfig(title='Vote', model=Vote)\n"
+    )
+    main(["build", "cli_forms", "--path", str(tmp_path), "-o", str(tmp_path / "site")])
+    assert "built  vote-form" in capsys.readouterr().out
+    assert (tmp_path / "site" / "vote-form" / "index.html").exists()
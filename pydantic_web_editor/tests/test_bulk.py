@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from pydantic_web_editor import BulkHandler, ListBulkStore, LoadStaticType, WebEditorConfig, package_static_path
+
+
+class Row(BaseModel):
+    sku: str
+    quantity: int
+    tags: list[str] = []
+
+
+def make_config(**kwargs):
+    return WebEditorConfig(
+        title="Stock", model=Row, bulk_url="/rows", load_static=LoadStaticType.BUNDLED, cache_render=False, **kwargs
+    )
+
+
+def post(handler, rows):
+    status, _, body = handler(json.dumps({"rows": rows}).encode(), "application/json")
+    return status, json.loads(body)
+
+
+def test_bulk_handler_pages_through_the_store():
+    store = ListBulkStore([Row(sku=f"s{i}", quantity=i) for i in range(120)])
+    handler = BulkHandler(Row, store, max_page_size=30)
+    status, _, body = handler.page_from_query("offset=100&limit=50")
+    page = json.loads(body)
+    assert status == 200 and page["total"] == 120 and page["offset"] == 100
+    assert [item["id"] for item in page["items"]] == list(range(100, 120))[:20]
+    assert page["items"][0]["value"] == {"sku": "s100", "quantity": 100, "tags": []}
+    assert len(json.loads(handler.page(0, 50).body)["items"]) == 30
+    assert handler.page_from_query("offset=x").status == 400
+
+
+def test_bulk_handler_validates_and_saves_only_edited_rows(monkeypatch):
+    items = [Row(sku=f"s{i}", quantity=i) for i in range(10)]
+    saved = []
+    handler = BulkHandler(Row, ListBulkStore(items), on_valid=lambda rows: saved.append(rows) or len(rows))
+    validated = []
+    validate = handler.validate
+    monkeypatch.setattr(handler, "validate", lambda ids, values: validated.append(ids) or validate(ids, values))
+
+    status, body = post(handler, [{"id": 3, "value": {"sku": "s3", "quantity": 30}}])
+    assert status == 200 and body == {"valid": True, "count": 1, "result": 1}
+    assert validated == [[3]] and items[3].quantity == 30 and items[4].quantity == 4
+
+    status, body = post(
+        handler,
+        [{"id": 1, "value": {"sku": "s1", "quantity": 1}}, {"id": 7, "value": {"sku": "s7", "quantity": "many"}}],
+    )
+    assert status == 422 and [error["id"] for error in body["errors"]] == [7]
+    assert len(saved) == 1
+
+    status, body = post(handler, [{"id": 99, "value": {"sku": "x", "quantity": 1}}])
+    assert status == 404 and body["errors"][0]["id"] == 99
+    assert handler(b"[]", "application/json").status == 400
+
+
+def test_bulk_render_initializes_the_bulk_editor():
+    html = make_config().html
+    assert "new PydanticBulkEditor" in html and 'url: "/rows"' in html
+    assert 'columns: ["sku","quantity"]' in html and "htmx.ajax" not in html
+    assert "PydanticBulkEditor" in make_config().render_fragment()
+    assert "PydanticBulkEditor" not in WebEditorConfig(title="Stock", model=Row, cache_render=False).html
+    # The bulk editor ships as its own script, defining the global the page calls.
+    assert '<script src="/static/bulk_editor.js"></script>' in html
+    with open(os.path.join(package_static_path(), "bulk_editor.js")) as f:
+        assert "window.PydanticBulkEditor = BulkEditor;" in f.read()
+    with pytest.raises(ValidationError):
+        WebEditorConfig(title="Stock", model=Row, bulk_url="/rows")
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+
+from pydantic_web_editor import RENDER_CACHE, RenderCache, WebEditorConfig
+
+
+class Pet(BaseModel):
+    name: str
+
+
+class Owner(BaseModel):
+    name: str
+
+
+def test_identical_configs_hit_cache():
+    RENDER_CACHE.cache_clear()
+    first = WebEditorConfig(title="Pets", model=Pet).html
+    second = WebEditorConfig(title="Pets", model=Pet).html
+    assert first == second
+    assert RENDER_CACHE.cache_info().hits == 1
+    assert RENDER_CACHE.cache_info().misses == 1
+
+    WebEditorConfig(title="Other title", model=Pet).html
+    assert RENDER_CACHE.cache_info().misses == 2
+
+
+def test_lru_eviction_and_invalidation():
+    cache = RenderCache(maxsize=2)
+    cache.set((Pet, "a"), "a")
+    cache.set((Owner, "b"), "b")
+    assert cache.get((Pet, "a")) == "a"
+    cache.set((Pet, "c"), "c")
+    assert (Owner, "b") not in cache
+    assert cache.invalidate(Pet) == 2
+    assert len(cache) == 0
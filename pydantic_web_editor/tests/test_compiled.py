@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_web_editor import (
+    JSON_EDITOR_CONFIG_DEFAULT,
+    Button,
+    CompiledEditor,
+    LoadStaticType,
+    SaveMode,
+    WebEditorConfig,
+)
+
+
+class Ticket(BaseModel):
+    subject: str
+    priority: int = 3
+
+
+def make_config(**kwargs):
+    buttons = [Button(id="save", path="save", save_mode=SaveMode.PATCH)]
+    return WebEditorConfig(title="Ticket", model=Ticket, buttons=buttons, cache_render=False, **kwargs)
+
+
+def test_compiled_render_matches_a_fresh_config():
+    editor = make_config().compile()
+    assert isinstance(editor, CompiledEditor) and editor.html == make_config().html
+    start_val = {"subject": "</script><b>", "priority": 1}
+    expected = make_config(start_val=start_val, start_version="v2").model_copy(update={"title": "Ticket 7"}).html
+    assert editor.render(start_val=start_val, title="Ticket 7", start_version="v2") == expected
+    assert editor.render(start_val=Ticket(subject="x")) == make_config(start_val=Ticket(subject="x")).html
+    ssr = make_config(server_render=True, load_static=LoadStaticType.BUNDLED)
+    assert ssr.compile().render(start_val=start_val) == ssr.model_copy(update={"start_val": start_val}).html
+
+
+def test_compiled_render_is_thread_safe():
+    editor = make_config().compile()
+    values = [{"subject": f"s{i}"} for i in range(200)]
+    with ThreadPoolExecutor(8) as pool:
+        pages = list(pool.map(lambda value: editor.render(start_val=value), values))
+    assert all('"startval":{"subject":"s%d"}' % i in page for i, page in enumerate(pages))
+
+
+def test_default_editor_options_are_not_shared():
+    config = make_config()
+    config.json_editor_config["theme"] = "changed"
+    assert "theme" not in JSON_EDITOR_CONFIG_DEFAULT and "theme" not in make_config().json_editor_config
+    with pytest.raises(TypeError):
+        JSON_EDITOR_CONFIG_DEFAULT["theme"] = "changed"
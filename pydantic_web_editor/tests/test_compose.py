@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+
+from pydantic_web_editor import WebEditorConfig, compose_page
+from pydantic_web_editor.compose import merge_defs
+
+
+class Money(BaseModel):
+    amount: float
+    currency: str
+
+
+class Invoice(BaseModel):
+    total: Money
+
+
+class Refund(BaseModel):
+    refunded: Money
+
+
+def test_merge_defs_dedupes_and_renames_conflicts():
+    other_money = {"properties": {"cents": {"type": "integer"}}, "type": "object"}
+    conflicting = {"$defs": {"Money": other_money}, "properties": {"m": {"$ref": "#/$defs/Money"}}}
+    roots, shared = merge_defs([Invoice.model_json_schema(), Refund.model_json_schema(), conflicting])
+    assert sorted(shared) == ["Money", "Money_2"]
+    assert shared["Money_2"] == other_money
+    assert roots[2]["properties"]["m"]["$ref"] == "#/$defs/Money_2"
+    assert all("$defs" not in root for root in roots)
+
+
+
+def test_merge_defs_renames_definitions_referencing_renamed_ones():
+    line = {"properties": {"price": {"$ref": "#/$defs/Money"}}, "type": "object"}
+    other_money = {"properties": {"cents": {"type": "integer"}}, "type": "object"}
+    first = {"$defs": {"Line": line, "Money": Money.model_json_schema()}, "properties": {"l": {"$ref": "#/$defs/Line"}}}
+    second = {"$defs": {"Line": line, "Money": other_money}, "properties": {"l": {"$ref": "#/$defs/Line"}}}
+    roots, shared = merge_defs([first, second])
+    # Line is spelled the same in both, but the second one's Money differs, so its Line does too.
+    assert sorted(shared) == ["Line", "Line_2", "Money", "Money_2"]
+    assert roots[1]["properties"]["l"]["$ref"] == "#/$defs/Line_2"
+    assert shared["Line_2"]["properties"]["price"]["$ref"] == "#/$defs/Money_2"
+    assert shared["Line"]["properties"]["price"]["$ref"] == "#/$defs/Money"
+    assert merge_defs([first, first])[1].keys() == {"Line", "Money"}
+
+
+def test_compose_page_loads_assets_once_with_unique_ids():
+    html = compose_page([WebEditorConfig(title="Invoice", model=Invoice), WebEditorConfig(title="Refund", model=Refund)])
+    assert html.count("jsoneditor.min.js") == 1
+    assert html.count('"currency":') == 1
+    assert "id='pydantic_web_editor'" in html and "id='pydantic_web_editor_1'" in html
+    assert html.count('options.schema["$defs"] = window.PYDANTIC_WEB_EDITOR_DEFS') == 2
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_web_editor import WebEditorConfig, dumps_html_safe, orjson_dumps, set_json_encoder, stdlib_dumps
+
+
+class Note(BaseModel):
+    title: str = "Tom & Jerry </script>"
+    body: str = "caf\u00e9\u2028"
+
+
+VALUE = {"title": "<b>'hi'</b>", "nested": [1, 2.5, None, True, {"k": "caf\u00e9"}]}
+
+
+def test_encoders_emit_the_same_minified_html_safe_json():
+    pytest.importorskip("orjson")
+    assert orjson_dumps(VALUE) == stdlib_dumps(VALUE)
+    safe = dumps_html_safe(VALUE)
+    assert " " not in safe and "<" not in safe and "'" not in safe
+    assert json.loads(safe) == VALUE
+
+
+def test_custom_encoder_and_model_start_val():
+    calls = []
+
+    def encoder(value):
+        calls.append(value)
+        return stdlib_dumps(value)
+
+    set_json_encoder(encoder)
+    try:
+        html = WebEditorConfig(title="Note", model=Note, start_val=Note(), cache_render=False).html
+    finally:
+        set_json_encoder(None)
+    assert calls and Note() not in calls
+    assert '"startval":{"title":"Tom \\u0026 Jerry \\u003c/script\\u003e","body":"caf\u00e9\\u2028"}' in html
@@ -0,0 +1,102 @@
+import dataclasses
+import hashlib
+import importlib
+import sys
+import textwrap
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+from pydantic_web_editor import RENDER_CACHE, SCHEMA_REGISTRY, ReloadWatcher, WebEditorConfig, model_fingerprint
+
+
+def make_models(default=1, limit=10):
+    class Part(BaseModel):
+        size: int = default
+        label: str = Field("", max_length=limit)
+
+    class Assembly(BaseModel):
+        parts: List[Part] = []
+        parent: Optional["Assembly"] = None
+
+    return Part, Assembly
+
+
+def test_fingerprint_is_structural():
+    part, assembly = make_models()
+    same_part, same_assembly = make_models()
+    assert model_fingerprint(part) == model_fingerprint(same_part)
+    assert model_fingerprint(assembly) == model_fingerprint(same_assembly)
+    # A changed default or constraint changes the model and every model nesting it.
+    for changed in (make_models(default=2), make_models(limit=20)):
+        assert model_fingerprint(changed[0]) != model_fingerprint(part)
+        assert model_fingerprint(changed[1]) != model_fingerprint(assembly)
+    assert model_fingerprint(TypeAdapter(List[part])) == model_fingerprint(TypeAdapter(List[same_part]))
+    entry = SCHEMA_REGISTRY.get(part)
+    assert entry.etag == '"%s"' % hashlib.sha256(entry.json.encode("utf-8")).hexdigest()
+
+
+def make_described(examples, extra_field=False):
+    @dataclasses.dataclass
+    class Point:
+        x: int
+
+    if extra_field:
+
+        @dataclasses.dataclass
+        class Point:
+            x: int
+            y: int = 0
+
+    class Shape(BaseModel):
+        sides: int = Field(3, examples=examples)
+        origin: Optional[Point] = None
+
+    return Shape
+
+
+def test_fingerprint_covers_examples_and_nested_dataclasses():
+    shape = make_described([1])
+    assert model_fingerprint(make_described([1])) == model_fingerprint(shape)
+    for changed in (make_described([2]), make_described([1], extra_field=True)):
+        assert changed.model_json_schema() != shape.model_json_schema()
+        assert model_fingerprint(changed) != model_fingerprint(shape)
+
+
+def write_module(path, default):
+    path.write_text(
+        textwrap.dedent(
+            f"""
+            from pydantic import BaseModel
+
+            class Widget(BaseModel):
+                size: int = {default}
+            """
+        )
+    )
+
+
+def test_reload_watcher_evicts_only_reloaded_modules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    write_module(tmp_path / "reloaded_models.py", 1)
+    write_module(tmp_path / "kept_models.py", 1)
+    reloaded, kept = importlib.import_module("reloaded_models"), importlib.import_module("kept_models")
+    try:
+        for module in (reloaded, kept):
+            WebEditorConfig(title="Widget", model=module.Widget).html
+        old_widget, old_fingerprint = reloaded.Widget, model_fingerprint(reloaded.Widget)
+        watcher = ReloadWatcher()
+        assert watcher.check() == {}
+
+        write_module(tmp_path / "reloaded_models.py", 22)  # a different size, so the stale .pyc is not reused
+        importlib.invalidate_caches()
+        importlib.reload(reloaded)
+        assert model_fingerprint(reloaded.Widget) != old_fingerprint
+        assert watcher.check() == {"reloaded_models": [old_widget]}
+        assert old_widget not in RENDER_CACHE.models() and old_widget not in SCHEMA_REGISTRY
+        assert kept.Widget in RENDER_CACHE.models() and kept.Widget in SCHEMA_REGISTRY
+    finally:
+        for name in ("reloaded_models", "kept_models"):
+            sys.modules.pop(name, None)
+        RENDER_CACHE.invalidate(kept.Widget)
+        SCHEMA_REGISTRY.invalidate(kept.Widget)
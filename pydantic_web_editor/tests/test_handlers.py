@@ -0,0 +1,36 @@
+import json
+
+from pydantic import BaseModel
+
+from pydantic_web_editor import LoadSchemaType, SchemaHandler, WebEditorConfig, schema_response
+
+
+class Invoice(BaseModel):
+    number: int
+    customer: str
+
+
+def test_schema_response_etag_and_304():
+    response = schema_response(Invoice)
+    assert response.status == 200
+    assert response.headers["Cache-Control"].endswith("immutable")
+    assert json.loads(response.body) == Invoice.model_json_schema()
+
+    etag = response.headers["ETag"]
+    assert schema_response(Invoice, if_none_match=etag).status == 304
+    assert schema_response(Invoice, if_none_match=f'"stale", W/{etag}').status == 304
+    assert schema_response(Invoice, if_none_match='"stale"').status == 200
+
+
+def test_handler_lookup_by_name():
+    handler = SchemaHandler([Invoice])
+    assert handler("Invoice.json").status == 200
+    assert handler("Missing.json").status == 404
+
+
+def test_url_mode_page_does_not_inline_schema():
+    config = WebEditorConfig(title="Invoices", model=Invoice, load_schema=LoadSchemaType.URL, cache_render=False)
+    html = config.html
+    assert config.schema_url.startswith("/schemas/Invoice.json?v=")
+    assert config.schema_url in html
+    assert '"customer"' not in html
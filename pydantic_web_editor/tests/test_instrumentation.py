@@ -0,0 +1,54 @@
+from pydantic import BaseModel, Field
+
+from pydantic_web_editor import (
+    RENDER_CACHE,
+    SCHEMA_REGISTRY,
+    CallbackObserver,
+    SubmissionHandler,
+    WebEditorConfig,
+    set_observer,
+)
+from pydantic_web_editor.instrumentation import (
+    RENDER_BYTES,
+    RENDER_CACHE_HIT,
+    RENDER_CACHE_MISS,
+    SCHEMA_BUILD,
+    SCHEMA_BYTES,
+    SUBMISSION_VALIDATE,
+    TEMPLATE_RENDER,
+    timed,
+)
+
+
+class Sensor(BaseModel):
+    name: str = Field(description="Température du capteur")
+    reading: float
+
+
+def test_observer_receives_render_schema_and_validation_metrics():
+    events = []
+    set_observer(CallbackObserver(events.append))
+    try:
+        SCHEMA_REGISTRY.invalidate(Sensor)
+        RENDER_CACHE.invalidate(Sensor)
+        html = WebEditorConfig(title="Sensor", model=Sensor).html
+        WebEditorConfig(title="Sensor", model=Sensor).html
+        SubmissionHandler(Sensor)(b'{"name": "a", "reading": 1}', "application/json")
+    finally:
+        set_observer(None)
+
+    by_name = {}
+    for event in events:
+        by_name.setdefault(event.name, []).append(event)
+    assert by_name[SCHEMA_BUILD][0].kind == "timing"
+    schema_json = SCHEMA_REGISTRY.schema_json(Sensor)
+    assert by_name[SCHEMA_BYTES][0].value == len(schema_json.encode("utf-8")) > len(schema_json)
+    assert by_name[TEMPLATE_RENDER][0].tags == {"model": Sensor, "template": "page"}
+    assert by_name[RENDER_BYTES][0].value == len(html.encode("utf-8"))
+    assert len(by_name[RENDER_CACHE_MISS]) == 1
+    assert len(by_name[RENDER_CACHE_HIT]) == 1
+    assert by_name[SUBMISSION_VALIDATE][0].value >= 0
+
+
+def test_disabled_observer_is_a_shared_noop():
+    assert timed(SCHEMA_BUILD, model=Sensor) is timed(TEMPLATE_RENDER)
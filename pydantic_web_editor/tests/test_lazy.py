@@ -0,0 +1,45 @@
+import json
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from pydantic_web_editor import LoadSchemaType, SchemaHandler, WebEditorConfig, lazy_root_entry
+
+
+class Tag(BaseModel):
+    label: str
+
+
+class Section(BaseModel):
+    heading: str
+    tags: List[Tag] = []
+    subsections: List["Section"] = []
+
+
+class Page(BaseModel):
+    title: str
+    body: Optional[Section] = None
+
+
+def test_root_has_no_defs_and_refs_point_at_urls():
+    root = lazy_root_entry(Page, "schemas").schema
+    assert "$defs" not in root
+    ref = root["properties"]["body"]["anyOf"][0]["$ref"]
+    assert ref.startswith("/schemas/Page/defs/Section.json?v=")
+    assert "$defs" in Page.model_json_schema()
+
+
+def test_defs_are_served_individually_with_rewritten_refs():
+    handler = SchemaHandler([Page])
+    response = handler("Page/defs/Section.json")
+    assert response.status == 200
+    section = json.loads(response.body)
+    assert section["properties"]["subsections"]["items"]["$ref"].startswith("/schemas/Page/defs/Section.json?v=")
+    assert handler("Page/defs/Section.json", if_none_match=response.headers["ETag"]).status == 304
+    assert handler("Page/defs/Missing.json").status == 404
+
+
+def test_lazy_page_enables_ajax_loader():
+    html = WebEditorConfig(title="Pages", model=Page, load_schema=LoadSchemaType.LAZY, cache_render=False).html
+    assert "options.ajax = true" in html
+    assert '"heading"' not in html
@@ -0,0 +1,86 @@
+from enum import Enum
+from typing import List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from pydantic_web_editor import (
+    WebEditorConfig,
+    WebEditorConfig2,
+    optimize_json_schema,
+    optimized_schema_entry,
+    schema_size_report,
+)
+from pydantic_web_editor.optimize import _iter_slots, _ref_name
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Shade(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Address(BaseModel):
+    street: str = Field(description="Street and house number, as printed on letters sent to this address")
+    city: str = Field(description="City or town, spelled the way the local post office spells it")
+    postcode: Optional[str] = Field(None, max_length=10)
+
+
+class Cat(BaseModel):
+    kind: Literal["cat"] = "cat"
+
+
+class Dog(BaseModel):
+    kind: Literal["dog"] = "dog"
+
+
+class Person(BaseModel):
+    nickname: Optional[str] = Field(None, max_length=5)
+    home: Address
+    work: Optional[Address] = None
+    color: Color
+    shade: Optional[Shade] = None
+    pet: Union[Cat, Dog] = Field(discriminator="kind")
+    children: List["Person"] = []
+
+
+def test_optimizer_rewrites_without_dangling_refs():
+    original = Person.model_json_schema()
+    optimized = optimize_json_schema(original)
+    assert original == Person.model_json_schema()
+
+    # Person references itself, so it stays a definition the root points at.
+    defs = optimized["$defs"]
+    assert optimized["$ref"] == "#/$defs/Person"
+    person = defs["Person"]["properties"]
+    assert person["children"]["items"] == {"$ref": "#/$defs/Person"}
+    # Shade had the same values as Color, its references now point at Color and keep their own label.
+    assert "Shade" not in defs and person["shade"]["anyOf"][0] == {"$ref": "#/$defs/Color", "title": "Shade"}
+    # Cat and Dog were used once each and are inlined, the discriminator json-editor ignores is gone.
+    assert "discriminator" not in person["pet"] and "Cat" not in defs
+    assert [branch["title"] for branch in person["pet"]["oneOf"]] == ["Cat", "Dog"]
+    assert person["nickname"]["type"] == ["string", "null"]
+    for container, key in _iter_slots(optimized):
+        name = _ref_name(container[key])
+        assert name is None or name in defs
+
+
+def test_repeated_subtrees_are_shared_and_configs_embed_the_optimized_schema():
+    schema = {
+        "type": "object",
+        "properties": {
+            "a": {"type": "object", "properties": Address.model_json_schema()["properties"]},
+            "b": {"type": "object", "properties": Address.model_json_schema()["properties"]},
+        },
+    }
+    optimized = optimize_json_schema(schema)
+    assert optimized["properties"]["a"] == optimized["properties"]["b"] == {"$ref": "#/$defs/Shared"}
+
+    report = schema_size_report(Person)
+    assert 0 < report.optimized_bytes < report.original_bytes and report.saved_bytes > 0
+    assert optimized_schema_entry(Person) is optimized_schema_entry(Person)
+    assert optimized_schema_entry(Person).json in WebEditorConfig(title="P", model=Person, optimize_schema=True).html
+    assert optimized_schema_entry(Person).json in WebEditorConfig2(title="P", model=Person, optimize_schema=True).html
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import ForeignKey, String, create_engine, event, select  # noqa: E402
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, sessionmaker  # noqa: E402
+
+from pydantic_web_editor import (  # noqa: E402
+    BulkHandler,
+    OrmBulkStore,
+    SCHEMA_REGISTRY,
+    load_row,
+    load_rows,
+    orm_model,
+    upsert_rows,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "customers"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+    notes: Mapped[str] = mapped_column(default="")
+    status: Mapped[str] = mapped_column(server_default="active")
+    orders: Mapped[list["Order"]] = relationship(back_populates="customer")
+
+
+class Order(Base):
+    __tablename__ = "orders"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"))
+    total: Mapped[float]
+    customer: Mapped[Customer] = relationship(back_populates="orders")
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'orm.sqlite'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(engine)
+    with Session() as session:
+        for i in range(20):
+            session.add(Customer(id=i + 1, name=f"c{i}", orders=[Order(total=i), Order(total=i * 2)]))
+        session.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return Session, statements
+
+
+def test_orm_model_is_cached_per_table_and_selection():
+    model = orm_model(Customer, relationships=[("orders", ["id", "total"])])
+    assert model is orm_model(Customer, relationships=[("orders", ("id", "total"))])
+    assert model is not orm_model(Customer) and orm_model(Customer) is orm_model(Customer)
+    assert SCHEMA_REGISTRY.schema(model) is SCHEMA_REGISTRY.schema(model)
+    schema = SCHEMA_REGISTRY.schema(model)
+    assert schema["title"] == "Customer" and schema["required"] == ["name"]
+    assert schema["properties"]["status"]["default"] is None
+    (order,) = schema["$defs"].values()
+    assert order["title"] == "Order" and set(order["properties"]) == {"id", "total"}
+
+
+def test_load_rows_prunes_columns_and_batches_relationships(sessions):
+    Session, statements = sessions
+    model = orm_model(Customer, ["id", "name"], relationships=[("orders", ["id", "total"])])
+    with Session() as session:
+        rows = load_rows(session, model, select(Customer).where(Customer.id <= 15))
+        assert load_row(session, orm_model(Customer, ["id", "name"]), 3).name == "c2"
+    assert len(rows) == 15 and [order.total for order in rows[4].orders] == [4, 8]
+    # One query for the customers, one batched query for all their orders, one for load_row.
+    assert len(statements) == 3
+    assert "notes" not in statements[0] and "customer_id" in statements[1] and " IN " in statements[1]
+
+
+def test_upsert_rows_and_bulk_store(sessions):
+    Session, statements = sessions
+    model = orm_model(Customer, ["id", "name"])
+    with Session() as session:
+        assert upsert_rows(session, model, [model(id=1, name="renamed"), {"name": "new"}]) == 2
+        session.commit()
+        assert session.get(Customer, 1).name == "renamed" and session.get(Customer, 1).notes == ""
+        assert session.scalar(select(Customer).where(Customer.name == "new")).id == 21
+
+        # Server defaults are left to the database on insert and kept on update, not overwritten with NULL.
+        full = orm_model(Customer)
+        assert upsert_rows(session, full, [full(name="defaulted"), {"id": 2, "name": "kept", "status": None}]) == 2
+        session.commit()
+        assert session.scalar(select(Customer.status).where(Customer.name == "defaulted")) == "active"
+        session.execute(sqlalchemy.update(Customer).where(Customer.id == 3).values(status="closed"))
+        upsert_rows(session, full, [full(id=3, name="c2")])
+        session.commit()
+        assert session.get(Customer, 3).status == "closed"
+
+    handler = BulkHandler(model, OrmBulkStore(Session, model))
+    page = json.loads(handler.page(18, 10).body)
+    assert page["total"] == 22 and [item["id"] for item in page["items"]] == [19, 20, 21, 22]
+    status, _, body = handler(json.dumps({"rows": [{"id": 19, "value": {"name": "edited"}}]}).encode())
+    assert status == 200
+    with Session() as session:
+        assert session.get(Customer, 19).name == "edited"
+    status, _, _ = handler(json.dumps({"rows": [{"id": 404, "value": {"name": "x"}}]}).encode())
+    assert status == 404
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from pydantic import BaseModel, field_validator
+
+from pydantic_web_editor import Button, DocumentStore, JsonPatchError, SaveMode, WebEditorConfig, apply_patch
+
+
+class Tag(BaseModel):
+    key: str
+    value: str
+
+
+class Resource(BaseModel):
+    name: str
+    tags: list[Tag] = []
+    owner: Tag
+
+    @field_validator("name")
+    @classmethod
+    def no_spaces(cls, name):
+        if " " in name:
+            raise ValueError("name must not contain spaces")
+        return name
+
+
+DOCUMENT = {"name": "bucket", "tags": [{"key": "env", "value": "dev"}], "owner": {"key": "team", "value": "a"}}
+
+
+def post(handler, version, patch):
+    status, _, body = handler(json.dumps({"version": version, "patch": patch}).encode(), "application/json")
+    return status, json.loads(body)
+
+
+def test_apply_patch_is_copy_on_write():
+    patched = apply_patch(
+        DOCUMENT,
+        [
+            {"op": "replace", "path": "/owner/value", "value": "b"},
+            {"op": "add", "path": "/tags/-", "value": {"key": "a~b/c", "value": "x"}},
+            {"op": "copy", "from": "/owner", "path": "/backup"},
+            {"op": "move", "from": "/backup", "path": "/previous"},
+            {"op": "test", "path": "/tags/1/key", "value": "a~b/c"},
+        ],
+    )
+    assert patched["owner"]["value"] == "b" and patched["previous"] == {"key": "team", "value": "b"}
+    assert DOCUMENT["owner"]["value"] == "a" and len(DOCUMENT["tags"]) == 1
+    assert patched["tags"][0] is DOCUMENT["tags"][0]
+    assert apply_patch({"a~b": {"c/d": 1}}, [{"op": "remove", "path": "/a~0b/c~1d"}]) == {"a~b": {}}
+    with pytest.raises(JsonPatchError):
+        apply_patch(DOCUMENT, [{"op": "remove", "path": "/missing"}])
+    for index in ("01", "\u00b2", "\u0660", "+0", " 0", "0\n"):
+        with pytest.raises(JsonPatchError, match="invalid array index"):
+            apply_patch(DOCUMENT, [{"op": "remove", "path": f"/tags/{index}"}])
+
+
+def test_patch_handler_saves_validates_and_detects_conflicts():
+    store = DocumentStore(DOCUMENT)
+    config = WebEditorConfig(title="Resource", model=Resource, start_val=DOCUMENT, start_version=store.load()[1])
+    handler = config.patch_handler(store, on_valid=lambda resource: resource.owner.value)
+    version = store.load()[1]
+
+    status, body = post(handler, version, [{"op": "replace", "path": "/owner/value", "value": "b"}])
+    assert status == 200 and body["result"] == "b"
+    assert store.load() == ({**DOCUMENT, "owner": {"key": "team", "value": "b"}}, body["version"])
+
+    # The second save revalidates only the touched fields of the cached instance.
+    status, body = post(handler, body["version"], [{"op": "replace", "path": "/owner/value", "value": "c"}])
+    assert status == 200 and handler._validated[1].owner.value == "c"
+
+    status, errors = post(handler, body["version"], [{"op": "replace", "path": "/name", "value": "a b"}])
+    assert status == 422 and errors["errors"][0]["path"] == "root.name"
+
+    status, conflict = post(handler, version, [{"op": "replace", "path": "/name", "value": "x"}])
+    assert status == 409 and conflict["version"] == body["version"]
+    status, _ = post(handler, body["version"], [{"op": "test", "path": "/name", "value": "other"}])
+    assert status == 409
+    status, errors = post(handler, body["version"], [{"op": "remove", "path": "/tags/\u00b2"}])
+    assert status == 422 and errors["errors"][0]["property"] == "patch"
+
+
+def test_patch_button_renders_diff_client():
+    config = WebEditorConfig(
+        title="Resource",
+        model=Resource,
+        start_val=DOCUMENT,
+        start_version="v1",
+        buttons=[Button(id="save", path="save", save_mode=SaveMode.PATCH)],
+        cache_render=False,
+    )
+    assert "jsonPatchDiff" in config.html and 'version: "v1"' in config.html
+    assert "jsonPatchDiff" not in WebEditorConfig(title="Resource", model=Resource, cache_render=False).html
@@ -0,0 +1,30 @@
+import json
+from typing import List
+
+from pydantic import BaseModel, TypeAdapter
+
+from pydantic_web_editor import SchemaRegistry, WebEditorConfig, WebEditorConfig2
+
+
+class Note(BaseModel):
+    text: str = "</script><script>alert(1)</script>"
+
+
+def test_schema_built_once_and_html_safe():
+    registry = SchemaRegistry()
+    entry = registry.get(Note)
+    assert registry.get(Note) is entry
+    assert "</script>" not in entry.json
+    assert json.loads(str(entry.json)) == Note.model_json_schema()
+
+
+def test_warm_accepts_type_adapters():
+    registry = SchemaRegistry()
+    adapter = TypeAdapter(List[Note])
+    assert registry.warm([Note, adapter]) == 2
+    assert registry.schema(adapter) == adapter.json_schema()
+
+
+def test_both_configs_embed_registry_schema():
+    assert '"schema":{' in WebEditorConfig(title="Notes", model=Note, cache_render=False).html
+    assert '"title":"Note"' in WebEditorConfig2(title="Notes", model=Note).html
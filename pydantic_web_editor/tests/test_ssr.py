@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import List, Optional
+
+from benchmarks.models import deep_model
+from pydantic import BaseModel, Field
+
+from pydantic_web_editor import SCHEMA_REGISTRY, LoadStaticType, WebEditorConfig, compiled_form, render_form
+
+
+class Size(Enum):
+    SMALL = "small"
+    LARGE = "large"
+
+
+class Line(BaseModel):
+    sku: str
+    quantity: int = 1
+
+
+class Order(BaseModel):
+    customer: str = Field(max_length=40)
+    size: Size = Size.SMALL
+    gift: bool = False
+    lines: List[Line] = []
+    parent: Optional["Order"] = None
+
+
+def test_render_form_fills_compiled_parts():
+    html = render_form(Order, {"customer": "<Ann>", "gift": True, "lines": [{"sku": "a/b"}, {"sku": "c", "quantity": 3}]})
+    assert 'data-pwe-path="/customer" data-pwe-type="text" value="&lt;Ann&gt;"' in html and 'maxlength="40"' in html
+    assert '<option value="&#34;small&#34;" selected>' in html
+    assert 'data-pwe-path="/gift" data-pwe-type="checkbox" checked' in html
+    assert 'data-pwe-path="/lines/1/quantity" data-pwe-type="number" value="3"' in html
+    # Missing values fall back to schema defaults, recursive models are edited as JSON.
+    assert 'data-pwe-path="/lines/0/quantity" data-pwe-type="number" value="1"' in html
+    assert 'data-pwe-path="/parent" data-pwe-type="json"></textarea>' in html
+    # The schema is compiled once per model and reused for every value.
+    assert compiled_form(Order) is compiled_form(Order)
+    assert render_form(Order, Order(customer="Bo")) == render_form(Order, {"customer": "Bo"})
+    SCHEMA_REGISTRY.invalidate(Order)
+    assert "ssr_form" not in SCHEMA_REGISTRY._derived.get(Order, {})
+
+
+def test_server_render_page_defers_scripts_and_reads_the_form_back():
+    config = WebEditorConfig(
+        title="Order", model=Order, start_val={"customer": "Ann"}, server_render=True, load_static=LoadStaticType.BUNDLED
+    )
+    html = config.render()
+    assert "<form id='pydantic_web_editor_ssr'" in html and 'value="Ann"' in html
+    assert 'bundle.js" defer>' in html and "readServerForm(serverForm, options.startval)" in html
+    assert html.index("pydantic_web_editor_ssr") < html.index("new JSONEditor")
+    plain = WebEditorConfig(title="Order", model=Order, load_static=LoadStaticType.BUNDLED).render()
+    assert "_ssr" not in plain and "defer" not in plain
+
+
+def test_shared_definitions_compile_once():
+    # Each level reaches the next along two paths, which inlining would expand 2**30 times.
+    model = deep_model(30)
+    form = compiled_form(model)
+    assert len(form["defs"]) == 30 and str(form["parts"]).count("'ref'") == 2
+    assert all(str(definition).count("'ref'") == 2 for definition in list(form["defs"].values())[:-1])
+    html = render_form(model, {"child": {"value_0": "x"}, "children": [{"value_1": "y"}]})
+    assert 'data-pwe-path="/child/value_0" data-pwe-type="text" value="x"' in html
+    assert 'data-pwe-path="/children/0/value_1" data-pwe-type="text" value="y"' in html
+    # Missing values are rendered along the child path only, once per level.
+    assert html.count('data-pwe-path="/child/child/child/value_0"') == 1
+    assert len(html) < 200_000
+
+
+class Event(BaseModel):
+    at: datetime
+    note: Optional[str] = None
+    size: Optional[Size] = None
+
+
+def test_offset_values_render_as_text_and_unmatched_selects_preselect_a_blank():
+    html = render_form(Event, Event(at=datetime(2024, 1, 2, 3, 4, tzinfo=timezone.utc)))
+    assert 'data-pwe-path="/at" data-pwe-type="text" value="2024-01-02T03:04:00Z"' in html
+    assert 'type="text" data-pwe-path="/at"' in html and "datetime-local" not in html
+    assert '<option value="" selected hidden></option>' in html
+    page = WebEditorConfig(title="Event", model=Event, server_render=True, cache_render=False).render()
+    assert "control.value !== control.defaultValue" in page
@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+from typing import Dict
+
+from pydantic import BaseModel
+
+from pydantic_web_editor import WebEditorConfig, WebEditorConfig2, set_json_encoder
+
+
+class Product(BaseModel):
+    sku: str
+    attributes: Dict[str, str] = {}
+
+
+def test_stream_matches_full_render():
+    start_val = {"sku": "</script>", "attributes": {f"key{i}": "v" * 50 for i in range(200)}}
+    config = WebEditorConfig(title="Products", model=Product, start_val=start_val, cache_render=False)
+    chunks = list(config.html_stream(chunk_size=1024))
+    assert len(chunks) > 5
+    assert "".join(chunks) == config.html
+    assert "bundle" in chunks[0] or "cdn.jsdelivr" in chunks[0]
+
+    config2 = WebEditorConfig2(title="Products", model=Product)
+    assert "".join(config2.html_stream(chunk_size=64)) == config2.html
+
+
+def test_stream_uses_the_configured_encoder():
+    start_val = {"sku": "a", "attributes": {}, "variant": Product(sku="</script>b"), "when": datetime(2024, 5, 1, 12)}
+    config = WebEditorConfig(title="Products", model=Product, start_val=start_val, cache_render=False)
+    # Nested models serialize with the default encoder too.
+    plain = config.model_copy(update={"start_val": {"sku": "a", "variant": Product(sku="b")}})
+    assert "".join(plain.html_stream(chunk_size=16)) == plain.html
+
+    def encoder(value):
+        def default(item):
+            if isinstance(item, BaseModel):
+                return item.model_dump(mode="json")
+            return item.isoformat()
+
+        return json.dumps(value, separators=(",", ":"), default=default)
+
+    set_json_encoder(encoder)
+    try:
+        html = config.html
+        assert "".join(config.html_stream(chunk_size=16)) == html
+        assert '"when":"2024-05-01T12:00:00"' in html and "\\u003c/script\\u003eb" in html
+    finally:
+        set_json_encoder(None)
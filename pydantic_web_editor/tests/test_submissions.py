@@ -0,0 +1,64 @@
+import json
+from urllib.parse import urlencode
+
+from pydantic import BaseModel, PositiveInt
+
+from pydantic_web_editor import Button, WebEditorConfig
+
+
+class Order(BaseModel):
+    item: str
+    quantity: PositiveInt
+
+
+def test_form_encoded_submission():
+    saved = []
+    handler = WebEditorConfig(title="Orders", model=Order).submission_handler(on_valid=saved.append)
+    body = urlencode({"payload": json.dumps({"item": "pen", "quantity": 2})}).encode()
+    response = handler(body, "application/x-www-form-urlencoded")
+    assert response.status == 200
+    assert saved == [Order(item="pen", quantity=2)]
+
+
+class Envelope(BaseModel):
+    payload: str
+
+
+def test_json_bodies_are_unwrapped_only_when_marked():
+    handler = WebEditorConfig(title="Envelope", model=Envelope).submission_handler(on_valid=lambda e: e.payload)
+    response = handler(json.dumps({"payload": "raw"}).encode(), "application/json")
+    assert response.status == 200 and json.loads(response.body)["result"] == "raw"
+
+    # What the editor's button sends with htmx's json-enc extension.
+    wrapped = {"payload": json.dumps({"payload": "wrapped"}), "_pydantic_web_editor": 1}
+    response = handler(json.dumps(wrapped).encode(), "application/json")
+    assert response.status == 200 and json.loads(response.body)["result"] == "wrapped"
+    assert handler(b'{"_pydantic_web_editor": 1}', "application/json").status == 400
+
+
+def test_errors_use_json_editor_shape():
+    handler = WebEditorConfig(title="Orders", model=Order).submission_handler()
+    response = handler(json.dumps({"item": "pen", "quantity": 0}).encode(), "application/json")
+    assert response.status == 422
+    assert json.loads(response.body)["errors"] == [
+        {"path": "root.quantity", "property": "greater_than", "message": "Input should be greater than 0"}
+    ]
+
+
+def test_batch_submission():
+    handler = WebEditorConfig(title="Orders", model=Order).submission_handler()
+    batch = [{"item": "pen", "quantity": 1}, {"item": "ink", "quantity": -1}]
+    errors = json.loads(handler(json.dumps(batch).encode(), "application/json").body)["errors"]
+    assert [(error["index"], error["path"]) for error in errors] == [(1, "root.1.quantity")]
+
+    response = handler(json.dumps(batch[:1] * 3).encode(), "application/json")
+    assert json.loads(response.body)["count"] == 3
+
+
+def test_submit_button_posts_the_editor_value():
+    config = WebEditorConfig(title="Order", model=Order, buttons=[Button(id="save", path="save", text="Save")])
+    html = config.render()
+    assert '<button id="save" class="btn">Save</button>' in html
+    values = "{'payload': JSON.stringify(payload), '_pydantic_web_editor': 1}"
+    assert "htmx.ajax(\"POST\", '/save', { 'values': %s })" % values in html
+    assert "verbatim" not in html
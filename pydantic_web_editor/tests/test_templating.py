@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+from pydantic import BaseModel
+
+import pydantic_web_editor
+from pydantic_web_editor import WebEditorConfig, configure_templates
+from pydantic_web_editor.__main__ import main
+
+
+class Page(BaseModel):
+    title: str
+
+
+def test_import_does_not_load_jinja_or_compile_templates():
+    code = (
+        "import sys, pydantic_web_editor\n"
+        "from pydantic_web_editor import templating\n"
+        "heavy = [name for name in ('jinja2', 'asyncio', 'concurrent.futures') if name in sys.modules]\n"
+        "assert not heavy and templating._environment is None, heavy\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_template_globals_stay_importable():
+    from pydantic_web_editor.main import EDITOR_TEMPLATE
+
+    assert pydantic_web_editor.ENV.get_template("pydantic_web_editor.html") is EDITOR_TEMPLATE
+    assert pydantic_web_editor.COMPOSED_TEMPLATE.name == "composed.html"
+
+
+def test_precompiled_templates_and_bytecode_cache(tmp_path):
+    expected = WebEditorConfig(title="Page", model=Page, cache_render=False).html
+    main(["templates", str(tmp_path / "compiled")])
+    try:
+        configure_templates(compiled_path=str(tmp_path / "compiled"))
+        assert WebEditorConfig(title="Page", model=Page, cache_render=False).html == expected
+        configure_templates(bytecode_cache=str(tmp_path / "bytecode"))
+        assert WebEditorConfig(title="Page", model=Page, cache_render=False).html == expected
+        assert list((tmp_path / "bytecode").iterdir())
+    finally:
+        configure_templates()
@@ -0,0 +1,54 @@
+from typing import List, Optional, Union
+
+from benchmarks.models import deep_model
+from pydantic import BaseModel
+
+from pydantic_web_editor import SCHEMA_REGISTRY, WebEditorConfig2, parse_json_schema
+
+
+class Address(BaseModel):
+    street: str
+
+
+class Employee(BaseModel):
+    name: str
+    home: Address
+    work: Optional[Address] = None
+    manager: Optional["Employee"] = None
+    reports: List["Employee"] = []
+    contact: Union[Address, str] = ""
+
+
+def scopes(schema):
+    return [element["scope"] for element in parse_json_schema(schema)["elements"]]
+
+
+def test_recursive_model_terminates_and_expands_shared_refs_everywhere():
+    assert scopes(Employee.model_json_schema()) == [
+        "#/properties/name",
+        "#/properties/home",
+        "#/properties/home/properties/street",
+        "#/properties/work",
+        "#/properties/work/properties/street",
+        "#/properties/manager",
+        "#/properties/reports",
+        "#/properties/contact",
+        "#/properties/contact/properties/street",
+    ]
+
+
+def test_shared_refs_stop_expanding_at_max_elements():
+    elements = parse_json_schema(deep_model(25).model_json_schema(), max_elements=500)["elements"]
+    assert 500 <= len(elements) < 600
+
+
+def test_combinators_are_walked():
+    schema = {"anyOf": [{"properties": {"a": {}}}, {"oneOf": [{"properties": {"b": {}}}]}]}
+    assert scopes(schema) == ["#/properties/a", "#/properties/b"]
+
+
+def test_ui_schema_cached_per_model():
+    html = WebEditorConfig2(title="Staff", model=Employee, gen_ui_schema=True).html
+    assert SCHEMA_REGISTRY.ui_schema_json(Employee) is SCHEMA_REGISTRY.ui_schema_json(Employee)
+    assert '"scope":"#/properties/home/properties/street"' in html
+    assert "json-uischema" not in WebEditorConfig2(title="Staff", model=Employee).html
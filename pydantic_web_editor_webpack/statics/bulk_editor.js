@@ -0,0 +1,183 @@
+// Bulk editing of long lists of documents, see WebEditorConfig.bulk_url.
+//
+// Only the rows scrolled into view have DOM nodes, and rows are fetched from the server's BulkHandler in windows of
+// pageSize as they scroll into view. Clicking a row opens a single json-editor for that document; edited rows are
+// kept client side until Save posts them, and only them, back to the handler for validation.
+//
+// A plain script of its own, built to static/bulk_editor.js and loaded by bulk pages after json-editor, so the
+// JSONEditor global is already defined. Loading it twice, e.g. for several bulk editors on one page, is harmless.
+(function () {
+    if (window.PydanticBulkEditor) {
+        return;
+    }
+
+    const OVERSCAN = 10;
+
+    function cell(text) {
+        const td = document.createElement('td');
+        td.textContent = text === undefined || text === null ? '' : String(text);
+        return td;
+    }
+
+    class BulkEditor {
+        constructor(container, options) {
+            this.container = container;
+            this.options = Object.assign({ pageSize: 50, rowHeight: 36, height: 480, columns: [] }, options);
+            this.total = 0;
+            this.windows = new Map();   // window index -> Promise of [{id, value}]
+            this.rows = new Map();      // row index -> {id, value}
+            this.edited = new Map();    // row id -> edited value
+            this.errors = new Map();    // row id -> server errors
+            this.selected = null;
+            this.editor = null;
+            this.build();
+            this.fetchWindow(0).then(() => this.render());
+        }
+
+        build() {
+            const { height, rowHeight } = this.options;
+            this.container.innerHTML = '';
+            this.toolbar = document.createElement('div');
+            this.toolbar.className = 'd-flex align-items-center gap-2 mb-2';
+            this.status = document.createElement('span');
+            this.saveButton = document.createElement('button');
+            this.saveButton.className = 'btn btn-primary btn-sm';
+            this.saveButton.textContent = 'Save';
+            this.saveButton.addEventListener('click', () => this.save());
+            this.toolbar.append(this.saveButton, this.status);
+
+            this.viewport = document.createElement('div');
+            this.viewport.style.cssText = `height:${height}px;overflow-y:auto;position:relative`;
+            this.spacer = document.createElement('div');
+            this.table = document.createElement('table');
+            this.table.className = 'table table-sm table-hover mb-0';
+            this.table.style.cssText = 'position:absolute;top:0;left:0;right:0';
+            this.body = document.createElement('tbody');
+            this.table.appendChild(this.body);
+            this.viewport.append(this.spacer, this.table);
+            this.viewport.addEventListener('scroll', () => window.requestAnimationFrame(() => this.render()));
+            this.rowHeight = rowHeight;
+
+            this.detail = document.createElement('div');
+            this.detail.className = 'mt-3';
+            this.container.append(this.toolbar, this.viewport, this.detail);
+        }
+
+        fetchWindow(index) {
+            if (!this.windows.has(index)) {
+                const { url, pageSize } = this.options;
+                const offset = index * pageSize;
+                const separator = url.indexOf('?') === -1 ? '?' : '&';
+                const request = fetch(`${url}${separator}offset=${offset}&limit=${pageSize}`)
+                    .then((response) => response.json())
+                    .then((page) => {
+                        this.total = page.total;
+                        page.items.forEach((item, i) => this.rows.set(offset + i, item));
+                        return page.items;
+                    })
+                    .catch((error) => {
+                        this.windows.delete(index);
+                        throw error;
+                    });
+                this.windows.set(index, request);
+            }
+            return this.windows.get(index);
+        }
+
+        render() {
+            const { pageSize, columns } = this.options;
+            this.spacer.style.height = `${this.total * this.rowHeight}px`;
+            const first = Math.max(0, Math.floor(this.viewport.scrollTop / this.rowHeight) - OVERSCAN);
+            const visible = Math.ceil(this.viewport.clientHeight / this.rowHeight) + 2 * OVERSCAN;
+            const last = Math.min(this.total, first + visible);
+            this.table.style.transform = `translateY(${first * this.rowHeight}px)`;
+
+            const missing = new Set();
+            const body = document.createElement('tbody');
+            for (let index = first; index < last; index++) {
+                const row = this.rows.get(index);
+                const tr = document.createElement('tr');
+                tr.style.height = `${this.rowHeight}px`;
+                tr.appendChild(cell(index + 1));
+                if (row === undefined) {
+                    missing.add(Math.floor(index / pageSize));
+                    columns.forEach(() => tr.appendChild(cell('…')));
+                } else {
+                    const value = this.edited.has(row.id) ? this.edited.get(row.id) : row.value;
+                    columns.forEach((column) => tr.appendChild(cell(value && value[column])));
+                    tr.style.cursor = 'pointer';
+                    if (this.errors.has(row.id)) {
+                        tr.className = 'table-danger';
+                    } else if (this.edited.has(row.id)) {
+                        tr.className = 'table-warning';
+                    }
+                    if (this.selected === index) {
+                        tr.classList.add('table-active');
+                    }
+                    tr.addEventListener('click', () => this.select(index));
+                }
+                body.appendChild(tr);
+            }
+            this.table.replaceChild(body, this.body);
+            this.body = body;
+            missing.forEach((index) => this.fetchWindow(index).then(() => this.render()));
+            this.status.textContent = `${this.total} rows, ${this.edited.size} edited`;
+        }
+
+        select(index) {
+            const row = this.rows.get(index);
+            if (this.editor) {
+                this.editor.destroy();
+            }
+            this.selected = index;
+            const { schema, config } = this.options;
+            const startval = this.edited.has(row.id) ? this.edited.get(row.id) : row.value;
+            this.editor = new JSONEditor(this.detail, Object.assign({}, config, { schema, startval }));
+            this.editor.on('ready', () => {
+                this.editor.on('change', () => {
+                    this.edited.set(row.id, this.editor.getValue());
+                    this.render();
+                });
+                const errors = this.errors.get(row.id);
+                if (errors) {
+                    this.editor.setOption('show_errors', 'always');
+                }
+            });
+            this.render();
+        }
+
+        save() {
+            if (!this.edited.size) {
+                return Promise.resolve();
+            }
+            const rows = Array.from(this.edited, ([id, value]) => ({ id, value }));
+            return fetch(this.options.url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ rows }),
+            }).then((response) => response.json().then((body) => {
+                this.errors.clear();
+                if (response.ok) {
+                    this.rows.forEach((row) => {
+                        if (this.edited.has(row.id)) {
+                            row.value = this.edited.get(row.id);
+                        }
+                    });
+                    this.edited.clear();
+                } else {
+                    (body.errors || []).forEach((error) => {
+                        this.errors.set(error.id, (this.errors.get(error.id) || []).concat([error]));
+                    });
+                }
+                this.render();
+                this.container.dispatchEvent(new CustomEvent(
+                    response.ok ? 'pydantic-web-editor:saved' : 'pydantic-web-editor:save-failed',
+                    { detail: body, bubbles: true },
+                ));
+                return body;
+            }));
+        }
+    }
+
+    window.PydanticBulkEditor = BulkEditor;
+})();
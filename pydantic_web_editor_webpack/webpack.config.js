@@ -2,9 +2,13 @@ const path = require('path');
 const MiniCssExtractPlugin = require('mini-css-extract-plugin');
 
 module.exports = {
-    entry: './src/index.js',
+    entry: {
+        bundle: './src/index.js',
+        // Bulk editing mode, see WebEditorConfig.bulk_url. Only bulk pages load it.
+        bulk_editor: './src/bulk_editor.js',
+    },
     output: {
-        filename: 'bundle.js',
+        filename: '[name].js',
         path: path.resolve(__dirname, 'statics'),
     },
     module: {